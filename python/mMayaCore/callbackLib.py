@@ -0,0 +1,282 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMayaCore/callbackLib.py @brief [ FILE ] - Manage Maya message callbacks.
+## @package mMayaCore.callbackLib    @brief [ FILE ] - Manage Maya message callbacks.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+from   maya.api import OpenMaya
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ tuple of str ] - Scene messages after which the content of the scene is changed by file operations.
+SCENE_CHANGED_MESSAGES      = ('kAfterNew',
+                               'kAfterOpen',
+                               'kAfterImport',
+                               'kAfterCreateReference',
+                               'kAfterRemoveReference',
+                               'kAfterImportReference',
+                               'kAfterExportReference',
+                               'kAfterLoadReference',
+                               'kAfterUnloadReference')
+
+## [ tuple of str ] - Scene messages before which the content of the scene is changed by file operations.
+SCENE_CHANGING_MESSAGES     = ('kBeforeNew',
+                               'kBeforeOpen',
+                               'kBeforeImport',
+                               'kBeforeCreateReference',
+                               'kBeforeRemoveReference',
+                               'kBeforeLoadReference',
+                               'kBeforeUnloadReference')
+
+## [ tuple of str ] - Scene messages before which a new scene is created or opened.
+SCENE_OPENING_MESSAGES      = ('kBeforeNew',
+                               'kBeforeOpen')
+
+## [ tuple of str ] - Scene messages before which Maya reads a referenced file, the file it reads can be changed by their callbacks.
+REFERENCE_CHECK_MESSAGES    = ('kBeforeCreateReferenceCheck',
+                               'kBeforeLoadReferenceCheck')
+
+## [ tuple of str ] - Names of the methods of `maya.api.OpenMaya.MNamespaceMessage` which add namespace callbacks.
+NAME_SPACE_MESSAGES         = ('addNamespaceAddedCallback',
+                               'addNamespaceRemovedCallback',
+                               'addNamespaceRenamedCallback')
+
+
+#
+## @brief [ CLASS ] - Class keeps ids of Maya message callbacks, so they can be removed together.
+#
+#  Messages which don't exist in the running Maya version are skipped.
+#
+#  @code
+#import mMayaCore.callbackLib
+#
+#def invalidate(*args):
+#    pass
+#
+#callbackGroup = mMayaCore.callbackLib.CallbackGroup()
+#
+#callbackGroup.addSceneCallbacks(mMayaCore.callbackLib.SCENE_CHANGED_MESSAGES, invalidate)
+#callbackGroup.addNodeAddedCallback(invalidate)
+#
+#callbackGroup.remove()
+#  @endcode
+class CallbackGroup(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self):
+
+        ## [ list of int ] - Callback ids.
+        self._ids = []
+
+    #
+    ## @brief Number of the callbacks.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the callbacks.
+    def __len__(self):
+
+        return len(self._ids)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Add given callback id.
+    #
+    #  @param callbackId [ int | None | in  ] - Callback id.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Callback id.
+    def add(self, callbackId):
+
+        self._ids.append(callbackId)
+
+        return callbackId
+
+    #
+    ## @brief Add given function as callback of given scene messages.
+    #
+    #  @param messages [ list of str | None | in  ] - Names of the messages of `maya.api.OpenMaya.MSceneMessage`.
+    #  @param function [ callable    | None | in  ] - Callback function.
+    #
+    #  @exception N/A
+    #
+    #  @return list of int - Callback ids.
+    def addSceneCallbacks(self, messages, function):
+
+        return self._addSceneMessageCallbacks(OpenMaya.MSceneMessage.addCallback, messages, function)
+
+    #
+    ## @brief Add given function as check file callback of given scene messages.
+    #
+    #  Function is called with the `maya.api.OpenMaya.MFileObject` of the file and the client data, it should
+    #  return False to abort the operation.
+    #
+    #  @param messages [ list of str | None | in  ] - Names of the messages of `maya.api.OpenMaya.MSceneMessage`,
+    #                                                 @see REFERENCE_CHECK_MESSAGES.
+    #  @param function [ callable    | None | in  ] - Callback function.
+    #
+    #  @exception N/A
+    #
+    #  @return list of int - Callback ids.
+    def addCheckFileCallbacks(self, messages, function):
+
+        return self._addSceneMessageCallbacks(OpenMaya.MSceneMessage.addCheckFileCallback, messages, function)
+
+    #
+    ## @brief Add given function as reference callback of given scene messages.
+    #
+    #  Function is called with the reference node, the `maya.api.OpenMaya.MFileObject` of the referenced file
+    #  and the client data.
+    #
+    #  @param messages [ list of str | None | in  ] - Names of the reference messages of `maya.api.OpenMaya.MSceneMessage`.
+    #  @param function [ callable    | None | in  ] - Callback function.
+    #
+    #  @exception N/A
+    #
+    #  @return list of int - Callback ids.
+    def addReferenceCallbacks(self, messages, function):
+
+        return self._addSceneMessageCallbacks(OpenMaya.MSceneMessage.addReferenceCallback, messages, function)
+
+    #
+    ## @brief Add given function as callback of node added message.
+    #
+    #  @param function [ callable | None         | in  ] - Callback function.
+    #  @param nodeType [ str      | 'dependNode' | in  ] - Type of the nodes.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Callback id.
+    def addNodeAddedCallback(self, function, nodeType='dependNode'):
+
+        return self.add(OpenMaya.MDGMessage.addNodeAddedCallback(function, nodeType))
+
+    #
+    ## @brief Add given function as callback of node removed message.
+    #
+    #  @param function [ callable | None         | in  ] - Callback function.
+    #  @param nodeType [ str      | 'dependNode' | in  ] - Type of the nodes.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Callback id.
+    def addNodeRemovedCallback(self, function, nodeType='dependNode'):
+
+        return self.add(OpenMaya.MDGMessage.addNodeRemovedCallback(function, nodeType))
+
+    #
+    ## @brief Add given function as callback of name changed message of all nodes.
+    #
+    #  @param function [ callable | None | in  ] - Callback function.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Callback id.
+    def addNameChangedCallback(self, function):
+
+        return self.add(OpenMaya.MNodeMessage.addNameChangedCallback(OpenMaya.MObject.kNullObj, function))
+
+    #
+    ## @brief Add given function as callback of namespace added, removed and renamed messages.
+    #
+    #  Nothing is added if namespace messages don't exist in the running Maya version.
+    #
+    #  @param function [ callable | None | in  ] - Callback function.
+    #
+    #  @exception N/A
+    #
+    #  @return list of int - Callback ids.
+    def addNameSpaceCallbacks(self, function):
+
+        ids = []
+
+        for message in NAME_SPACE_MESSAGES:
+
+            addCallback = getattr(getattr(OpenMaya, 'MNamespaceMessage', None), message, None)
+            if addCallback is None:
+                continue
+
+            ids.append(self.add(addCallback(function)))
+
+        return ids
+
+    #
+    ## @brief Remove all callbacks.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the removed callbacks.
+    def remove(self):
+
+        count = len(self._ids)
+
+        if self._ids:
+            OpenMaya.MMessage.removeCallbacks(self._ids)
+
+        self._ids = []
+
+        return count
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Add given function as callback of given scene messages by given method of `maya.api.OpenMaya.MSceneMessage`.
+    #
+    #  @param addCallback [ callable    | None | in  ] - Method which adds the callbacks.
+    #  @param messages    [ list of str | None | in  ] - Names of the messages of `maya.api.OpenMaya.MSceneMessage`.
+    #  @param function    [ callable    | None | in  ] - Callback function.
+    #
+    #  @exception N/A
+    #
+    #  @return list of int - Callback ids.
+    def _addSceneMessageCallbacks(self, addCallback, messages, function):
+
+        ids = []
+
+        for message in messages:
+
+            messageType = getattr(OpenMaya.MSceneMessage, message, None)
+            if messageType is None:
+                continue
+
+            ids.append(self.add(addCallback(messageType, function)))
+
+        return ids
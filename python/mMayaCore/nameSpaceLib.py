@@ -25,13 +25,40 @@
 # ----------------------------------------------------------------------------------------------------
 # IMPORT
 # ----------------------------------------------------------------------------------------------------
+import  re
+import  time
+
+from   array import array
+from   collections import OrderedDict
+
+from   maya import cmds
+from   maya.api import OpenMaya
+
 import mCore.nameSpaceLib
 
+import mMayaCore.callbackLib
+
 
 #
 # ----------------------------------------------------------------------------------------------------
 # CODE
 # ----------------------------------------------------------------------------------------------------
+## [ tuple of str ] - Namespaces Maya creates for itself, they are never reported as empty.
+DEFAULT_NAME_SPACES = ('UI', 'shared')
+
+## [ callable ] - High resolution clock.
+_clock              = getattr(time, 'perf_counter', time.time)
+
+## [ re.SRE_Pattern ] - Line of a name, DAG path and leading colon are skipped, namespace of the last path component is captured.
+_NAME_PATTERN       = re.compile(r'^(?:[^\n]*\|)?:?(?:([^\n|]*):)?', re.MULTILINE)
+
+## [ int ] - Number of the names a namespace batch parses at once, it limits the namespaces which exist at the same time.
+_BATCH_CHUNK_SIZE   = 65536
+
+## [ mMayaCore.nameSpaceLib.NameSpaceTree ] - Namespace tree of the session.
+_nameSpaceTree      = None
+
+
 #
 ## @brief [ CLASS ] - Class to operate on namespaces in Maya.
 class NameSpace(mCore.nameSpaceLib.NameSpace):
@@ -51,3 +78,1393 @@ class NameSpace(mCore.nameSpaceLib.NameSpace):
 
         mCore.nameSpaceLib.NameSpace.__dict__['__init__'](self, nameSpace)
 
+
+
+#
+## @brief [ CLASS ] - Class allocates namespaces which don't exist in the scene.
+#
+#  Existing namespaces are queried once when the allocator is created, then a counter is kept for each base name,
+#  so allocating many namespaces for the same base name doesn't search the namespaces of the scene again and again.
+#  Allocated namespaces are reserved, they are not allocated again. Allocator is a snapshot of the scene, namespaces
+#  created by other means afterwards should be reserved or the allocator should be snapshot again.
+#
+#  @code
+#import sys
+#import mMayaCore.nameSpaceLib
+#
+#allocator = mMayaCore.nameSpaceLib.NameSpaceAllocator()
+#
+#sys.stdout.write(allocator.allocate('chair'))
+# # chair1
+#
+#sys.stdout.write(allocator.allocateMany('chair', 3))
+# # ['chair2', 'chair3', 'chair4']
+#  @endcode
+class NameSpaceAllocator(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param snapshot [ bool | True | in  ] - Query existing namespaces of the scene.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, snapshot=True):
+
+        ## [ set of str ] - Existing and allocated namespaces.
+        self._nameSpaces = set()
+
+        ## [ dict ] - Keys are base names, values are the next number to be tried.
+        self._counters   = {}
+
+        if snapshot:
+            self.snapshot()
+
+    #
+    ## @brief Number of the existing and allocated namespaces.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the namespaces.
+    def __len__(self):
+
+        return len(self._nameSpaces)
+
+    #
+    ## @brief Check whether given namespace exists or it is allocated.
+    #
+    #  @param nameSpace [ str | None | in  ] - Namespace.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def __contains__(self, nameSpace):
+
+        return nameSpace.strip(':') in self._nameSpaces
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Query existing namespaces of the scene, counters are reset.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the existing namespaces.
+    def snapshot(self):
+
+        nameSpaces = cmds.namespaceInfo(':', listOnlyNamespaces=True, recurse=True, absoluteName=True) or []
+
+        self._nameSpaces = set([x.strip(':') for x in nameSpaces])
+        self._counters   = {}
+
+        return len(self._nameSpaces)
+
+    #
+    ## @brief Reserve given namespace, so it is not allocated.
+    #
+    #  @param nameSpace [ str | None | in  ] - Namespace.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def reserve(self, nameSpace):
+
+        self._nameSpaces.add(nameSpace.strip(':'))
+
+    #
+    ## @brief Allocate a namespace for given base name.
+    #
+    #  Base name itself is allocated if it is free, otherwise a number is appended to it like Maya does.
+    #
+    #  @param baseName [ str | None | in  ] - Base name of the namespace.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Allocated namespace.
+    def allocate(self, baseName):
+
+        baseName = baseName.strip(':')
+
+        if baseName not in self._counters and baseName not in self._nameSpaces:
+            self._counters[baseName] = 1
+            self._nameSpaces.add(baseName)
+            return baseName
+
+        number = self._counters.get(baseName, 1)
+
+        while '{}{}'.format(baseName, number) in self._nameSpaces:
+            number += 1
+
+        nameSpace = '{}{}'.format(baseName, number)
+
+        self._counters[baseName] = number + 1
+        self._nameSpaces.add(nameSpace)
+
+        return nameSpace
+
+    #
+    ## @brief Allocate many namespaces for given base name.
+    #
+    #  @param baseName [ str | None | in  ] - Base name of the namespaces.
+    #  @param count    [ int | None | in  ] - Number of the namespaces.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Allocated namespaces.
+    def allocateMany(self, baseName, count):
+
+        return [self.allocate(baseName) for x in range(count)]
+
+
+#
+## @brief [ CLASS ] - Class indexes the namespaces of the scene and their nodes.
+#
+#  Namespaces of the scene are queried once and every node is mapped to its namespace by walking the dependency graph
+#  once. Index is built by the first query and it is kept until it is invalidated, it is a snapshot of the scene unless
+#  the callbacks are installed by calling `install`. Installed callbacks keep it up to date; added, removed and renamed
+#  nodes update it in place, while namespace changes and file operations invalidate it, so it is built again by the
+#  next query. Node callbacks exist only while the index is built, they are removed before a scene is opened or created
+#  and before references are loaded, so file operations don't call back for each node they create.
+#
+#  Namespaces are given without leading colon, root namespace is an empty string.
+#
+#  @code
+#import sys
+#import mMayaCore.nameSpaceLib
+#
+#tree = mMayaCore.nameSpaceLib.getNameSpaceTree()
+#tree.install()
+#
+#sys.stdout.write(tree.children())
+# # ['UI', 'char01', 'shared']
+#
+#sys.stdout.write(tree.nodes('char01', recursive=True))
+# # ['char01:body', 'char01:body|char01:bodyShape', 'char01:rig:root']
+#
+#sys.stdout.write(tree.count('char01', recursive=True))
+# # 3
+#
+#sys.stdout.write(tree.emptyNameSpaces())
+# # ['char01:tmp']
+#
+#sys.stdout.write(tree.stats())
+# # {'builds': 1, 'hits': 3, 'updates': 0, 'invalidations': 0}
+#  @endcode
+class NameSpaceTree(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self):
+
+        ## [ dict ] - Keys are namespaces, values are dicts, keys are: parent, children, nodes. Nodes are OrderedDicts,
+        #             keys are hash codes, values are `maya.api.OpenMaya.MObjectHandle` objects. None if it is not built.
+        self._nameSpaces        = None
+
+        ## [ mMayaCore.callbackLib.CallbackGroup ] - Scene and namespace callbacks which invalidate the index.
+        self._callbackGroup     = mMayaCore.callbackLib.CallbackGroup()
+
+        ## [ mMayaCore.callbackLib.CallbackGroup ] - Node callbacks which update the index, they exist while it is built.
+        self._nodeCallbackGroup = mMayaCore.callbackLib.CallbackGroup()
+
+        ## [ dict ] - Statistics, keys are: builds, hits, updates, invalidations.
+        self._stats             = {'builds'         : 0,
+                                   'hits'           : 0,
+                                   'updates'        : 0,
+                                   'invalidations'  : 0}
+
+    #
+    ## @brief Check whether given namespace exists.
+    #
+    #  @param nameSpace [ str | None | in  ] - Namespace.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def __contains__(self, nameSpace):
+
+        return nameSpace.strip(':') in self._getNameSpaces()
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Whether the callbacks are installed, index is a snapshot of the scene otherwise.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isInstalled(self):
+
+        return len(self._callbackGroup) > 0
+
+    #
+    ## @brief Whether the node callbacks which update the index exist.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isTracking(self):
+
+        return len(self._nodeCallbackGroup) > 0
+
+    #
+    ## @brief Whether the index is built.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isBuilt(self):
+
+        return self._nameSpaces is not None
+
+    #
+    ## @brief Statistics.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: builds, hits, updates, invalidations.
+    def stats(self):
+
+        return dict(self._stats)
+
+    #
+    ## @brief All namespaces.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Namespaces, root namespace is not included.
+    def nameSpaces(self):
+
+        return sorted([x for x in self._getNameSpaces() if x])
+
+    #
+    ## @brief Parent namespace of given namespace.
+    #
+    #  @param nameSpace [ str | None | in  ] - Namespace.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Parent namespace, empty string for the root namespace.
+    #  @return None - If namespace doesn't exist or it is the root namespace.
+    def parent(self, nameSpace):
+
+        entry = self._getNameSpaces().get(nameSpace.strip(':'))
+        if not entry:
+            return None
+
+        return entry['parent']
+
+    #
+    ## @brief Child namespaces of given namespace.
+    #
+    #  @param nameSpace [ str | '' | in  ] - Namespace, root namespace if empty string given.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Namespaces.
+    def children(self, nameSpace=''):
+
+        entry = self._getNameSpaces().get(nameSpace.strip(':'))
+        if not entry:
+            return []
+
+        return sorted(entry['children'])
+
+    #
+    ## @brief Number of the nodes in given namespace.
+    #
+    #  @param nameSpace [ str  | None  | in  ] - Namespace.
+    #  @param recursive [ bool | False | in  ] - Include the nodes of the nested namespaces.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the nodes.
+    def count(self, nameSpace, recursive=False):
+
+        nameSpaces = self._getNameSpaces()
+
+        return sum([len(nameSpaces[x]['nodes']) for x in self._getNameSpaceTree(nameSpace.strip(':'), recursive)])
+
+    #
+    ## @brief Nodes in given namespace.
+    #
+    #  @param nameSpace [ str  | None  | in  ] - Namespace.
+    #  @param recursive [ bool | False | in  ] - Include the nodes of the nested namespaces.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Names of the nodes, partial path names for DAG nodes.
+    def nodes(self, nameSpace, recursive=False):
+
+        nameSpaces = self._getNameSpaces()
+        nodes      = []
+        mfnNode    = OpenMaya.MFnDependencyNode()
+
+        for name in self._getNameSpaceTree(nameSpace.strip(':'), recursive):
+
+            for handle in nameSpaces[name]['nodes'].values():
+
+                if not handle.isValid():
+                    continue
+
+                mObject = handle.object()
+
+                if mObject.hasFn(OpenMaya.MFn.kDagNode):
+                    nodes.append(OpenMaya.MDagPath.getAPathTo(mObject).partialPathName())
+                else:
+                    nodes.append(mfnNode.setObject(mObject).name())
+
+        return nodes
+
+    #
+    ## @brief Namespaces which contain no nodes, neither do their nested namespaces.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Namespaces, nested ones are listed before their parents.
+    def emptyNameSpaces(self):
+
+        nameSpaces = self._getNameSpaces()
+        counts     = {}
+
+        for name in sorted(nameSpaces, key=lambda x: -x.count(':') - bool(x)):
+            counts[name] = len(nameSpaces[name]['nodes']) + sum([counts[x] for x in nameSpaces[name]['children']])
+
+        return [x for x in sorted(counts, key=lambda x: (-x.count(':'), x))
+                if x and not counts[x] and x.split(':')[0] not in DEFAULT_NAME_SPACES]
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Build the index by querying the namespaces and walking the nodes of the scene.
+    #
+    #  Node callbacks which update the index are added if the callbacks are installed.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the namespaces, root namespace included.
+    def build(self):
+
+        self._nameSpaces = {'': {'parent': None, 'children': [], 'nodes': OrderedDict()}}
+
+        for nameSpace in cmds.namespaceInfo(':', listOnlyNamespaces=True, recurse=True, absoluteName=True) or []:
+            self._addNameSpace(nameSpace.strip(':'))
+
+        iterator = OpenMaya.MItDependencyNodes()
+        mfnNode  = OpenMaya.MFnDependencyNode()
+
+        while not iterator.isDone():
+
+            mObject = iterator.thisNode()
+            iterator.next()
+
+            self._addNode(mObject, mfnNode.setObject(mObject).name())
+
+        if self.isInstalled() and not self.isTracking():
+            self._nodeCallbackGroup.addNodeAddedCallback(self._nodeAdded)
+            self._nodeCallbackGroup.addNodeRemovedCallback(self._nodeRemoved)
+            self._nodeCallbackGroup.addNameChangedCallback(self._nameChanged)
+
+        self._stats['builds'] += 1
+
+        return len(self._nameSpaces)
+
+    #
+    ## @brief Invalidate the index and remove the node callbacks, it is called by the callbacks.
+    #
+    #  Index is built again by the next query.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def invalidate(self, *args):
+
+        self._nodeCallbackGroup.remove()
+
+        if self._nameSpaces is None:
+            return
+
+        self._nameSpaces = None
+
+        self._stats['invalidations'] += 1
+
+    #
+    ## @brief Install the callbacks which keep the index up to date, node callbacks are added when the index is built.
+    #
+    #  Snapshot built before the callbacks are installed is invalidated.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False if they are already installed.
+    def install(self):
+
+        if self.isInstalled():
+            return False
+
+        self._callbackGroup.addSceneCallbacks(mMayaCore.callbackLib.SCENE_CHANGING_MESSAGES, self.invalidate)
+        self._callbackGroup.addSceneCallbacks(mMayaCore.callbackLib.SCENE_CHANGED_MESSAGES, self.invalidate)
+        self._callbackGroup.addNameSpaceCallbacks(self.invalidate)
+
+        self.invalidate()
+
+        return True
+
+    #
+    ## @brief Remove the callbacks and clear the index.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def uninstall(self):
+
+        self._callbackGroup.remove()
+        self.invalidate()
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get namespaces, index is built if it is not built.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Namespaces @see _nameSpaces.
+    def _getNameSpaces(self):
+
+        if self._nameSpaces is None:
+            self.build()
+        else:
+            self._stats['hits'] += 1
+
+        return self._nameSpaces
+
+    #
+    ## @brief Get given namespace and its nested namespaces.
+    #
+    #  @param nameSpace [ str  | None | in  ] - Namespace.
+    #  @param recursive [ bool | None | in  ] - Include the nested namespaces.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Namespaces, empty if given namespace doesn't exist.
+    def _getNameSpaceTree(self, nameSpace, recursive):
+
+        if nameSpace not in self._nameSpaces:
+            return []
+
+        if not recursive:
+            return [nameSpace]
+
+        nameSpaces = [nameSpace]
+        for name in nameSpaces:
+            nameSpaces.extend(self._nameSpaces[name]['children'])
+
+        return nameSpaces
+
+    #
+    ## @brief Add given namespace and its missing parents to the index.
+    #
+    #  @param nameSpace [ str | None | in  ] - Namespace.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _addNameSpace(self, nameSpace):
+
+        if nameSpace in self._nameSpaces:
+            return
+
+        parent = nameSpace.rpartition(':')[0]
+        self._addNameSpace(parent)
+
+        self._nameSpaces[nameSpace] = {'parent': parent, 'children': [], 'nodes': OrderedDict()}
+        self._nameSpaces[parent]['children'].append(nameSpace)
+
+    #
+    ## @brief Add given node to the index.
+    #
+    #  @param mObject [ maya.api.OpenMaya.MObject | None | in  ] - Node.
+    #  @param name    [ str                       | None | in  ] - Name of the node.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False if namespace of the node is not in the index.
+    def _addNode(self, mObject, name):
+
+        entry = self._nameSpaces.get(name.rpartition(':')[0])
+        if entry is None:
+            return False
+
+        handle = OpenMaya.MObjectHandle(mObject)
+        entry['nodes'][handle.hashCode()] = handle
+
+        return True
+
+    #
+    ## @brief Remove given node from the index.
+    #
+    #  @param mObject [ maya.api.OpenMaya.MObject | None | in  ] - Node.
+    #  @param name    [ str                       | None | in  ] - Name of the node.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _removeNode(self, mObject, name):
+
+        entry = self._nameSpaces.get(name.rpartition(':')[0])
+        if entry is not None:
+            entry['nodes'].pop(OpenMaya.MObjectHandle(mObject).hashCode(), None)
+
+    #
+    ## @brief Node added callback.
+    #
+    #  @param mObject    [ maya.api.OpenMaya.MObject | None | in  ] - Added node.
+    #  @param clientData [ object                    | None | in  ] - Client data.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _nodeAdded(self, mObject, clientData=None):
+
+        if self._nameSpaces is None:
+            return
+
+        if not self._addNode(mObject, OpenMaya.MFnDependencyNode(mObject).name()):
+            self.invalidate()
+            return
+
+        self._stats['updates'] += 1
+
+    #
+    ## @brief Node removed callback.
+    #
+    #  @param mObject    [ maya.api.OpenMaya.MObject | None | in  ] - Removed node.
+    #  @param clientData [ object                    | None | in  ] - Client data.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _nodeRemoved(self, mObject, clientData=None):
+
+        if self._nameSpaces is None:
+            return
+
+        self._removeNode(mObject, OpenMaya.MFnDependencyNode(mObject).name())
+
+        self._stats['updates'] += 1
+
+    #
+    ## @brief Name changed callback, node is moved to its new namespace.
+    #
+    #  @param mObject      [ maya.api.OpenMaya.MObject | None | in  ] - Renamed node.
+    #  @param previousName [ str                       | None | in  ] - Previous name of the node.
+    #  @param clientData   [ object                    | None | in  ] - Client data.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _nameChanged(self, mObject, previousName, clientData=None):
+
+        if self._nameSpaces is None:
+            return
+
+        name = OpenMaya.MFnDependencyNode(mObject).name()
+
+        if name.rpartition(':')[0] == previousName.rpartition(':')[0]:
+            return
+
+        self._removeNode(mObject, previousName)
+
+        if not self._addNode(mObject, name):
+            self.invalidate()
+            return
+
+        self._stats['updates'] += 1
+
+#
+## @brief [ CLASS ] - Class plans and runs namespace renames, merges and cleanup of the scene in a single batch.
+#
+#  Requested operations are resolved in memory against the namespace tree first. Cyclic and invalid requests are
+#  reported as errors, nested namespaces are processed before their parents and namespaces are tracked through the
+#  earlier operations of the plan, so chained requests end up in their final namespaces. A rename whose new namespace
+#  exists or is claimed by another request becomes a merge, merges into the parent namespace are done by removing
+#  the namespace, and flattened namespaces are merged into their parents level by level. Empty namespaces are
+#  removed nested ones first without their content, so a namespace which isn't empty in the scene fails to be
+#  removed instead of its nodes being deleted. Namespaces of references are never removed. Nodes with the same name
+#  in merged namespaces are reported as conflicts, Maya renames them while merging.
+#
+#  Namespace tree is built once per plan, a tree whose callbacks are not installed is invalidated when the plan is
+#  created and after it is run, so the plan is resolved against the current scene.
+#
+#  Plan is run with one `cmds.namespace` call per planned operation in a single undo chunk. If an operation fails,
+#  the undo chunk is undone, so the scene is either changed by the whole plan or not at all.
+#
+#  @code
+#import sys
+#import mMayaCore.nameSpaceLib
+#
+#plan = mMayaCore.nameSpaceLib.NameSpacePlan()
+#
+#plan.rename('char01', 'hero')
+#plan.flatten('prop')
+#plan.removeEmpty()
+#
+#report = plan.run(dryRun=True)
+#
+#sys.stdout.write(report['operations'])
+# # [{'operation': 'merge', 'nameSpace': 'prop:geo', 'target': 'prop', 'flags': {'removeNamespace': ':prop:geo', 'mergeNamespaceWithParent': True}},
+# #  {'operation': 'rename', 'nameSpace': 'char01', 'target': 'hero', 'flags': {'rename': (':char01', 'hero'), 'parent': ':'}},
+# #  {'operation': 'remove', 'nameSpace': 'tmp', 'target': None, 'flags': {'removeNamespace': ':tmp'}}]
+#
+#sys.stdout.write(report['conflicts'])
+# # [{'nameSpace': 'prop:geo', 'target': 'prop', 'nodes': ['body']}]
+#
+#report = plan.run()
+#  @endcode
+class NameSpacePlan(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param tree [ mMayaCore.nameSpaceLib.NameSpaceTree | None | in  ] - Namespace tree, the one of the session is used if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, tree=None):
+
+        ## [ mMayaCore.nameSpaceLib.NameSpaceTree ] - Namespace tree.
+        self._tree          = tree if tree is not None else getNameSpaceTree()
+
+        ## [ collections.OrderedDict ] - Requests, keys are namespaces, values are target namespaces.
+        self._requests      = OrderedDict()
+
+        ## [ bool ] - Remove empty namespaces.
+        self._removeEmpty   = False
+
+        self._invalidateSnapshot()
+
+    #
+    ## @brief Number of the requests.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the requests.
+    def __len__(self):
+
+        return len(self._requests)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Requests.
+    #
+    #  @exception N/A
+    #
+    #  @return collections.OrderedDict - Keys are namespaces, values are target namespaces.
+    def requests(self):
+
+        return OrderedDict(self._requests)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Request given namespace to be renamed, it is merged if the new namespace exists.
+    #
+    #  @param nameSpace [ str | None | in  ] - Namespace.
+    #  @param newName   [ str | None | in  ] - New namespace, nested namespaces are separated by colon.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def rename(self, nameSpace, newName):
+
+        self._requests[nameSpace.strip(':')] = newName.strip(':')
+
+    #
+    ## @brief Request given namespace to be merged into the target namespace, it is removed afterwards.
+    #
+    #  @param nameSpace [ str | None | in  ] - Namespace.
+    #  @param target    [ str | None | in  ] - Target namespace, parent namespace if None given, root namespace if empty string given.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def merge(self, nameSpace, target=None):
+
+        nameSpace = nameSpace.strip(':')
+
+        if target is None:
+            target = nameSpace.rpartition(':')[0]
+
+        self._requests[nameSpace] = target.strip(':')
+
+    #
+    ## @brief Request all nested namespaces of given namespace to be merged into it.
+    #
+    #  Each nested namespace is merged into its parent, nested ones first, so each merge is a single command.
+    #
+    #  @param nameSpace [ str | None | in  ] - Namespace.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the requested merges.
+    def flatten(self, nameSpace):
+
+        nameSpace = nameSpace.strip(':')
+        nested    = list(self._tree.children(nameSpace))
+
+        for name in nested:
+            nested.extend(self._tree.children(name))
+
+        for name in nested:
+            self._requests[name] = name.rpartition(':')[0]
+
+        return len(nested)
+
+    #
+    ## @brief Request empty namespaces to be removed after the other operations.
+    #
+    #  @param remove [ bool | True | in  ] - Remove empty namespaces.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def removeEmpty(self, remove=True):
+
+        self._removeEmpty = remove
+
+    #
+    ## @brief Clear the requests.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def clear(self):
+
+        self._requests      = OrderedDict()
+        self._removeEmpty   = False
+
+    #
+    ## @brief Resolve the requests into the operations, nothing is changed in the scene.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: operations, conflicts, errors. Operations are dicts in the order they are run, keys are:
+    #                 operation (add, rename, merge, remove), nameSpace, target, flags. Flags are the arguments of
+    #                 `cmds.namespace`. Conflicts are dicts, keys are: nameSpace, target, nodes. Errors are dicts,
+    #                 keys are: nameSpace, target, error.
+    def resolve(self):
+
+        state      = {}
+        operations = []
+        conflicts  = []
+        errors     = []
+        moved      = []
+        targets    = OrderedDict()
+
+        for name in [''] + self._tree.nameSpaces():
+            state[name] = {'count': self._tree.count(name), 'names': None, 'original': name}
+
+        for nameSpace, target in self._requests.items():
+
+            if target == nameSpace:
+                continue
+
+            final   = target
+            visited = set([nameSpace])
+
+            while final in self._requests and final not in visited:
+                visited.add(final)
+                final = self._requests[final]
+
+            if nameSpace not in state:
+                error = 'Namespace does not exist'
+            elif final in visited:
+                error = 'Requests are cyclic'
+            elif target.startswith(nameSpace + ':') or final.startswith(nameSpace + ':'):
+                error = 'Namespace can not be moved into its nested namespace'
+            elif final.split(':')[0] in DEFAULT_NAME_SPACES or nameSpace.split(':')[0] in DEFAULT_NAME_SPACES:
+                error = 'Default namespaces can not be changed'
+            else:
+                error = None
+
+            if error:
+                errors.append({'nameSpace': nameSpace, 'target': target, 'error': error})
+                continue
+
+            targets[nameSpace] = target
+
+        for nameSpace in sorted(targets, key=lambda x: -x.count(':')):
+
+            source = NameSpacePlan._mapName(nameSpace, moved)
+            target = NameSpacePlan._mapName(targets[nameSpace], moved)
+
+            if source == target:
+                continue
+
+            if target in state:
+
+                if target == source.rpartition(':')[0]:
+                    flags = {'removeNamespace': ':' + source, 'mergeNamespaceWithParent': True}
+                else:
+                    flags = {'moveNamespace': (':' + source, ':' + target), 'force': True}
+
+                operations.append({'operation': 'merge', 'nameSpace': source, 'target': target, 'flags': flags})
+
+                if 'moveNamespace' in flags:
+                    operations.append({'operation': 'remove', 'nameSpace': source, 'target': None, 'flags': {'removeNamespace': ':' + source}})
+
+                NameSpacePlan._mergeState(self._tree, state, source, target, conflicts)
+
+            else:
+
+                parent = target.rpartition(':')[0]
+
+                operations.extend(NameSpacePlan._addParents(state, parent))
+                operations.append({'operation'  : 'rename',
+                                   'nameSpace'  : source,
+                                   'target'     : target,
+                                   'flags'      : {'rename': (':' + source, target.rpartition(':')[2]), 'parent': ':' + parent}})
+
+                for name in [x for x in state if x == source or x.startswith(source + ':')]:
+                    state[target + name[len(source):]] = state.pop(name)
+
+            moved.append((source, target))
+
+        if self._removeEmpty:
+            referenceNameSpaces = [NameSpacePlan._mapName(x, moved) for x in NameSpacePlan._getReferenceNameSpaces()]
+            operations.extend(NameSpacePlan._removeEmptyNameSpaces(state, referenceNameSpaces))
+
+        return {'operations'    : operations,
+                'conflicts'     : conflicts,
+                'errors'        : errors}
+
+    #
+    ## @brief Run the plan.
+    #
+    #  Operations are run in a single undo chunk, they are stopped at the first failing operation and the completed ones
+    #  are undone. They can't be undone if undo is disabled, in which case rolledBack key of the report is False.
+    #
+    #  @param dryRun [ bool | False | in  ] - Only resolve the plan, nothing is changed in the scene.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report @see resolve, additional keys are: dryRun, commands, completed, rolledBack, seconds. Commands
+    #                 is the number of the planned `cmds.namespace` calls, completed is the number of the completed ones,
+    #                 rolledBack is whether the completed ones are undone after a failure.
+    def run(self, dryRun=False):
+
+        startTime = _clock()
+        report    = self.resolve()
+
+        report['dryRun']    = dryRun
+        report['commands']  = len(report['operations'])
+        report['completed']  = 0
+        report['rolledBack'] = False
+
+        if not dryRun and report['operations']:
+
+            failed = False
+
+            cmds.undoInfo(openChunk=True, chunkName='nameSpacePlan')
+
+            try:
+                for operation in report['operations']:
+
+                    try:
+                        cmds.namespace(**operation['flags'])
+                    except RuntimeError as error:
+                        report['errors'].append({'nameSpace'    : operation['nameSpace'],
+                                                 'target'       : operation['target'],
+                                                 'error'        : str(error)})
+                        failed = True
+                        break
+
+                    report['completed'] += 1
+
+            finally:
+                cmds.undoInfo(closeChunk=True)
+
+            if failed and report['completed'] and cmds.undoInfo(q=True, state=True):
+                cmds.undo()
+                report['rolledBack'] = True
+
+            self._invalidateSnapshot()
+
+        report['seconds'] = _clock() - startTime
+
+        return report
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Invalidate the namespace tree if its callbacks are not installed, it is a snapshot of the scene then.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _invalidateSnapshot(self):
+
+        if not self._tree.isInstalled():
+            self._tree.invalidate()
+
+    #
+    ## @brief Get the name of given namespace after given operations.
+    #
+    #  @param nameSpace [ str           | None | in  ] - Namespace.
+    #  @param moved     [ list of tuple | None | in  ] - Namespaces and their new names in the order they are changed.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Namespace.
+    @staticmethod
+    def _mapName(nameSpace, moved):
+
+        for source, target in moved:
+            if nameSpace == source or nameSpace.startswith(source + ':'):
+                nameSpace = target + nameSpace[len(source):]
+
+        return nameSpace
+
+    #
+    ## @brief Get node names of given namespace of the state, they are queried from the tree once.
+    #
+    #  @param tree  [ mMayaCore.nameSpaceLib.NameSpaceTree | None | in  ] - Namespace tree.
+    #  @param entry [ dict                                 | None | in  ] - Namespace of the state.
+    #
+    #  @exception N/A
+    #
+    #  @return set of str - Names of the nodes without namespace and DAG path.
+    @staticmethod
+    def _getNames(tree, entry):
+
+        if entry['names'] is None:
+            names           = tree.nodes(entry['original']) if entry['original'] is not None else []
+            entry['names']  = set([x.rpartition('|')[2].rpartition(':')[2] for x in names])
+
+        return entry['names']
+
+    #
+    ## @brief Merge given namespace into the target namespace in the state, nested namespaces are moved along.
+    #
+    #  @param tree      [ mMayaCore.nameSpaceLib.NameSpaceTree | None | in  ] - Namespace tree.
+    #  @param state     [ dict                                 | None | in  ] - Namespaces of the state.
+    #  @param source    [ str                                  | None | in  ] - Namespace.
+    #  @param target    [ str                                  | None | in  ] - Target namespace.
+    #  @param conflicts [ list of dict                         | None | out ] - Conflicts are appended.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    @staticmethod
+    def _mergeState(tree, state, source, target, conflicts):
+
+        sourceEntry = state.pop(source)
+        targetEntry = state[target]
+
+        if sourceEntry['count']:
+
+            sourceNames = NameSpacePlan._getNames(tree, sourceEntry)
+            targetNames = NameSpacePlan._getNames(tree, targetEntry)
+
+            clashes = sourceNames & targetNames
+            if clashes:
+                conflicts.append({'nameSpace': source, 'target': target, 'nodes': sorted(clashes)})
+
+            targetEntry['count'] += sourceEntry['count']
+            targetEntry['names']  = targetNames | sourceNames
+
+        for name in sorted([x for x in state if x.rpartition(':')[0] == source]):
+
+            newName = target + ':' + name.rpartition(':')[2]
+
+            if newName in state:
+                NameSpacePlan._mergeState(tree, state, name, newName, conflicts)
+                continue
+
+            for nested in [x for x in state if x == name or x.startswith(name + ':')]:
+                state[newName + nested[len(name):]] = state.pop(nested)
+
+    #
+    ## @brief Add missing parents of given namespace to the state.
+    #
+    #  @param state     [ dict | None | in  ] - Namespaces of the state.
+    #  @param nameSpace [ str  | None | in  ] - Namespace.
+    #
+    #  @exception N/A
+    #
+    #  @return list of dict - Add operations.
+    @staticmethod
+    def _addParents(state, nameSpace):
+
+        if nameSpace in state:
+            return []
+
+        parent     = nameSpace.rpartition(':')[0]
+        operations = NameSpacePlan._addParents(state, parent)
+
+        state[nameSpace] = {'count': 0, 'names': set(), 'original': None}
+
+        operations.append({'operation'  : 'add',
+                           'nameSpace'  : nameSpace,
+                           'target'     : None,
+                           'flags'      : {'add': nameSpace.rpartition(':')[2], 'parent': ':' + parent}})
+
+        return operations
+
+    #
+    ## @brief Remove empty namespaces of the state, nested ones first, without their content.
+    #
+    #  @param state               [ dict        | None | in  ] - Namespaces of the state.
+    #  @param referenceNameSpaces [ list of str | None | in  ] - Namespaces of the references, they and their parents are kept.
+    #
+    #  @exception N/A
+    #
+    #  @return list of dict - Remove operations.
+    @staticmethod
+    def _removeEmptyNameSpaces(state, referenceNameSpaces):
+
+        counts     = {}
+        operations = []
+
+        for name in referenceNameSpaces:
+            counts[name] = 1
+
+        for name in sorted(state, key=lambda x: (-x.count(':') - bool(x), x)):
+
+            counts[name] = counts.get(name, 0) + state[name]['count']
+
+            if name:
+                parent         = name.rpartition(':')[0]
+                counts[parent] = counts.get(parent, 0) + counts[name]
+
+            if not name or counts[name] or name.split(':')[0] in DEFAULT_NAME_SPACES:
+                continue
+
+            operations.append({'operation'  : 'remove',
+                               'nameSpace'  : name,
+                               'target'     : None,
+                               'flags'      : {'removeNamespace': ':' + name}})
+
+        return operations
+
+    #
+    ## @brief Get namespaces of the references of the scene, loaded or not.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Namespaces.
+    @staticmethod
+    def _getReferenceNameSpaces():
+
+        nameSpaces = []
+
+        for referenceNode in cmds.ls(type='reference') or []:
+
+            try:
+                nameSpace = cmds.referenceQuery(referenceNode, namespace=True)
+            except RuntimeError:
+                continue
+
+            if nameSpace:
+                nameSpaces.append(nameSpace.strip(':'))
+
+        return nameSpaces
+
+#
+## @brief [ CLASS ] - Class parses namespaces and short names of many node names at once.
+#
+#  Names are joined into buffers of a fixed number of names and the namespaces of each buffer are found by a single
+#  regular expression pass over it, no match object is created and no namespace is kept per name. Namespaces are
+#  deduplicated into a table of unique namespaces and the names keep only their namespace ids in an array. Short names
+#  are sliced from the names when they are asked for.
+#
+#  Namespace of a DAG name is the namespace of its last path component. Short name is the name of the node without
+#  its namespace and DAG path. Root namespace is an empty string, its id is 0, ids of the other namespaces are assigned
+#  in sorted order per buffer. Names can't contain new lines.
+#
+#  @code
+#import sys
+#import mMayaCore.nameSpaceLib
+#
+#batch = mMayaCore.nameSpaceLib.NameSpaceBatch(['char01:body', '|char01:grp|char01:rig:root', 'persp'])
+#
+#sys.stdout.write(batch.nameSpaces())
+# # ['', 'char01', 'char01:rig']
+#
+#sys.stdout.write(batch.nameSpaceIds())
+# # array('I', [1, 2, 0])
+#
+#sys.stdout.write(batch.shortName(1))
+# # root
+#
+#sys.stdout.write(batch.nameSpace(1))
+# # char01:rig
+#
+#sys.stdout.write(batch.indices('char01'))
+# # array('L', [0])
+#  @endcode
+class NameSpaceBatch(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param names [ iterable of str | None | in  ] - Names of the nodes, DAG or DG names.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, names=None):
+
+        ## [ tuple of str ] - Names.
+        self._names         = ()
+
+        ## [ array.array ] - Namespace ids of the names, indices in the namespace table.
+        self._nameSpaceIds  = array('I')
+
+        ## [ list of str ] - Unique namespaces.
+        self._nameSpaces    = ['']
+
+        ## [ dict ] - Keys are namespaces, values are their ids.
+        self._lookup        = {'': 0}
+
+        ## [ list of array.array ] - Indices of the names of each namespace id, built when they are first asked for.
+        self._indices       = None
+
+        if names is not None:
+            self.parse(names)
+
+    #
+    ## @brief Number of the names.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the names.
+    def __len__(self):
+
+        return len(self._nameSpaceIds)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Namespace table.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Unique namespaces, indices are namespace ids.
+    def nameSpaces(self):
+
+        return list(self._nameSpaces)
+
+    #
+    ## @brief Namespace ids of the names, it should not be modified.
+    #
+    #  @exception N/A
+    #
+    #  @return array.array - Namespace ids in the order of the names.
+    def nameSpaceIds(self):
+
+        return self._nameSpaceIds
+
+    #
+    ## @brief Name at given index.
+    #
+    #  @param index [ int | None | in  ] - Index of the name.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Name.
+    def name(self, index):
+
+        return self._names[index]
+
+    #
+    ## @brief Short name at given index.
+    #
+    #  @param index [ int | None | in  ] - Index of the name.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Name without namespace and DAG path.
+    def shortName(self, index):
+
+        return self._names[index].rpartition('|')[2].rpartition(':')[2]
+
+    #
+    ## @brief Short names of all names.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Names without namespace and DAG path.
+    def shortNames(self):
+
+        return [x.rpartition('|')[2].rpartition(':')[2] for x in self._names]
+
+    #
+    ## @brief Namespace at given index.
+    #
+    #  @param index [ int | None | in  ] - Index of the name.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Namespace.
+    def nameSpace(self, index):
+
+        return self._nameSpaces[self._nameSpaceIds[index]]
+
+    #
+    ## @brief Indices of the names in given namespace.
+    #
+    #  @param nameSpace [ str | None | in  ] - Namespace.
+    #
+    #  @exception N/A
+    #
+    #  @return array.array - Indices.
+    def indices(self, nameSpace):
+
+        nameSpaceId = self._lookup.get(nameSpace.strip(':'))
+        if nameSpaceId is None:
+            return array('L')
+
+        if self._indices is None:
+
+            indices = [array('L') for _ in self._nameSpaces]
+            for index, x in enumerate(self._nameSpaceIds):
+                indices[x].append(index)
+
+            self._indices = indices
+
+        return array('L', self._indices[nameSpaceId])
+
+    #
+    ## @brief Number of the names in each namespace.
+    #
+    #  @exception N/A
+    #
+    #  @return list of int - Numbers in the order of the namespace table.
+    def counts(self):
+
+        counts = [0] * len(self._nameSpaces)
+
+        for nameSpaceId in self._nameSpaceIds:
+            counts[nameSpaceId] += 1
+
+        return counts
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Parse given names, previous results are replaced.
+    #
+    #  @param names [ iterable of str | None | in  ] - Names of the nodes, DAG or DG names.
+    #
+    #  @exception ValueError - If a name contains a new line.
+    #
+    #  @return int - Number of the names.
+    def parse(self, names):
+
+        names           = names if isinstance(names, tuple) else tuple(names)
+        nameSpaceIds    = array('I')
+        nameSpaces      = ['']
+        lookup          = {'': 0}
+        getNameSpaceId  = lookup.__getitem__
+
+        for start in range(0, len(names), _BATCH_CHUNK_SIZE):
+
+            chunk  = names[start:start + _BATCH_CHUNK_SIZE]
+            buffer = '\n'.join(chunk)
+
+            if buffer.count('\n') != len(chunk) - 1:
+                raise ValueError('Names can not contain new lines.')
+
+            found = _NAME_PATTERN.findall(buffer)
+
+            for nameSpace in sorted(set(found).difference(lookup)):
+                lookup[nameSpace] = len(nameSpaces)
+                nameSpaces.append(nameSpace)
+
+            nameSpaceIds.extend(array('I', map(getNameSpaceId, found)))
+
+        self._names         = names
+        self._nameSpaceIds  = nameSpaceIds
+        self._nameSpaces    = nameSpaces
+        self._lookup        = lookup
+        self._indices       = None
+
+        return len(nameSpaceIds)
+
+#
+## @brief Time parsing given number of names by a namespace batch and by creating a namespace object per name.
+#
+#  @param count          [ int | 100000 | in  ] - Number of the names.
+#  @param nameSpaceCount [ int | 100    | in  ] - Number of the namespaces of the names.
+#
+#  @exception N/A
+#
+#  @return collections.OrderedDict - Keys are: count, nameSpaceCount, batchSeconds, objectSeconds.
+def benchmark(count=100000, nameSpaceCount=100):
+
+    names = ['|char{0}:grp|char{0}:rig:node{1}'.format(x % nameSpaceCount, x) if x % 2 else 'char{}:node{}'.format(x % nameSpaceCount, x)
+             for x in range(count)]
+
+    startTime    = _clock()
+    NameSpaceBatch(names)
+    batchSeconds = _clock() - startTime
+
+    startTime     = _clock()
+    [NameSpace(nameSpace=x) for x in names]
+    objectSeconds = _clock() - startTime
+
+    return OrderedDict([('count'            , count),
+                        ('nameSpaceCount'   , nameSpaceCount),
+                        ('batchSeconds'     , batchSeconds),
+                        ('objectSeconds'    , objectSeconds)])
+
+#
+## @brief Get the namespace tree of the session, it is a snapshot of the scene until its `install` method is called.
+#
+#  @exception N/A
+#
+#  @return mMayaCore.nameSpaceLib.NameSpaceTree - Namespace tree.
+def getNameSpaceTree():
+
+    global _nameSpaceTree
+
+    if not _nameSpaceTree:
+        _nameSpaceTree = NameSpaceTree()
+
+    return _nameSpaceTree
@@ -27,11 +27,21 @@
 # ----------------------------------------------------------------------------------------------------
 from maya import cmds
 
+import mMayaCore.callbackLib
+
 
 #
 # ----------------------------------------------------------------------------------------------------
 # CODE
 # ----------------------------------------------------------------------------------------------------
+## [ tuple of str ] - Scene messages dirty option variables are written to Maya on.
+FLUSH_MESSAGES      = ('kBeforeSave',
+                       'kMayaExiting')
+
+## [ mMayaCore.optionVarLib.OptionVarStore ] - Option variable store of the session.
+_optionVarStore     = None
+
+
 #
 ## @brief [ CLASS ] - Class provides functionalities to operate on optionVar in Maya.
 #
@@ -160,3 +170,471 @@ class OptionVar(object):
     def list():
 
         return cmds.optionVar(list=True)
+
+
+#
+## @brief [ CLASS ] - Class caches option variables and writes changed ones to Maya in batches.
+#
+#  Each option variable is queried from Maya once, then it is read from the memory. Set and removed option variables
+#  are kept as dirty and they are written to Maya together when Maya is idle, before a scene is saved and before
+#  Maya exits. Nothing is cached and changes are written at once unless the callbacks are installed.
+#
+#  Option variables changed by other means than the store should be reloaded.
+#
+#  @code
+#import sys
+#import mMayaCore.optionVarLib
+#
+#store = mMayaCore.optionVarLib.getOptionVarStore()
+#
+#store.load(['lastSelectedObject', 'toolSize'])
+#
+#sys.stdout.write(store.value('lastSelectedObject'))
+# # cube1
+#
+#store.setValue('toolSize', 2.5)
+#
+#sys.stdout.write(store.dirty())
+# # ['toolSize']
+#
+#sys.stdout.write(store.stats())
+# # {'hits': 1, 'misses': 2, 'writes': 1, 'flushes': 0, 'flushedValues': 0}
+#  @endcode
+class OptionVarStore(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self):
+
+        ## [ dict ] - Keys are names of the option variables, values are their values, None if they don't exist.
+        self._values        = {}
+
+        ## [ dict ] - Keys are names of the changed option variables, values are their values, None if they are removed.
+        self._dirty         = {}
+
+        ## [ int ] - Script job id of the idle event which flushes the dirty option variables.
+        self._scriptJob     = None
+
+        ## [ mMayaCore.callbackLib.CallbackGroup ] - Callbacks which flush the dirty option variables.
+        self._callbackGroup = mMayaCore.callbackLib.CallbackGroup()
+
+        ## [ dict ] - Statistics, keys are: hits, misses, writes, flushes, flushedValues.
+        self._stats         = {'hits'           : 0,
+                               'misses'         : 0,
+                               'writes'         : 0,
+                               'flushes'        : 0,
+                               'flushedValues'  : 0}
+
+    #
+    ## @brief Number of the cached option variables.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the option variables.
+    def __len__(self):
+
+        return len(self._values)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Whether the callbacks are installed, nothing is cached otherwise.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isInstalled(self):
+
+        return len(self._callbackGroup) > 0
+
+    #
+    ## @brief Statistics.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: hits, misses, writes, flushes, flushedValues.
+    def stats(self):
+
+        return dict(self._stats)
+
+    #
+    ## @brief Names of the option variables which are changed but not written to Maya yet.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Names of the option variables.
+    def dirty(self):
+
+        return sorted(self._dirty)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Check whether given option variable exists.
+    #
+    #  @param name [ str | None | in  ] - Name of the option variable.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def exists(self, name):
+
+        return self.value(name) is not None
+
+    #
+    ## @brief Get the value of given option variable.
+    #
+    #  @param name [ str | None | in  ] - Name of the option variable.
+    #
+    #  @exception N/A
+    #
+    #  @return int, float, str - Value of the option variable.
+    #  @return None            - If option variable doesn't exist.
+    def value(self, name):
+
+        if name in self._values:
+            self._stats['hits'] += 1
+            return self._values[name]
+
+        self._stats['misses'] += 1
+
+        value = OptionVar(name).value()
+
+        if self.isInstalled():
+            self._values[name] = value
+
+        return value
+
+    #
+    ## @brief Set value of given option variable, it is written to Maya when the dirty option variables are flushed.
+    #
+    #  Values of the other types than int, float and str are ignored like `mMayaCore.optionVarLib.OptionVar.setValue` does.
+    #
+    #  @param name  [ str             | None | in  ] - Name of the option variable.
+    #  @param value [ int, float, str | None | in  ] - Value to be set.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def setValue(self, name, value):
+
+        if not isinstance(value, (str, int, float)):
+            return
+
+        self._stats['writes'] += 1
+
+        if not self.isInstalled():
+            OptionVar(name).setValue(value)
+            return
+
+        if isinstance(value, bool):
+            value = int(value)
+
+        self._values[name] = value
+        self._dirty[name]  = value
+
+        self._scheduleFlush()
+
+    #
+    ## @brief Remove given option variable, it is removed from Maya when the dirty option variables are flushed.
+    #
+    #  @param name [ str | None | in  ] - Name of the option variable.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def remove(self, name):
+
+        self._stats['writes'] += 1
+
+        if not self.isInstalled():
+            OptionVar(name).remove()
+            return
+
+        self._values[name] = None
+        self._dirty[name]  = None
+
+        self._scheduleFlush()
+
+    #
+    ## @brief Query given option variables from Maya, the cached ones are skipped.
+    #
+    #  @param names [ list of str | None | in  ] - Names of the option variables.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the queried option variables.
+    def load(self, names):
+
+        names = [x for x in names if x not in self._values]
+
+        for name in names:
+            self.value(name)
+
+        return len(names)
+
+    #
+    ## @brief Discard cached values, dirty option variables are kept.
+    #
+    #  @param names [ list of str | None | in  ] - Names of the option variables, all if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def reload(self, names=None):
+
+        if names is None:
+            names = list(self._values)
+
+        for name in names:
+            if name not in self._dirty:
+                self._values.pop(name, None)
+
+    #
+    ## @brief Write the dirty option variables to Maya, it is called by the callbacks.
+    #
+    #  Idle event which is scheduled to flush the dirty option variables is killed, nothing is left to flush.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the written option variables.
+    def flush(self, *args):
+
+        self._killScriptJob()
+
+        return self._flush()
+
+    #
+    ## @brief Install the callbacks which flush the dirty option variables.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False if they are already installed.
+    def install(self):
+
+        if self.isInstalled():
+            return False
+
+        self._callbackGroup.addSceneCallbacks(FLUSH_MESSAGES, self.flush)
+
+        return True
+
+    #
+    ## @brief Flush the dirty option variables, remove the callbacks and clear the cache.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def uninstall(self):
+
+        self.flush()
+
+        self._callbackGroup.remove()
+        self._values = {}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Write the dirty option variables to Maya.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the written option variables.
+    def _flush(self):
+
+        if not self._dirty:
+            return 0
+
+        dirty       = self._dirty
+        self._dirty = {}
+
+        for name, value in dirty.items():
+
+            if value is None:
+                OptionVar(name).remove()
+            else:
+                OptionVar(name).setValue(value)
+
+        self._stats['flushes']          += 1
+        self._stats['flushedValues']    += len(dirty)
+
+        return len(dirty)
+
+    #
+    ## @brief Flush the dirty option variables, it is run by the idle event.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _flushOnIdle(self):
+
+        self._scriptJob = None
+
+        self._flush()
+
+    #
+    ## @brief Kill the idle event which is scheduled to flush the dirty option variables.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _killScriptJob(self):
+
+        if self._scriptJob is not None and cmds.scriptJob(exists=self._scriptJob):
+            cmds.scriptJob(kill=self._scriptJob, force=True)
+
+        self._scriptJob = None
+
+    #
+    ## @brief Flush the dirty option variables next time Maya is idle.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _scheduleFlush(self):
+
+        if self._scriptJob is not None:
+            return
+
+        self._scriptJob = cmds.scriptJob(idleEvent=self._flushOnIdle, runOnce=True)
+
+#
+## @brief [ CLASS ] - Class provides functionalities of `mMayaCore.optionVarLib.OptionVar` through an option variable store.
+#
+#  Values are read from the store and changes are written to Maya in batches @see OptionVarStore.
+#
+#  @code
+#import sys
+#import mMayaCore.optionVarLib
+#
+#optionVar = mMayaCore.optionVarLib.CachedOptionVar('lastSelectedObject')
+#
+#optionVar.setValue('cube1')
+#
+#sys.stdout.write(optionVar.value())
+# # cube1
+#
+#mMayaCore.optionVarLib.getOptionVarStore().flush()
+#  @endcode
+class CachedOptionVar(OptionVar):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param name  [ str                                   | None | in ] - Name of the variable.
+    #  @param store [ mMayaCore.optionVarLib.OptionVarStore | None | in ] - Option variable store, the one of the session is used if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, name, store=None):
+
+        OptionVar.__init__(self, name)
+
+        ## [ mMayaCore.optionVarLib.OptionVarStore ] - Option variable store.
+        self._store = store if store is not None else getOptionVarStore()
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Option variable store.
+    #
+    #  @exception N/A
+    #
+    #  @return mMayaCore.optionVarLib.OptionVarStore - Option variable store.
+    def store(self):
+
+        return self._store
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Check whether the option variable exists.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def exists(self):
+
+        return self._store.exists(self._name)
+
+    #
+    ## @brief Remove the option variable.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def remove(self):
+
+        self._store.remove(self._name)
+
+    #
+    ## @brief Set value of the option variable.
+    #
+    #  @param value [ int, float, str | None | in ] - Value to be set.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def setValue(self, value):
+
+        self._store.setValue(self._name, value)
+
+    #
+    ## @brief Get the value of the option variable.
+    #
+    #  @exception N/A
+    #
+    #  @return int, float, str - Value of the option variable.
+    #  @return None            - If option variable doesn't exist.
+    def value(self):
+
+        return self._store.value(self._name)
+
+    #
+    ## @brief List all option variables, dirty option variables of the store are flushed first.
+    #
+    #  @exception N/A
+    #
+    #  @return str list - Option variables
+    def list(self):
+
+        self._store.flush()
+
+        return OptionVar.list()
+
+#
+## @brief Get the option variable store of the session, its callbacks are installed when it is created.
+#
+#  @exception N/A
+#
+#  @return mMayaCore.optionVarLib.OptionVarStore - Option variable store.
+def getOptionVarStore():
+
+    global _optionVarStore
+
+    if _optionVarStore is None:
+        _optionVarStore = OptionVarStore()
+        _optionVarStore.install()
+
+    return _optionVarStore
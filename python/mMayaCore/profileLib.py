@@ -0,0 +1,393 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMayaCore/profileLib.py @brief [ FILE ] - Opt-in profiling of startup and menu initialization.
+## @package mMayaCore.profileLib    @brief [ FILE ] - Opt-in profiling of startup and menu initialization.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  json
+import  time
+import  tempfile
+import  threading
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Environment variable which enables profiling, value is the output directory or 1 for the temp directory.
+PROFILE_ENVIRONMENT_VARIABLE    = 'MMAYACORE_PROFILE'
+
+## [ str ] - Prefix of the output file names.
+OUTPUT_FILE_PREFIX              = 'mMayaCoreProfile'
+
+## [ callable ] - High resolution clock.
+_clock                          = getattr(time, 'perf_counter', time.time)
+
+## [ mMayaCore.profileLib.Profiler ] - Profiler of the session.
+_profiler                       = None
+
+
+#
+## @brief [ CLASS ] - Span which does nothing, used when profiling is disabled.
+class NullSpan(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Enter.
+    #
+    #  @exception N/A
+    #
+    #  @return mMayaCore.profileLib.NullSpan - This span.
+    def __enter__(self):
+
+        return self
+
+    #
+    ## @brief Exit.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False, exceptions are not suppressed.
+    def __exit__(self, *args):
+
+        return False
+
+#
+## @brief [ CLASS ] - Timed span of a profiler.
+class Span(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param profiler [ mMayaCore.profileLib.Profiler | None | in  ] - Profiler the span is recorded in.
+    #  @param name     [ str                           | None | in  ] - Name of the span.
+    #  @param category [ str                           | None | in  ] - Category of the span.
+    #  @param args     [ dict                          | None | in  ] - Arguments of the span.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, profiler, name, category, args):
+
+        ## [ mMayaCore.profileLib.Profiler ] - Profiler.
+        self._profiler  = profiler
+
+        ## [ str ] - Name.
+        self._name      = name
+
+        ## [ str ] - Category.
+        self._category  = category
+
+        ## [ dict ] - Arguments.
+        self._args      = args
+
+        ## [ float ] - Start time.
+        self._start     = None
+
+    #
+    ## @brief Enter, start the span.
+    #
+    #  @exception N/A
+    #
+    #  @return mMayaCore.profileLib.Span - This span.
+    def __enter__(self):
+
+        self._start = _clock()
+
+        return self
+
+    #
+    ## @brief Exit, record the span.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False, exceptions are not suppressed.
+    def __exit__(self, *args):
+
+        self._profiler.addSpan(self._name, self._category, self._start, _clock() - self._start, self._args)
+
+        return False
+
+#
+## @brief [ CLASS ] - Class records timed spans and writes them as Chrome trace event JSON and text summary.
+#
+#  Trace files can be opened in `chrome://tracing` or https://ui.perfetto.dev
+#
+#  @code
+#import mMayaCore.profileLib
+#
+#profiler = mMayaCore.profileLib.Profiler(outputDirectory='/tmp')
+#
+#with profiler.span('discover applications', 'menu'):
+#    pass
+#
+#sys.stdout.write(profiler.write())
+# # ('/tmp/mMayaCoreProfile_1234.json', '/tmp/mMayaCoreProfile_1234.txt')
+#  @endcode
+class Profiler(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param outputDirectory [ str | None | in  ] - Directory the output files are written in, temp directory is used if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, outputDirectory=None):
+
+        ## [ str ] - Output directory.
+        self._outputDirectory   = outputDirectory or tempfile.gettempdir()
+
+        ## [ float ] - Start time, time stamps of the spans are relative to this time.
+        self._startTime         = _clock()
+
+        ## [ list of tuple ] - Spans, each tuple contains name, category, start, duration, args and thread id.
+        self._spans             = []
+
+        ## [ threading.Lock ] - Lock.
+        self._lock              = threading.Lock()
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Output directory.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Directory.
+    def outputDirectory(self):
+
+        return self._outputDirectory
+
+    #
+    ## @brief Recorded spans.
+    #
+    #  @exception N/A
+    #
+    #  @return list of tuple - Each tuple contains name, category, start, duration, args and thread id.
+    def spans(self):
+
+        with self._lock:
+            return list(self._spans)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Create a span to be used as context manager.
+    #
+    #  @param name     [ str | None | in  ] - Name of the span.
+    #  @param category [ str | ''   | in  ] - Category of the span.
+    #  @param args     [ any | None | in  ] - Keyword arguments are recorded as arguments of the span.
+    #
+    #  @exception N/A
+    #
+    #  @return mMayaCore.profileLib.Span - Span.
+    def span(self, name, category='', **args):
+
+        return Span(self, name, category, args)
+
+    #
+    ## @brief Add a span.
+    #
+    #  @param name     [ str   | None | in  ] - Name of the span.
+    #  @param category [ str   | None | in  ] - Category of the span.
+    #  @param start    [ float | None | in  ] - Start time in seconds.
+    #  @param duration [ float | None | in  ] - Duration in seconds.
+    #  @param args     [ dict  | None | in  ] - Arguments of the span.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def addSpan(self, name, category, start, duration, args=None):
+
+        with self._lock:
+            self._spans.append((name, category, start, duration, args or {}, threading.current_thread().ident))
+
+    #
+    ## @brief Get spans as Chrome trace events.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Trace.
+    def toTrace(self):
+
+        processId = os.getpid()
+        events    = []
+
+        for name, category, start, duration, args, threadId in self.spans():
+            events.append({'name'   : name,
+                           'cat'    : category,
+                           'ph'     : 'X',
+                           'ts'     : (start - self._startTime) * 1000000.0,
+                           'dur'    : duration * 1000000.0,
+                           'pid'    : processId,
+                           'tid'    : threadId,
+                           'args'   : dict((k, str(v)) for k, v in args.items())})
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    #
+    ## @brief Get summary of the spans as text.
+    #
+    #  Spans are grouped by category and name and sorted by total duration, slowest individual spans are
+    #  listed afterwards.
+    #
+    #  @param limit [ int | 30 | in  ] - Maximum number of the slowest individual spans listed.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Summary.
+    def summary(self, limit=30):
+
+        spans  = self.spans()
+        groups = {}
+
+        for name, category, start, duration, args, threadId in spans:
+            group = groups.setdefault((category, name), [0, 0.0, 0.0])
+            group[0] += 1
+            group[1] += duration
+            group[2]  = max(group[2], duration)
+
+        lines = ['{:>10}  {:>10}  {:>8}  {}'.format('Total ms', 'Max ms', 'Count', 'Category / Name')]
+        for (category, name), (count, total, maximum) in sorted(groups.items(), key=lambda x: x[1][1], reverse=True):
+            lines.append('{:>10.3f}  {:>10.3f}  {:>8}  {} / {}'.format(total * 1000.0, maximum * 1000.0, count, category, name))
+
+        lines.append('')
+        lines.append('{:>10}  {}'.format('Span ms', 'Slowest Spans'))
+        for name, category, start, duration, args, threadId in sorted(spans, key=lambda x: x[3], reverse=True)[:limit]:
+            details = ', '.join('{}={}'.format(k, v) for k, v in sorted(args.items()))
+            lines.append('{:>10.3f}  {} / {}{}'.format(duration * 1000.0, category, name, '  ({})'.format(details) if details else ''))
+
+        return '\n'.join(lines) + '\n'
+
+    #
+    ## @brief Write trace and summary files.
+    #
+    #  Existing files of this process are overwritten, so this method can be called again after more spans are added.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path of the trace file.
+    #  @return str - Path of the summary file.
+    def write(self):
+
+        if not os.path.isdir(self._outputDirectory):
+            os.makedirs(self._outputDirectory)
+
+        baseName    = os.path.join(self._outputDirectory, '{}_{}'.format(OUTPUT_FILE_PREFIX, os.getpid()))
+        traceFile   = '{}.json'.format(baseName)
+        summaryFile = '{}.txt'.format(baseName)
+
+        with open(traceFile, 'w') as outFile:
+            json.dump(self.toTrace(), outFile)
+
+        with open(summaryFile, 'w') as outFile:
+            outFile.write(self.summary())
+
+        return traceFile, summaryFile
+
+#
+## @brief Get the profiler of the session.
+#
+#  Profiler is created the first time this function is called if PROFILE_ENVIRONMENT_VARIABLE is set.
+#
+#  @exception N/A
+#
+#  @return mMayaCore.profileLib.Profiler - Profiler.
+#  @return None                          - If profiling is not enabled.
+def getProfiler():
+
+    global _profiler
+
+    if _profiler:
+        return _profiler
+
+    value = os.environ.get(PROFILE_ENVIRONMENT_VARIABLE)
+    if not value or value == '0':
+        return None
+
+    _profiler = Profiler(outputDirectory=None if value.lower() in ('1', 'true', 'yes') else value)
+
+    return _profiler
+
+#
+## @brief Create a span in the profiler of the session.
+#
+#  A span which does nothing is returned if profiling is not enabled, so it can be used unconditionally.
+#
+#  @code
+#import mMayaCore.profileLib
+#
+#with mMayaCore.profileLib.span('discover applications', 'menu'):
+#    pass
+#  @endcode
+#
+#  @param name     [ str | None | in  ] - Name of the span.
+#  @param category [ str | ''   | in  ] - Category of the span.
+#  @param args     [ any | None | in  ] - Keyword arguments are recorded as arguments of the span.
+#
+#  @exception N/A
+#
+#  @return mMayaCore.profileLib.Span     - Span.
+#  @return mMayaCore.profileLib.NullSpan - If profiling is not enabled.
+def span(name, category='', **args):
+
+    profiler = getProfiler()
+    if not profiler:
+        return _NULL_SPAN
+
+    return profiler.span(name, category, **args)
+
+#
+## @brief Write the output files of the profiler of the session.
+#
+#  @exception N/A
+#
+#  @return tuple - Paths of the trace and summary files.
+#  @return None  - If profiling is not enabled.
+def write():
+
+    profiler = getProfiler()
+    if not profiler:
+        return None
+
+    return profiler.write()
+
+
+## [ mMayaCore.profileLib.NullSpan ] - Span used when profiling is disabled.
+_NULL_SPAN = NullSpan()
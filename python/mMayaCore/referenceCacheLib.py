@@ -0,0 +1,626 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMayaCore/referenceCacheLib.py @brief [ FILE ] - Local read-through cache of referenced files.
+## @package mMayaCore.referenceCacheLib    @brief [ FILE ] - Local read-through cache of referenced files.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  sys
+import  shutil
+import  hashlib
+import  tempfile
+import  threading
+
+from    collections import OrderedDict
+from    multiprocessing.pool import ThreadPool
+
+import  mMayaCore.sceneHeaderLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Environment variable which enables the cache, value is the cache directory on local storage.
+CACHE_DIRECTORY_ENVIRONMENT_VARIABLE    = 'MMAYACORE_REFERENCE_CACHE'
+
+## [ str ] - Environment variable of the size limit of the cache in gigabytes.
+CACHE_SIZE_ENVIRONMENT_VARIABLE         = 'MMAYACORE_REFERENCE_CACHE_SIZE'
+
+## [ float ] - Default size limit of the cache in gigabytes.
+DEFAULT_CACHE_SIZE                      = 50.0
+
+## [ int ] - Number of the threads files are prefetched with.
+PREFETCH_THREADS                        = 4
+
+## [ str ] - Extension of the files which contain the source path of the cached files.
+SOURCE_FILE_EXTENSION                   = '.source'
+
+## [ mMayaCore.referenceCacheLib.ReferenceCache ] - Reference cache of the session.
+_referenceCache                         = None
+
+
+#
+## @brief [ CLASS ] - Class copies referenced files to a local cache directory and resolves them to the local copies.
+#
+#  Copies are keyed by the path, size and modification time of the source file, so a changed file is copied again.
+#  Least recently used copies are evicted when the size of the cache exceeds its limit. Copies which are prefetched or
+#  resolved are pinned, so they are not evicted while Maya is about to read them, until they are unpinned, which is
+#  done when their references are unloaded or removed or a new scene is opened @see mMayaCore.referenceLib.ReferenceCacheHook.
+#
+#  Files which reference other files with relative paths are not cached, since their references can't be resolved
+#  from the cache directory.
+#
+#  @code
+#import sys
+#import mMayaCore.referenceCacheLib
+#
+#cache = mMayaCore.referenceCacheLib.ReferenceCache('/local/referenceCache', maxSize=20 * 1024 ** 3)
+#
+#cache.prefetch(['/nfs/assets/chair.ma', '/nfs/assets/table.mb'])
+#
+#sys.stdout.write(cache.resolve('/nfs/assets/chair.ma'))
+# # /local/referenceCache/3f/3f2a...c1/chair.ma
+#
+#sys.stdout.write(cache.sourceFile('/local/referenceCache/3f/3f2a...c1/chair.ma'))
+# # /nfs/assets/chair.ma
+#
+#sys.stdout.write(cache.stats())
+# # {'hits': 1, 'misses': 0, 'prefetched': 2, 'errors': 0, 'evictions': 0, 'bytesCopied': 52428800, 'size': 52428800, 'count': 2, 'pinned': 2}
+#
+#cache.unpin()
+#cache.evict()
+#  @endcode
+class ReferenceCache(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param directory [ str | None             | in  ] - Cache directory on local storage.
+    #  @param maxSize   [ int | None             | in  ] - Size limit of the cache in bytes, DEFAULT_CACHE_SIZE if None given.
+    #  @param threads   [ int | PREFETCH_THREADS | in  ] - Number of the threads files are prefetched with.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, directory, maxSize=None, threads=PREFETCH_THREADS):
+
+        ## [ str ] - Cache directory.
+        self._directory = os.path.abspath(directory)
+
+        ## [ int ] - Size limit in bytes.
+        self._maxSize   = maxSize or int(DEFAULT_CACHE_SIZE * 1024 ** 3)
+
+        ## [ int ] - Number of prefetch threads.
+        self._threads   = threads
+
+        ## [ multiprocessing.pool.ThreadPool ] - Prefetch thread pool, it is created when it is needed.
+        self._pool      = None
+
+        ## [ collections.OrderedDict ] - Copies, keys are cache keys, values are paths and sizes, least recently used first.
+        self._entries   = None
+
+        ## [ set ] - Keys of the copies prefetched or resolved since they are unpinned, they are not evicted.
+        self._pinned    = set()
+
+        ## [ dict ] - Copies being prefetched, keys are cache keys, values are async results.
+        self._pending   = {}
+
+        ## [ threading.RLock ] - Lock.
+        self._lock      = threading.RLock()
+
+        ## [ dict ] - Statistics.
+        self._stats     = {'hits'           : 0,
+                           'misses'         : 0,
+                           'prefetched'     : 0,
+                           'errors'         : 0,
+                           'evictions'      : 0,
+                           'bytesCopied'    : 0}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Cache directory.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Directory.
+    def directory(self):
+
+        return self._directory
+
+    #
+    ## @brief Size limit in bytes.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Size.
+    def maxSize(self):
+
+        return self._maxSize
+
+    #
+    ## @brief Statistics.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: hits, misses, prefetched, errors, evictions, bytesCopied, size, count, pinned.
+    def stats(self):
+
+        with self._lock:
+            entries         = self._getEntries()
+            stats           = dict(self._stats)
+            stats['size']   = sum([x[1] for x in entries.values()])
+            stats['count']  = len(entries)
+            stats['pinned'] = len(self._pinned)
+
+        return stats
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Check whether given path is a copy in the cache.
+    #
+    #  @param filePath [ str | None | in  ] - File path.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isCached(self, filePath):
+
+        return os.path.abspath(filePath).startswith(self._directory + os.sep)
+
+    #
+    ## @brief Resolve given file to its local copy, file is copied if it is not in the cache.
+    #
+    #  @param filePath [ str | None | in  ] - Path of the source file.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path of the local copy, or given path if it can't be cached.
+    def resolve(self, filePath):
+
+        if self.isCached(filePath):
+            return filePath
+
+        key = self.key(filePath)
+        if not key:
+            return filePath
+
+        with self._lock:
+            pending = self._pending.get(key)
+
+        if pending:
+            pending.wait()
+
+        with self._lock:
+
+            entry = self._getEntries().get(key)
+            if entry and os.path.isfile(entry[0]):
+                self._stats['hits'] += 1
+                self._touch(key)
+                return entry[0]
+
+            self._stats['misses'] += 1
+
+        cachedFile = self._copy(key, filePath)
+        if not cachedFile:
+            return filePath
+
+        with self._lock:
+            self._touch(key)
+
+        return cachedFile
+
+    #
+    ## @brief Copy given files to the cache in background threads.
+    #
+    #  @param filePaths [ list of str | None | in  ] - Paths of the source files.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the files scheduled to be copied.
+    def prefetch(self, filePaths):
+
+        count = 0
+
+        with self._lock:
+
+            entries = self._getEntries()
+
+            for filePath in filePaths:
+
+                if self.isCached(filePath):
+                    continue
+
+                key = self.key(filePath)
+                if not key or key in self._pending:
+                    continue
+
+                if key in entries:
+                    self._pinned.add(key)
+                    continue
+
+                if not self._pool:
+                    self._pool = ThreadPool(self._threads)
+
+                self._pending[key] = self._pool.apply_async(self._prefetch, (key, filePath))
+                count += 1
+
+        return count
+
+    #
+    ## @brief Wait for the files being prefetched.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def wait(self):
+
+        with self._lock:
+            pending = list(self._pending.values())
+
+        for result in pending:
+            result.wait()
+
+    #
+    ## @brief Get the path of the source file of given local copy.
+    #
+    #  @param filePath [ str | None | in  ] - Path of the local copy.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path of the source file, or given path if it is not a local copy.
+    def sourceFile(self, filePath):
+
+        if not self.isCached(filePath):
+            return filePath
+
+        try:
+            with open(os.path.dirname(filePath) + SOURCE_FILE_EXTENSION, 'r') as sourceFile:
+                return sourceFile.read().strip() or filePath
+        except (IOError, OSError):
+            return filePath
+
+    #
+    ## @brief Get cache key of given file.
+    #
+    #  @param filePath [ str | None | in  ] - Path of the source file.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Key.
+    #  @return None - If file doesn't exist.
+    def key(self, filePath):
+
+        try:
+            stat = os.stat(filePath)
+        except OSError:
+            return None
+
+        value = u'{}|{}|{!r}'.format(os.path.abspath(filePath), stat.st_size, stat.st_mtime)
+
+        return hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+    #
+    ## @brief Unpin given copy, or all copies, so they can be evicted.
+    #
+    #  @param filePath [ str | None | in  ] - Path of the local copy or the source file, all copies are unpinned if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the unpinned copies.
+    def unpin(self, filePath=None):
+
+        with self._lock:
+
+            if filePath is None:
+                count = len(self._pinned)
+                self._pinned.clear()
+                return count
+
+            if self.isCached(filePath):
+                key = os.path.basename(os.path.dirname(os.path.abspath(filePath)))
+            else:
+                key = self.key(filePath)
+
+            if key not in self._pinned:
+                return 0
+
+            self._pinned.remove(key)
+
+        return 1
+
+    #
+    ## @brief Evict least recently used copies until the size of the cache is below the limit.
+    #
+    #  @param maxSize [ int | None | in  ] - Size limit in bytes, size limit of the cache is used if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the evicted copies.
+    def evict(self, maxSize=None):
+
+        maxSize = self._maxSize if maxSize is None else maxSize
+        count   = 0
+
+        with self._lock:
+
+            entries = self._getEntries()
+            size    = sum([x[1] for x in entries.values()])
+
+            for key in list(entries):
+
+                if size <= maxSize:
+                    break
+
+                if key in self._pinned or key in self._pending:
+                    continue
+
+                cachedFile, fileSize = entries.pop(key)
+                shutil.rmtree(os.path.dirname(cachedFile), ignore_errors=True)
+
+                try:
+                    os.remove(os.path.dirname(cachedFile) + SOURCE_FILE_EXTENSION)
+                except OSError:
+                    pass
+
+                size  -= fileSize
+                count += 1
+
+            self._stats['evictions'] += count
+
+        return count
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get the copies, cache directory is scanned the first time.
+    #
+    #  @exception N/A
+    #
+    #  @return collections.OrderedDict - Keys are cache keys, values are paths and sizes, least recently used first.
+    def _getEntries(self):
+
+        if self._entries is not None:
+            return self._entries
+
+        entries = []
+
+        if os.path.isdir(self._directory):
+            for prefix in os.listdir(self._directory):
+
+                prefixDirectory = os.path.join(self._directory, prefix)
+                if not os.path.isdir(prefixDirectory):
+                    continue
+
+                for key in os.listdir(prefixDirectory):
+
+                    keyDirectory = os.path.join(prefixDirectory, key)
+                    if not os.path.isdir(keyDirectory):
+                        continue
+
+                    for fileName in os.listdir(keyDirectory):
+                        if not fileName.startswith('.'):
+                            stat = os.stat(os.path.join(keyDirectory, fileName))
+                            entries.append((stat.st_mtime, key, os.path.join(keyDirectory, fileName), stat.st_size))
+
+        self._entries = OrderedDict((x[1], (x[2], x[3])) for x in sorted(entries))
+
+        return self._entries
+
+    #
+    ## @brief Mark given copy as the most recently used one.
+    #
+    #  @param key [ str | None | in  ] - Cache key.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _touch(self, key):
+
+        entries = self._getEntries()
+        entry   = entries.pop(key, None)
+        if not entry:
+            return
+
+        entries[key] = entry
+        self._pinned.add(key)
+
+        try:
+            os.utime(entry[0], None)
+        except OSError:
+            pass
+
+    #
+    ## @brief Copy given file into the cache.
+    #
+    #  File is copied to a temporary file first and renamed, so partially copied files are never resolved.
+    #
+    #  @param key      [ str | None | in  ] - Cache key.
+    #  @param filePath [ str | None | in  ] - Path of the source file.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Path of the local copy.
+    #  @return None - If file can't be cached.
+    def _copy(self, key, filePath):
+
+        if not isRelocatable(filePath):
+            return None
+
+        keyDirectory = os.path.join(self._directory, key[:2], key)
+        cachedFile   = os.path.join(keyDirectory, os.path.basename(filePath))
+
+        try:
+            if not os.path.isdir(keyDirectory):
+                os.makedirs(keyDirectory)
+
+            if not os.path.isfile(cachedFile):
+
+                fileDescriptor, temporaryFile = tempfile.mkstemp(prefix='.', dir=keyDirectory)
+                os.close(fileDescriptor)
+
+                shutil.copyfile(filePath, temporaryFile)
+                os.rename(temporaryFile, cachedFile)
+
+                with open(keyDirectory + SOURCE_FILE_EXTENSION, 'w') as sourceFile:
+                    sourceFile.write(os.path.abspath(filePath))
+
+        except (IOError, OSError) as error:
+            sys.stderr.write('File could not be cached: {} - {}\n'.format(filePath, error))
+            with self._lock:
+                self._stats['errors'] += 1
+            return None
+
+        fileSize = os.path.getsize(cachedFile)
+
+        with self._lock:
+            self._getEntries()[key]         = (cachedFile, fileSize)
+            self._stats['bytesCopied']     += fileSize
+            self._pinned.add(key)
+
+        self.evict()
+
+        return cachedFile
+
+    #
+    ## @brief Copy given file into the cache, it is run in the prefetch threads.
+    #
+    #  @param key      [ str | None | in  ] - Cache key.
+    #  @param filePath [ str | None | in  ] - Path of the source file.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Path of the local copy.
+    #  @return None - If file can't be cached.
+    def _prefetch(self, key, filePath):
+
+        try:
+            cachedFile = self._copy(key, filePath)
+            if cachedFile:
+                with self._lock:
+                    self._stats['prefetched'] += 1
+            return cachedFile
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+#
+## @brief Check whether given Maya file can be read from another directory.
+#
+#  Files which reference other files with relative paths can't be, since the relative paths are resolved against the
+#  directory of the file. Files whose header can't be read are considered relocatable.
+#
+#  @param filePath [ str | None | in  ] - Path of the Maya file.
+#
+#  @exception N/A
+#
+#  @return bool - Result.
+def isRelocatable(filePath):
+
+    try:
+        header = mMayaCore.sceneHeaderLib.readHeader(filePath)
+    except Exception:
+        return True
+
+    if not header:
+        return True
+
+    for filePath in header.referencedFiles():
+        filePath = os.path.expanduser(os.path.expandvars(filePath))
+        if not os.path.isabs(filePath) and not filePath.startswith('$'):
+            return False
+
+    return True
+
+#
+## @brief Get the reference cache of the session.
+#
+#  Cache is created the first time this function is called if CACHE_DIRECTORY_ENVIRONMENT_VARIABLE is set.
+#
+#  @exception N/A
+#
+#  @return mMayaCore.referenceCacheLib.ReferenceCache - Reference cache.
+#  @return None                                       - If the cache is not enabled.
+def getReferenceCache():
+
+    global _referenceCache
+
+    if _referenceCache:
+        return _referenceCache
+
+    directory = os.environ.get(CACHE_DIRECTORY_ENVIRONMENT_VARIABLE)
+    if not directory:
+        return None
+
+    try:
+        maxSize = float(os.environ.get(CACHE_SIZE_ENVIRONMENT_VARIABLE, DEFAULT_CACHE_SIZE))
+    except ValueError:
+        maxSize = DEFAULT_CACHE_SIZE
+
+    _referenceCache = ReferenceCache(directory, maxSize=int(maxSize * 1024 ** 3))
+
+    return _referenceCache
+
+#
+## @brief Resolve given file to its local copy if the reference cache is enabled.
+#
+#  @param filePath [ str | None | in  ] - Path of the source file.
+#
+#  @exception N/A
+#
+#  @return str - Path of the local copy, or given path if the cache is not enabled or the file can't be cached.
+def resolve(filePath):
+
+    cache = getReferenceCache()
+    if not cache:
+        return filePath
+
+    return cache.resolve(filePath)
+
+#
+## @brief Get the path of the source file of given local copy if the reference cache is enabled.
+#
+#  @param filePath [ str | None | in  ] - Path of the local copy.
+#
+#  @exception N/A
+#
+#  @return str - Path of the source file, or given path if the cache is not enabled or it is not a local copy.
+def getSourceFile(filePath):
+
+    cache = getReferenceCache()
+    if not cache:
+        return filePath
+
+    return cache.sourceFile(filePath)
@@ -0,0 +1,589 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMayaCore/referenceCrawlerLib.py @brief [ FILE ] - Crawl nested references of Maya files without Maya.
+## @package mMayaCore.referenceCrawlerLib    @brief [ FILE ] - Crawl nested references of Maya files without Maya.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  re
+import  sys
+import  json
+import  time
+import  shutil
+import  struct
+import  tempfile
+import  multiprocessing
+
+from    collections import OrderedDict
+
+import  mMayaCore.sceneHeaderLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ int ] - Number of files given to a worker process at once.
+CHUNK_SIZE              = 8
+
+## [ str ] - Extension of the manifest files which are written as JSON lines.
+JSONL_EXTENSION         = '.jsonl'
+
+## [ callable ] - High resolution clock.
+_clock                  = getattr(time, 'perf_counter', time.time)
+
+## [ re.SRE_Pattern ] - Copy number at the end of the file paths of references, `{2}`.
+_COPY_NUMBER_PATTERN    = re.compile(r'\{\d+\}$')
+
+
+#
+## @brief [ CLASS ] - Class resolves the transitive closure of the references of a Maya file from the file headers.
+#
+#  Files are read by `mMayaCore.sceneHeaderLib` in a process pool, one level of the reference tree at a time. Each file
+#  is read once no matter how many files reference it. Missing files and reference cycles are reported.
+#
+#  @code
+#import sys
+#import mMayaCore.referenceCrawlerLib
+#
+#crawler = mMayaCore.referenceCrawlerLib.ReferenceCrawler(processes=8)
+#
+#report = crawler.crawl('/pathToFile/shot.ma')
+#
+#sys.stdout.write(report['stats'])
+# # {'fileCount': 156, 'edgeCount': 780, 'missingCount': 1, 'cycleCount': 0, 'bytesRead': 10223616, 'seconds': 0.41, 'processes': 8}
+#
+#crawler.write('/pathToFile/shot.dependencies.jsonl')
+#  @endcode
+class ReferenceCrawler(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  Files are read in the current process if processes is 1. It is the default in Maya, since worker processes
+    #  fork or spawn the whole Maya process, so worker processes should be asked for explicitly there.
+    #
+    #  @param processes [ int | None | in  ] - Number of worker processes, 1 in Maya and number of CPUs otherwise if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, processes=None):
+
+        ## [ int ] - Number of worker processes.
+        self._processes = processes or getDefaultProcessCount()
+
+        ## [ str ] - Root file.
+        self._rootFile  = None
+
+        ## [ collections.OrderedDict ] - Files, keys are file paths, values are stats @see readFile.
+        self._files     = OrderedDict()
+
+        ## [ list of dict ] - Edges, keys are: source, target, referenceNode, nameSpace, deferred.
+        self._edges     = []
+
+        ## [ list of list ] - Cycles, each list contains the file paths of a cycle.
+        self._cycles    = []
+
+        ## [ dict ] - Statistics of the last crawl.
+        self._stats     = {}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Files of the last crawl.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - File paths.
+    def files(self):
+
+        return list(self._files)
+
+    #
+    ## @brief Edges of the last crawl.
+    #
+    #  @exception N/A
+    #
+    #  @return list of dict - Keys are: source, target, referenceNode, nameSpace, deferred.
+    def edges(self):
+
+        return list(self._edges)
+
+    #
+    ## @brief Missing files of the last crawl.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - File paths.
+    def missingFiles(self):
+
+        return [x for x, stats in self._files.items() if not stats['exists']]
+
+    #
+    ## @brief Reference cycles of the last crawl.
+    #
+    #  @exception N/A
+    #
+    #  @return list of list - Each list contains the file paths of a cycle, the first file is repeated at the end.
+    def cycles(self):
+
+        return [list(x) for x in self._cycles]
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Crawl the references of given file.
+    #
+    #  @param rootFile [ str | None | in  ] - Path of the Maya file.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report @see report.
+    def crawl(self, rootFile):
+
+        startTime       = _clock()
+
+        self._rootFile  = resolveReferencePath(rootFile)
+        self._files     = OrderedDict()
+        self._edges     = []
+
+        visited         = set([self._rootFile])
+        level           = [self._rootFile]
+        pool            = None
+
+        if self._processes > 1:
+            pool = multiprocessing.Pool(self._processes)
+
+        try:
+            while level:
+
+                if pool and len(level) > 1:
+                    results = pool.imap_unordered(readFile, level, CHUNK_SIZE)
+                else:
+                    results = (readFile(x) for x in level)
+
+                nextLevel = []
+
+                for stats, references in results:
+
+                    source = stats['filePath']
+                    self._files[source] = stats
+
+                    for reference in references:
+
+                        target = resolveReferencePath(reference['filePath'], source)
+
+                        self._edges.append({'source'        : source,
+                                            'target'        : target,
+                                            'referenceNode' : reference['referenceNode'],
+                                            'nameSpace'     : reference['nameSpace'],
+                                            'deferred'      : reference['deferred']})
+
+                        if target not in visited:
+                            visited.add(target)
+                            nextLevel.append(target)
+
+                level = sorted(nextLevel)
+
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        self._files  = OrderedDict(sorted(self._files.items()))
+        self._edges.sort(key=lambda x: (x['source'], x['target']))
+        self._cycles = findCycles(self._rootFile, self._edges)
+
+        self._stats  = {'fileCount'     : len(self._files),
+                        'edgeCount'     : len(self._edges),
+                        'missingCount'  : len(self.missingFiles()),
+                        'cycleCount'    : len(self._cycles),
+                        'bytesRead'     : sum([x['bytesRead'] for x in self._files.values()]),
+                        'seconds'       : _clock() - startTime,
+                        'processes'     : self._processes}
+
+        return self.report()
+
+    #
+    ## @brief Report of the last crawl.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: rootFile, files, edges, missing, cycles, stats.
+    def report(self):
+
+        return {'rootFile'  : self._rootFile,
+                'files'     : OrderedDict(self._files),
+                'edges'     : self.edges(),
+                'missing'   : self.missingFiles(),
+                'cycles'    : self.cycles(),
+                'stats'     : dict(self._stats)}
+
+    #
+    ## @brief Write the manifest of the last crawl.
+    #
+    #  Manifest is written as JSON lines if the extension of the file is JSONL_EXTENSION, each line is an object with
+    #  a `type` key which is one of: crawl, file, edge, cycle. Otherwise the report is written as a JSON object.
+    #
+    #  @param filePath [ str | None | in  ] - Path of the manifest file.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def write(self, filePath):
+
+        directory = os.path.dirname(filePath)
+
+        try:
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            fileDescriptor, temporaryFile = tempfile.mkstemp(prefix='.referenceManifest', dir=directory or None)
+            with os.fdopen(fileDescriptor, 'w') as manifestFile:
+
+                if os.path.splitext(filePath)[1].lower() == JSONL_EXTENSION:
+                    for record in self._getRecords():
+                        manifestFile.write(json.dumps(record, sort_keys=True))
+                        manifestFile.write('\n')
+                else:
+                    json.dump(self.report(), manifestFile, indent=1)
+
+            if os.name == 'nt' and os.path.isfile(filePath):
+                os.remove(filePath)
+
+            os.rename(temporaryFile, filePath)
+
+        except (IOError, OSError) as error:
+            sys.stderr.write('Reference manifest could not be written: {}\n'.format(error))
+            return False
+
+        return True
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get the records of JSON lines manifest.
+    #
+    #  @exception N/A
+    #
+    #  @return generator - Each item is a dict.
+    def _getRecords(self):
+
+        yield {'type': 'crawl', 'rootFile': self._rootFile, 'stats': self._stats}
+
+        for stats in self._files.values():
+            record = dict(stats)
+            record['type'] = 'file'
+            yield record
+
+        for edge in self._edges:
+            record = dict(edge)
+            record['type'] = 'edge'
+            yield record
+
+        for cycle in self._cycles:
+            yield {'type': 'cycle', 'files': cycle}
+
+#
+## @brief Read the references of given file, it is run in the worker processes.
+#
+#  @param filePath [ str | None | in  ] - Path of the Maya file.
+#
+#  @exception N/A
+#
+#  @return dict - Stats, keys are: filePath, exists, size, bytesRead, seconds, referenceCount, version, plugins, error.
+#  @return list - References, dicts which contain filePath, referenceNode, nameSpace, deferred keys.
+def readFile(filePath):
+
+    startTime  = _clock()
+    references = []
+
+    stats = {'filePath'         : filePath,
+             'exists'           : os.path.isfile(filePath),
+             'size'             : 0,
+             'bytesRead'        : 0,
+             'seconds'          : 0.0,
+             'referenceCount'   : 0,
+             'version'          : None,
+             'plugins'          : [],
+             'error'            : None}
+
+    if stats['exists']:
+
+        stats['size'] = os.path.getsize(filePath)
+
+        try:
+            header = mMayaCore.sceneHeaderLib.readHeader(filePath)
+        except (IOError, OSError, ValueError, struct.error) as error:
+            header = None
+            stats['error'] = str(error)
+
+        if header:
+            stats['bytesRead']  = header.bytesRead()
+            stats['version']    = header.version()
+            stats['plugins']    = header.plugins()
+
+            for reference in getDirectReferences(header):
+                references.append({'filePath'       : reference['filePath'],
+                                   'referenceNode'  : reference['referenceNode'],
+                                   'nameSpace'      : reference['nameSpace'],
+                                   'deferred'       : reference['deferred']})
+
+        elif not stats['error']:
+            stats['error'] = 'Not a Maya file'
+
+    stats['referenceCount'] = len(references)
+    stats['seconds']        = _clock() - startTime
+
+    return stats, references
+
+#
+## @brief Get the references of the file itself from given header, nested references are excluded.
+#
+#  References (`file -r`) are used, top level reference declarations are used if the header contains no references.
+#
+#  @param header [ mMayaCore.sceneHeaderLib.SceneHeader | None | in  ] - Header.
+#
+#  @exception N/A
+#
+#  @return list of dict - References.
+def getDirectReferences(header):
+
+    references = header.references()
+    if references:
+        return references
+
+    return [x for x in header.referenceDeclarations() if x['depth'] == 1]
+
+#
+## @brief Resolve given file path of a reference.
+#
+#  Copy number is removed, environment variables and user directory are expanded and relative paths are resolved
+#  against the directory of the referencing file.
+#
+#  @param filePath   [ str | None | in  ] - File path of the reference.
+#  @param sourceFile [ str | None | in  ] - Path of the referencing file.
+#
+#  @exception N/A
+#
+#  @return str - Normalized absolute file path.
+def resolveReferencePath(filePath, sourceFile=None):
+
+    filePath = _COPY_NUMBER_PATTERN.sub('', filePath)
+    filePath = os.path.expanduser(os.path.expandvars(filePath))
+
+    if not os.path.isabs(filePath) and sourceFile:
+        filePath = os.path.join(os.path.dirname(sourceFile), filePath)
+
+    return os.path.normpath(os.path.abspath(filePath))
+
+#
+## @brief Find reference cycles reachable from given root file.
+#
+#  @param rootFile [ str          | None | in  ] - Path of the root file.
+#  @param edges    [ list of dict | None | in  ] - Edges, dicts which contain source and target keys.
+#
+#  @exception N/A
+#
+#  @return list of list - Each list contains the file paths of a cycle, the first file is repeated at the end.
+def findCycles(rootFile, edges):
+
+    targets = {}
+    for edge in edges:
+        targets.setdefault(edge['source'], []).append(edge['target'])
+
+    cycles  = []
+    found   = set()
+    visited = set([rootFile])
+    path    = [rootFile]
+    onPath  = set([rootFile])
+    stack   = [iter(targets.get(rootFile, []))]
+
+    while stack:
+
+        target = next(stack[-1], None)
+
+        if target is None:
+            stack.pop()
+            onPath.discard(path.pop())
+            continue
+
+        if target in onPath:
+            cycle = path[path.index(target):] + [target]
+            key   = frozenset(cycle)
+            if key not in found:
+                found.add(key)
+                cycles.append(cycle)
+            continue
+
+        if target in visited:
+            continue
+
+        visited.add(target)
+        path.append(target)
+        onPath.add(target)
+        stack.append(iter(targets.get(target, [])))
+
+    return cycles
+
+#
+## @brief Create a synthetic tree of Maya ASCII files for benchmarks.
+#
+#  Each file of a level references `breadth` files of the next level and one of the shared assets. Leaf files
+#  contain `nodeCount` nodes after the header, so the size of the files is realistic. One missing file and one
+#  cycle are added to exercise their detection.
+#
+#  @param directory [ str | None | in  ] - Directory the files are written in.
+#  @param depth     [ int | 4    | in  ] - Number of levels below the root file.
+#  @param breadth   [ int | 5    | in  ] - Number of references of each file.
+#  @param shared    [ int | 10   | in  ] - Number of shared asset files.
+#  @param nodeCount [ int | 2000 | in  ] - Number of nodes in each file.
+#
+#  @exception N/A
+#
+#  @return str - Path of the root file.
+def createSyntheticTree(directory, depth=4, breadth=5, shared=10, nodeCount=2000):
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    body   = ''.join(['createNode transform -n "node{0}";\n\tsetAttr ".t" -type "double3" {0} 0 0 ;\n'.format(x) for x in range(nodeCount)])
+    assets = [os.path.join(directory, 'shared_{}.ma'.format(x)) for x in range(shared)]
+
+    def writeFile(filePath, references):
+        lines = ['//Maya ASCII 2020 scene\n', '//Name: {}\n'.format(os.path.basename(filePath))]
+        for index, reference in enumerate(references):
+            lines.append('file -rdi 1 -ns "ns{0}" -rfn "ns{0}RN" -op "v=0;" -typ "mayaAscii" "{1}";\n'.format(index, reference))
+        for index, reference in enumerate(references):
+            lines.append('file -r -ns "ns{0}" -dr 1 -rfn "ns{0}RN" -op "v=0;" -typ "mayaAscii" "{1}";\n'.format(index, reference))
+        lines.append('requires maya "2020";\n')
+        lines.append('fileInfo "application" "maya";\n')
+        with open(filePath, 'w') as outFile:
+            outFile.write(''.join(lines))
+            outFile.write(body)
+
+    for asset in assets:
+        writeFile(asset, [])
+
+    rootFile = os.path.join(directory, 'root.ma')
+    level    = [rootFile]
+    counter  = 0
+
+    for levelIndex in range(depth):
+
+        nextLevel = []
+
+        for filePath in level:
+
+            children = []
+            for _ in range(breadth):
+                counter += 1
+                children.append(os.path.join(directory, 'level{}_{}.ma'.format(levelIndex + 1, counter)))
+
+            references = [os.path.basename(x) for x in children]
+            references.append(os.path.basename(assets[counter % len(assets)]) if assets else None)
+
+            writeFile(filePath, [x for x in references if x])
+            nextLevel.extend(children)
+
+        level = nextLevel
+
+    for index, filePath in enumerate(level):
+
+        references = []
+        if index == 0:
+            references.append(os.path.basename(rootFile))
+        if index == 1:
+            references.append('missing.ma')
+
+        writeFile(filePath, references)
+
+    return rootFile
+
+#
+## @brief Check whether the code runs in Maya, `maya.cmds` is importable outside of Maya but it is empty until Maya is initialized.
+#
+#  @exception N/A
+#
+#  @return bool - Result.
+def isRunningInMaya():
+
+    return hasattr(sys.modules.get('maya.cmds'), 'about')
+
+#
+## @brief Get the default number of the worker processes.
+#
+#  @exception N/A
+#
+#  @return int - 1 in Maya, number of CPUs otherwise.
+def getDefaultProcessCount():
+
+    if isRunningInMaya():
+        return 1
+
+    return multiprocessing.cpu_count()
+
+#
+## @brief Benchmark the crawler on a synthetic tree, in the current process and in a process pool.
+#
+#  @param depth     [ int | 4    | in  ] - Number of levels below the root file.
+#  @param breadth   [ int | 5    | in  ] - Number of references of each file.
+#  @param processes [ int | None | in  ] - Number of worker processes, number of CPUs if None given.
+#
+#  @exception N/A
+#
+#  @return dict - Keys are numbers of processes, values are stats of the crawls.
+def benchmark(depth=4, breadth=5, processes=None):
+
+    directory = tempfile.mkdtemp(prefix='referenceCrawler')
+    results   = OrderedDict()
+
+    try:
+        rootFile = createSyntheticTree(directory, depth=depth, breadth=breadth)
+
+        for processCount in sorted(set((1, processes or multiprocessing.cpu_count()))):
+            crawler = ReferenceCrawler(processes=processCount)
+            results[processCount] = crawler.crawl(rootFile)['stats']
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return results
+
+
+if __name__ == '__main__':
+
+    for processCount, stats in benchmark().items():
+        sys.stdout.write('{:>3} process(es): {fileCount} files, {edgeCount} edges, {missingCount} missing, '
+                         '{cycleCount} cycles, {seconds:.3f} seconds\n'.format(processCount, **stats))
@@ -26,17 +26,52 @@
 # IMPORT
 # ----------------------------------------------------------------------------------------------------
 import  os
+import  time
+
+from   collections import OrderedDict
+from   multiprocessing.pool import ThreadPool
 
 from   maya import cmds
+from   maya import mel
 from   maya import OpenMaya
+from   maya.api import OpenMaya as OpenMaya2
 
+import mMayaCore.callbackLib
 import mMayaCore.nameSpaceLib
+import mMayaCore.referenceCacheLib
 
 
 #
 # ----------------------------------------------------------------------------------------------------
 # CODE
 # ----------------------------------------------------------------------------------------------------
+## [ int ] - Number of unresolved nodes above which members of a found reference node are queried at once,
+#            instead of querying the reference node of each node.
+MEMBER_QUERY_THRESHOLD = 16
+
+## [ str ] - Name of the reference node Maya creates for the shared nodes, it doesn't reference a file.
+SHARED_REFERENCE_NODE  = 'sharedReferenceNode'
+
+## [ str ] - Options of the created references.
+REFERENCE_OPTIONS      = 'v=0;cmds=17'
+
+## [ int ] - Maximum number of threads files are validated with, checks are IO bound on network file systems.
+VALIDATION_THREADS     = 16
+
+## [ callable ] - High resolution clock.
+_clock                 = getattr(time, 'perf_counter', time.time)
+
+## [ tuple of str ] - Reference messages after which the local copies of the reference cache are unpinned.
+CACHE_UNPIN_MESSAGES   = ('kAfterUnloadReference',
+                          'kAfterRemoveReference')
+
+## [ mMayaCore.referenceLib.ReferenceMembershipCache ] - Reference membership cache of the session.
+_referenceMembershipCache = None
+
+## [ mMayaCore.referenceLib.ReferenceCacheHook ] - Reference cache hook of the session.
+_referenceCacheHook       = None
+
+
 #
 ## @brief [ CLASS ] - Class to operate on referenced nodes in Maya.
 #
@@ -61,17 +96,44 @@ import mMayaCore.nameSpaceLib
 #sys.stdout.write(reference.duplicate())
 # # /pathToFile/someMayaFile.ma{2}
 #
+#sys.stdout.write(reference.duplicate(count=2))
+# # ['/pathToFile/someMayaFile.ma{3}', '/pathToFile/someMayaFile.ma{4}']
+#
+#sys.stdout.write(reference.replace('/pathToFile/someMayaFile_v002.ma'))
+# # /pathToFile/someMayaFile_v002.ma
+#
 #sys.stdout.write(reference.remove())
 # # True
 #
 #sys.stdout.write(mMayaCore.referenceLib.Reference.create(mayaFile='/pathToFile/someMayaFile.ma'))
 # # /pathToFile/someMayaFile.ma
 #
+#report = mMayaCore.referenceLib.Reference.createMany(['/pathToFile/chair.ma', '/pathToFile/table.mb'], nameSpaces=['chair', None])
+#
+#sys.stdout.write(report['results'][0])
+# # {'filePath': '/pathToFile/chair.ma', 'nameSpace': 'chair', 'resolvedFilePath': '/pathToFile/chair.ma', 'referenceNode': 'chairRN',
+# #  'valid': True, 'validateSeconds': 0.0001, 'createSeconds': 0.002, 'loadSeconds': 0.35, 'error': None}
+#
 #mMayaCore.referenceLib.Reference.duplicateSelected()
 #
 #mMayaCore.referenceLib.Reference.removeSelected()
 #
-#mMayaCore.referenceLib.Reference.reloadSelected()
+#sys.stdout.write(mMayaCore.referenceLib.Reference.reloadSelected())
+# # {'referenceNodes': ['someMayaFileRN'], 'nodeCount': 800, 'notReferenced': [], 'succeeded': ['someMayaFileRN'], 'failed': [], 'skipped': []}
+#
+#report = mMayaCore.referenceLib.Reference.compactEditsMany(['someMayaFile:pCube1'], dryRun=True)
+#
+#sys.stdout.write(report['results']['someMayaFileRN'])
+# # {'referenceNode': 'someMayaFileRN', 'dryRun': True, 'editsBefore': 2400, 'editsAfter': 310, 'failedEdits': 1200,
+# #  'redundantEdits': 890, 'loadSecondsBefore': None, 'loadSecondsAfter': None, 'error': None}
+#
+#report = mMayaCore.referenceLib.Reference.replaceMany({'chairRN': '/pathToFile/chair_v003.ma', 'table:top': '/pathToFile/table_v002.mb'})
+#
+#sys.stdout.write(report['replaced'])
+# # ['chairRN', 'tableRN']
+#
+#sys.stdout.write(mMayaCore.referenceLib.Reference.getReferenceNodes(['someMayaFile:pCube1', 'persp']))
+# # (OrderedDict([('someMayaFileRN', ['someMayaFile:pCube1'])]), ['persp'])
 #
 #sys.stdout.write(mMayaCore.referenceLib.Reference.isNodeReferenced(node='someMayaFile:pCube1'))
 # # True
@@ -79,6 +141,12 @@ import mMayaCore.nameSpaceLib
 #sys.stdout.write(mMayaCore.referenceLib.Reference.isNodeReferenced(node='persp'))
 # # False
 #
+#index     = mMayaCore.referenceLib.ReferenceIndex()
+#reference = mMayaCore.referenceLib.Reference(node='someMayaFile:pCube1', index=index)
+#
+#sys.stdout.write(reference.reload())
+# # True
+#
 #  @endcode
 #
 class Reference(mMayaCore.nameSpaceLib.NameSpace):
@@ -89,17 +157,21 @@ class Reference(mMayaCore.nameSpaceLib.NameSpace):
     #
     ## @brief Constructor.
     #
-    #  @param node [ str | None | in  ] - Name of the node.
+    #  @param node  [ str                                   | None | in  ] - Name of the node.
+    #  @param index [ mMayaCore.referenceLib.ReferenceIndex | None | in  ] - Reference index used instead of querying Maya.
     #
     #  @exception N/A
     #
     #  @return None.
-    def __init__(self, node=None):
+    def __init__(self, node=None, index=None):
 
         mMayaCore.nameSpaceLib.NameSpace.__dict__['__init__'](self, nameSpace=node)
 
         ## [ str ] - Name of the referenced node.
-        self._node = None
+        self._node  = None
+
+        ## [ mMayaCore.referenceLib.ReferenceIndex ] - Reference index.
+        self._index = index
 
         if node:
             self.setNode(node=node)
@@ -119,6 +191,17 @@ class Reference(mMayaCore.nameSpaceLib.NameSpace):
 
         return self._node
 
+    #
+    ## @brief Reference index.
+    #
+    #  @exception N/A
+    #
+    #  @return mMayaCore.referenceLib.ReferenceIndex - Reference index.
+    #  @return None                                  - If Maya is queried instead of an index.
+    def index(self):
+
+        return self._index
+
     #
     # ------------------------------------------------------------------------------------------------
     # PUBLIC METHODS
@@ -139,6 +222,20 @@ class Reference(mMayaCore.nameSpaceLib.NameSpace):
 
         return cmds.objExists(self._node)
 
+    #
+    ## @brief Set reference index.
+    #
+    #  Index is a snapshot of the scene, it should be rebuilt by the caller after references are changed.
+    #
+    #  @param index [ mMayaCore.referenceLib.ReferenceIndex | None | in  ] - Reference index, None to query Maya.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def setIndex(self, index):
+
+        self._index = index
+
     #
     ## @brief Set node.
     #
@@ -151,7 +248,7 @@ class Reference(mMayaCore.nameSpaceLib.NameSpace):
     #  @return bool - Result.
     def setNode(self, node):
 
-        if not Reference.isNodeReferenced(node=node):
+        if not Reference.isNodeReferenced(node=node, index=self._index):
             return False
 
         self._node = node
@@ -170,29 +267,25 @@ class Reference(mMayaCore.nameSpaceLib.NameSpace):
         if not self.exists():
             return False
 
-        referencedNode = cmds.referenceQuery(self._node, referenceNode=1)
-        cmds.file(lr=referencedNode)
-
-        return True
+        return Reference.reloadReferenceNode(self._getReferenceNode())
 
     #
     ## @brief Duplicate given referenced node.
     #
+    #  @param count [ int | None | in  ] - Number of the duplicates, they are created in a single batch with namespaces
+    #                                     allocated at once @see duplicateReferenceNode.
+    #
     #  @exception N/A
     #
-    #  @return str  - Resolved name of the referenced file.
-    #  @return None - If not is not set.
-    def duplicate(self):
+    #  @return str         - Resolved name of the referenced file, if count is None.
+    #  @return list of str - Resolved names of the referenced files, if count is given.
+    #  @return None        - If not is not set.
+    def duplicate(self, count=None):
 
         if not self.exists():
             return None
 
-        filePath  = cmds.referenceQuery(self._node, f=1, withoutCopyNumber=1)
-        nameSpace = os.path.basename(filePath).split('.')[0]
-
-        referenced = Reference.create(filePath, nameSpace)
-
-        return referenced
+        return Reference.duplicateReferenceNode(self._getReferenceNode(), index=self._index, count=count)
 
     #
     ## @brief Remove the given referenced node.
@@ -205,13 +298,62 @@ class Reference(mMayaCore.nameSpaceLib.NameSpace):
         if not self.exists():
             return False
 
-        referencedFile = cmds.referenceQuery(self._node, f=1)
-        cmds.file(referencedFile, rr=1)
+        Reference.removeReferenceNode(self._getReferenceNode())
 
         self._node = None
 
         return True
 
+    #
+    ## @brief Replace the file of the reference of the node in place, namespace and reference edits are kept.
+    #
+    #  @param newFile [ str | None | in  ] - Name of the new file, Maya ASCII or Maya Binary.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Resolved name of the new referenced file.
+    #  @return None - If node is not set or new file doesn't exist.
+    def replace(self, newFile):
+
+        if not self.exists():
+            return None
+
+        return Reference.replaceReferenceNode(self._getReferenceNode(), newFile)
+
+    #
+    ## @brief Remove failed and redundant reference edits of the reference of the node.
+    #
+    #  @param dryRun  [ bool | False | in  ] - Only analyse the edits, nothing is removed.
+    #  @param measure [ bool | True  | in  ] - Measure load time of the reference before and after the compaction.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Result @see compactReferenceNodeEdits.
+    #  @return None - If node is not set.
+    def compactEdits(self, dryRun=False, measure=True):
+
+        if not self.exists():
+            return None
+
+        return Reference.compactReferenceNodeEdits(self._getReferenceNode(), dryRun=dryRun, measure=measure)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get reference node of the node, from the index if it is set.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Reference node.
+    def _getReferenceNode(self):
+
+        if self._index is not None:
+            return self._index.referenceNode(self._node)
+
+        return getReferenceMembershipCache().referenceNode(self._node)
+
     #
     # ------------------------------------------------------------------------------------------------
     # STATIC METHODS
@@ -219,124 +361,1599 @@ class Reference(mMayaCore.nameSpaceLib.NameSpace):
     #
     ## @brief Check whether the given node is a referenced node.
     #
-    #  @param node [ str | None | in  ] - Name of the node.
+    #  Result is cached in the reference membership cache of the session until the scene is changed.
+    #
+    #  @param node  [ str                                   | None | in  ] - Name of the node.
+    #  @param index [ mMayaCore.referenceLib.ReferenceIndex | None | in  ] - Reference index used instead of querying Maya.
     #
     #  @exception N/A
     #
     #  @return bool - Result.
     @staticmethod
-    def isNodeReferenced(node):
+    def isNodeReferenced(node, index=None):
 
-        if not cmds.objExists(node):
-            return False
+        if index is not None:
+            return index.referenceNode(node) is not None
 
-        if not cmds.referenceQuery(node, inr=1):
-            return False
+        return getReferenceMembershipCache().isNodeReferenced(node)
+
+    #
+    ## @brief Resolve given nodes to their reference nodes with as few Maya queries as possible.
+    #
+    #  Given nodes are resolved to their long names and referenced ones are filtered with two `ls` calls. Long names
+    #  are mapped back to the given names, so nodes are reported by the names they are given with. Reference node of a
+    #  node is queried and, if many nodes are still unresolved, all members of the found reference node are resolved at
+    #  once, so the number of `referenceQuery` calls scales with the number of reference nodes rather than the number of
+    #  nodes. Maya is not queried at all if an index is given.
+    #
+    #  @param nodes [ list of str                           | None | in  ] - Names of the nodes.
+    #  @param index [ mMayaCore.referenceLib.ReferenceIndex | None | in  ] - Reference index used instead of querying Maya.
+    #
+    #  @exception N/A
+    #
+    #  @return collections.OrderedDict - Keys are reference nodes in the order they are found, values are lists of given nodes.
+    #  @return list of str             - Given nodes which don't exist or are not referenced.
+    @staticmethod
+    def getReferenceNodes(nodes, index=None):
+
+        if index is not None:
+
+            referenceNodes = OrderedDict()
+            notReferenced  = []
+
+            for node in nodes:
+
+                referenceNode = index.referenceNode(node)
+                if referenceNode is None:
+                    notReferenced.append(node)
+                else:
+                    referenceNodes.setdefault(referenceNode, []).append(node)
+
+            return referenceNodes, notReferenced
+
+        names   = list(OrderedDict.fromkeys(nodes))
+        nameSet = set(names)
+
+        # Keys are long names, values are the given names they are matched by
+        givenNames = OrderedDict()
+
+        for longName in cmds.ls(names, long=1) or []:
+            givenNames[longName] = [x for x in getPartialPathNames(longName) if x in nameSet]
+
+        matched = set()
+        for matchedNames in givenNames.values():
+            matched.update(matchedNames)
+
+        # Names which are not partial paths, such as the ones with wildcards, are resolved one by one
+        for name in names:
+            if name not in matched:
+                for longName in cmds.ls(name, long=1) or []:
+                    givenNames.setdefault(longName, []).append(name)
+
+        referenced = cmds.ls(list(givenNames), referencedNodes=1, long=1) or []
+
+        referencedNames = set()
+        for longName in referenced:
+            referencedNames.update(givenNames[longName])
+
+        notReferenced = [x for x in names if x not in referencedNames]
+
+        cache          = getReferenceMembershipCache()
+        referenceNodes = OrderedDict()
+        unresolved     = OrderedDict((x, None) for x in referenced)
+
+        while unresolved:
+
+            longName, _ = unresolved.popitem(last=False)
+
+            referenceNode = cache.referenceNode(longName)
+            resolved      = [longName]
+
+            if len(unresolved) >= MEMBER_QUERY_THRESHOLD:
+
+                members = cmds.ls(cmds.referenceQuery(referenceNode, nodes=1, dagPath=1) or [], long=1) or []
+                cache.setReferenceNode(members, referenceNode)
+
+                for member in members:
+                    if member in unresolved:
+                        del unresolved[member]
+                        resolved.append(member)
+
+            referencedNodes = referenceNodes.setdefault(referenceNode, OrderedDict())
+            for member in resolved:
+                referencedNodes.update((x, None) for x in givenNames[member])
+
+        return OrderedDict((x, list(y)) for x, y in referenceNodes.items()), notReferenced
+
+    #
+    ## @brief Remove reference nodes which are nested under the other given reference nodes.
+    #
+    #  Reloading or removing a reference affects its nested references as well.
+    #
+    #  @param referenceNodes [ list of str                           | None | in  ] - Reference nodes.
+    #  @param index          [ mMayaCore.referenceLib.ReferenceIndex | None | in  ] - Reference index used instead of querying Maya.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Top most reference nodes among given ones.
+    @staticmethod
+    def getTopReferenceNodes(referenceNodes, index=None):
+
+        referenceNodeSet = set(referenceNodes)
+        topNodes         = []
+
+        if index is not None:
+            getParent = index.parent
+        else:
+            getParent = lambda x: cmds.referenceQuery(x, referenceNode=1, parent=1)
+
+        for referenceNode in referenceNodes:
+
+            parent = getParent(referenceNode)
+            while parent and parent not in referenceNodeSet:
+                parent = getParent(parent)
+
+            if not parent:
+                topNodes.append(referenceNode)
+
+        return topNodes
+
+    #
+    ## @brief Reload given reference node.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    @staticmethod
+    def reloadReferenceNode(referenceNode):
+
+        cmds.file(lr=referenceNode)
 
         return True
 
     #
-    ## @brief Create reference from given file.
+    ## @brief Duplicate given reference node by referencing its file again.
     #
-    #  If nameSpace argument left out, file name will be the name space for the referenced nodes.
+    #  If count is given, namespaces of the duplicates are allocated up front by a namespace allocator, instead of
+    #  letting Maya search a free namespace for each of them, and the duplicates are created by createMany.
     #
-    #  @param mayaFile  [ str | None | in  ] - Name of the file, Maya ASCII or Maya Binary.
-    #  @param nameSpace [ str | None | in  ] - Namespace of the referenced nodes.
+    #  @param referenceNode [ str                                          | None | in  ] - Reference node.
+    #  @param index         [ mMayaCore.referenceLib.ReferenceIndex        | None | in  ] - Reference index used instead of querying Maya.
+    #  @param count         [ int                                          | None | in  ] - Number of the duplicates.
+    #  @param allocator     [ mMayaCore.nameSpaceLib.NameSpaceAllocator    | None | in  ] - Namespace allocator, a new one is created if None given.
     #
     #  @exception N/A
     #
-    #  @return str  - Resolved name of the referenced file.
-    #  @return None - If maya file doesn't exist.
+    #  @return str         - Resolved name of the referenced file, if count is None.
+    #  @return list of str - Resolved names of the referenced files, None items for the failed ones, if count is given.
+    #  @return None        - If file doesn't exist.
     @staticmethod
-    def create(mayaFile, nameSpace=None):
+    def duplicateReferenceNode(referenceNode, index=None, count=None, allocator=None):
 
-        if not os.path.isfile(mayaFile):
+        if index is not None:
+            filePath = index.filePath(referenceNode)
+        else:
+            filePath = cmds.referenceQuery(referenceNode, f=1, withoutCopyNumber=1)
+
+        filePath  = mMayaCore.referenceCacheLib.getSourceFile(filePath)
+        nameSpace = os.path.basename(filePath).split('.')[0]
+
+        if count is None:
+            return Reference.create(filePath, nameSpace, allocator=allocator)
+
+        if not os.path.isfile(filePath):
             return None
 
-        fileType = 'mayaAscii'
-        if os.path.splitext(mayaFile)[1][1:] == 'mb':
-            fileType = 'mayaBinary'
+        if not allocator:
+            allocator = mMayaCore.nameSpaceLib.NameSpaceAllocator()
 
-        if not nameSpace:
-            nameSpace = os.path.basename(mayaFile).split('.')[0]
+        report = Reference.createMany([filePath] * count, nameSpaces=allocator.allocateMany(nameSpace, count))
 
-        return cmds.file(mayaFile, r=1, type=fileType, namespace=nameSpace, options='v=0;cmds=17')
+        return [x['resolvedFilePath'] for x in report['results']]
 
     #
-    ## @brief Duplicate selected referenced nodes.
+    ## @brief Remove the file of given reference node.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
     #
     #  @exception N/A
     #
-    #  @return None
+    #  @return bool - Result.
     @staticmethod
-    def duplicateSelected():
+    def removeReferenceNode(referenceNode):
 
-        selection = cmds.ls(sl=1)
-        if not selection:
-            OpenMaya.MGlobal.displayWarning('Please select referenced node(s).')
-            return
+        referencedFile = cmds.referenceQuery(referenceNode, f=1)
+        cmds.file(referencedFile, rr=1)
+
+        return True
+
+    #
+    ## @brief Replace the file of given reference node in place, namespace and reference edits are kept.
+    #
+    #  File is read from its local copy if the reference cache is enabled, reference keeps the given path
+    #  @see mMayaCore.referenceLib.ReferenceCacheHook.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
+    #  @param newFile       [ str | None | in  ] - Name of the new file, Maya ASCII or Maya Binary.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Resolved name of the new referenced file.
+    #  @return None - If new file doesn't exist.
+    @staticmethod
+    def replaceReferenceNode(referenceNode, newFile):
+
+        if not os.path.isfile(newFile):
+            return None
+
+        getReferenceCacheHook()
+
+        return cmds.file(newFile, loadReference=referenceNode, type=Reference.getFileType(newFile), options=REFERENCE_OPTIONS)
+
+    #
+    ## @brief Replace the files of many references in place, namespace and reference edits are kept.
+    #
+    #  Keys of given dict are resolved to their reference nodes, so each reference is replaced, therefore reloaded,
+    #  once no matter how many of its nodes are given. References whose file is the new file already are skipped.
+    #  Parent references are replaced before their nested references. All replacements are done in a single undo
+    #  chunk while viewport refresh is suspended.
+    #
+    #  @param replacements [ dict                                  | None | in  ] - Keys are reference nodes or referenced nodes,
+    #                                                                               values are names of the new files.
+    #  @param index        [ mMayaCore.referenceLib.ReferenceIndex | None | in  ] - Reference index used instead of querying Maya.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: results, replaced, skipped, failed, notReferenced, seconds. Results are dicts per reference
+    #                 node, keys are: referenceNode, oldFilePath, newFilePath, resolvedFilePath, seconds, error.
+    @staticmethod
+    def replaceMany(replacements, index=None):
+
+        startTime       = _clock()
+        keys            = list(replacements)
 
-        _reference = Reference()
+        if index is not None:
+            referenceNodeSet = set([x for x in keys if x in index])
+        else:
+            referenceNodeSet = set(cmds.ls(keys, type='reference') or [])
 
-        for i in selection:
-            if not _reference.setNode(node=i):
-                OpenMaya.MGlobal.displayWarning('Node is not referenced: {}'.format(i))
+        newFiles        = OrderedDict()
+        conflicts       = set()
+        nodes           = [x for x in keys if x not in referenceNodeSet]
+
+        referenceNodes, notReferenced = Reference.getReferenceNodes(nodes, index=index)
+
+        targets = [(x, replacements[x]) for x in keys if x in referenceNodeSet]
+        for referenceNode, referencedNodes in referenceNodes.items():
+            targets.extend([(referenceNode, replacements[x]) for x in referencedNodes])
+
+        for referenceNode, newFile in targets:
+            if referenceNode in newFiles and newFiles[referenceNode] != newFile:
+                conflicts.add(referenceNode)
+            newFiles[referenceNode] = newFile
+
+        results = []
+        for referenceNode, newFile in newFiles.items():
+
+            if index is not None:
+                oldFile = index.filePath(referenceNode)
             else:
-                _reference.duplicate()
+                oldFile = cmds.referenceQuery(referenceNode, filename=1, withoutCopyNumber=1)
+
+            results.append({'referenceNode'     : referenceNode,
+                            'oldFilePath'       : mMayaCore.referenceCacheLib.getSourceFile(oldFile),
+                            'newFilePath'       : newFile,
+                            'resolvedFilePath'  : None,
+                            'seconds'           : 0.0,
+                            'error'             : 'Reference node is given with different files' if referenceNode in conflicts else None})
+
+        depths  = dict((x['referenceNode'], Reference._getReferenceDepth(x['referenceNode'], index=index)) for x in results)
+        skipped = []
+
+        cmds.undoInfo(openChunk=True, chunkName='replaceReferences')
+        cmds.refresh(suspend=True)
+
+        try:
+            for result in sorted(results, key=lambda x: depths[x['referenceNode']]):
+
+                if result['error']:
+                    continue
+
+                if os.path.normpath(result['oldFilePath']) == os.path.normpath(result['newFilePath']):
+                    skipped.append(result['referenceNode'])
+                    continue
+
+                replaceStart = _clock()
+
+                try:
+                    result['resolvedFilePath'] = Reference.replaceReferenceNode(result['referenceNode'], result['newFilePath'])
+                    if not result['resolvedFilePath']:
+                        result['error'] = 'File does not exist'
+                except RuntimeError as error:
+                    result['error'] = str(error)
+
+                result['seconds'] = _clock() - replaceStart
+
+        finally:
+            cmds.refresh(suspend=False)
+            cmds.undoInfo(closeChunk=True)
+
+        cmds.refresh()
+
+        if notReferenced:
+            OpenMaya.MGlobal.displayWarning('Node(s) are not referenced: {}'.format(', '.join(notReferenced)))
+
+        return {'results'       : results,
+                'replaced'      : [x['referenceNode'] for x in results if x['resolvedFilePath']],
+                'skipped'       : skipped,
+                'failed'        : [x['referenceNode'] for x in results if x['error']],
+                'notReferenced' : notReferenced,
+                'seconds'       : _clock() - startTime}
 
     #
-    ## @brief Remove selected referenced nodes.
+    ## @brief Analyse the reference edits stored on given reference node.
     #
-    #  Method actually removes the referenced file which will be retrieved from the referenced nodes.
+    #  Failed edits are the ones which couldn't be applied when the reference was loaded last time. A setAttr edit is
+    #  redundant if another setAttr edit of the same plug is made after it, since only the last one takes effect.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
     #
     #  @exception N/A
     #
-    #  @return None
+    #  @return dict - Keys are: referenceNode, edits, failedEdits, setAttrEdits, redundantEdits. Edits is the number of
+    #                 all edits, failedEdits is list of failed edit strings, setAttrEdits is an OrderedDict whose keys are
+    #                 plugs and values are lists of successful setAttr edit strings in the order they are applied,
+    #                 redundantEdits is the number of setAttr edits overwritten by later ones.
     @staticmethod
-    def removeSelected():
+    def analyseEdits(referenceNode):
 
-        selection = cmds.ls(sl=1)
-        if not selection:
-            OpenMaya.MGlobal.displayWarning('Please select referenced node(s).')
-            return
+        edits       = cmds.referenceQuery(referenceNode,
+                                          editStrings=1,
+                                          onReferenceNode=referenceNode,
+                                          failedEdits=1,
+                                          successfulEdits=1) or []
 
-        confirm = cmds.confirmDialog(title='Remove Referenced Nodes',
-                                     message='Do you want to remove selected referenced node(s)?',
-                                     button=['Yes','No'],
-                                     defaultButton='No',
-                                     cancelButton='No',#
-                                     dismissString='No' )
+        failedEdits = cmds.referenceQuery(referenceNode,
+                                          editStrings=1,
+                                          onReferenceNode=referenceNode,
+                                          failedEdits=1,
+                                          successfulEdits=0) or []
 
-        if confirm == 'Yes':
+        setAttrEdits = OrderedDict()
+        for edit in cmds.referenceQuery(referenceNode,
+                                        editStrings=1,
+                                        onReferenceNode=referenceNode,
+                                        editCommand='setAttr',
+                                        failedEdits=0,
+                                        successfulEdits=1) or []:
 
-            _reference = Reference()
+            plug = Reference._getEditPlug(edit)
+            if plug:
+                setAttrEdits.setdefault(plug, []).append(edit)
 
-            for i in selection:
-                if not _reference.setNode(node=i):
-                    OpenMaya.MGlobal.displayWarning('Referenced node could not be set: {}'.format(i))
-                else:
-                    _reference.remove()
+        return {'referenceNode'     : referenceNode,
+                'edits'             : len(edits),
+                'failedEdits'       : failedEdits,
+                'setAttrEdits'      : setAttrEdits,
+                'redundantEdits'    : sum([len(x) - 1 for x in setAttrEdits.values()])}
 
     #
-    ## @brief Reload selected referenced nodes.
+    ## @brief Remove failed reference edits and collapse redundant setAttr edits of given reference node.
     #
-    #  Method actually reloads the referenced file which will be retrieved from the referenced nodes.
+    #  Reference is unloaded since Maya removes reference edits of unloaded references only. Failed edits are removed
+    #  at once, setAttr edits of each plug with more than one setAttr edit are removed and the last one is applied
+    #  again after the reference is loaded, so each plug keeps its value with a single edit. Reference is left
+    #  unloaded if it was unloaded. Removal of reference edits can't be undone.
+    #
+    #  @param referenceNode [ str  | None  | in  ] - Reference node.
+    #  @param dryRun        [ bool | False | in  ] - Only analyse the edits, nothing is removed.
+    #  @param measure       [ bool | True  | in  ] - Measure load time of the reference before and after the compaction,
+    #                                                 it requires the reference to be loaded one more time for each.
     #
     #  @exception N/A
     #
-    #  @return None
+    #  @return dict - Keys are: referenceNode, dryRun, editsBefore, editsAfter, failedEdits, redundantEdits,
+    #                 loadSecondsBefore, loadSecondsAfter, error. Edits after is the expected number in dry run.
     @staticmethod
-    def reloadSelected():
+    def compactReferenceNodeEdits(referenceNode, dryRun=False, measure=True):
 
-        selection = cmds.ls(sl=1)
-        if not selection:
-            OpenMaya.MGlobal.displayWarning('Please select referenced node(s).')
-            return False
+        analysis = Reference.analyseEdits(referenceNode)
+        result   = {'referenceNode'     : referenceNode,
+                    'dryRun'            : dryRun,
+                    'editsBefore'       : analysis['edits'],
+                    'editsAfter'        : analysis['edits'] - len(analysis['failedEdits']) - analysis['redundantEdits'],
+                    'failedEdits'       : len(analysis['failedEdits']),
+                    'redundantEdits'    : analysis['redundantEdits'],
+                    'loadSecondsBefore' : None,
+                    'loadSecondsAfter'  : None,
+                    'error'             : None}
 
-        _reference = Reference()
+        if dryRun or result['editsAfter'] == result['editsBefore']:
+            return result
 
-        for i in selection:
-            if not _reference.setNode(node=i):
-                OpenMaya.MGlobal.displayWarning('Referenced node could not be set: {}'.format(i))
-            else:
-                _reference.reload()
+        plugs    = [x for x, edits in analysis['setAttrEdits'].items() if len(edits) > 1]
+        isLoaded = cmds.referenceQuery(referenceNode, isLoaded=1)
+
+        if measure and isLoaded:
+            result['loadSecondsBefore'] = Reference._measureLoad(referenceNode)
+
+        cmds.file(unloadReference=referenceNode)
+
+        try:
+            if analysis['failedEdits']:
+                cmds.referenceEdit(referenceNode,
+                                   onReferenceNode=referenceNode,
+                                   failedEdits=1,
+                                   successfulEdits=0,
+                                   removeEdits=1)
+
+            for plug in plugs:
+                cmds.referenceEdit(plug,
+                                   onReferenceNode=referenceNode,
+                                   editCommand='setAttr',
+                                   failedEdits=1,
+                                   successfulEdits=1,
+                                   removeEdits=1)
+
+        finally:
+            cmds.file(loadReference=referenceNode)
+
+        for plug in plugs:
+            try:
+                mel.eval(analysis['setAttrEdits'][plug][-1])
+            except RuntimeError as error:
+                result['error'] = 'Value of {} could not be applied again: {}'.format(plug, error)
+
+        if measure:
+            result['loadSecondsAfter'] = Reference._measureLoad(referenceNode)
+
+        if not isLoaded:
+            cmds.file(unloadReference=referenceNode)
+
+        result['editsAfter'] = Reference.analyseEdits(referenceNode)['edits']
+
+        return result
+
+    #
+    ## @brief Compact reference edits of the references of given nodes @see compactReferenceNodeEdits.
+    #
+    #  Each reference is compacted once, nested references of compacted references are skipped since they are
+    #  reloaded with their parents. Viewport refresh is suspended during the compaction.
+    #
+    #  @param nodes   [ list of str                           | None  | in  ] - Names of the nodes.
+    #  @param dryRun  [ bool                                  | False | in  ] - Only analyse the edits, nothing is removed.
+    #  @param measure [ bool                                  | True  | in  ] - Measure load time of the references.
+    #  @param index   [ mMayaCore.referenceLib.ReferenceIndex | None  | in  ] - Reference index used instead of querying Maya.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report @see runPerReferenceNode, results are results of compactReferenceNodeEdits. Additional keys are
+    #                 editsBefore, editsAfter, removedEdits and seconds.
+    @staticmethod
+    def compactEditsMany(nodes, dryRun=False, measure=True, index=None):
+
+        startTime = _clock()
+
+        cmds.refresh(suspend=True)
+
+        try:
+            report = Reference.runPerReferenceNode(nodes,
+                                                   lambda x: Reference.compactReferenceNodeEdits(x, dryRun=dryRun, measure=measure),
+                                                   topNodesOnly=True,
+                                                   index=index)
+        finally:
+            cmds.refresh(suspend=False)
+
+        cmds.refresh()
+
+        report['editsBefore']  = sum([x['editsBefore'] for x in report['results'].values()])
+        report['editsAfter']   = sum([x['editsAfter'] for x in report['results'].values()])
+        report['removedEdits'] = report['editsBefore'] - report['editsAfter']
+        report['seconds']      = _clock() - startTime
+
+        return report
+
+    #
+    ## @brief Create reference from given file.
+    #
+    #  If nameSpace argument left out, file name will be the name space for the referenced nodes.
+    #  File is read from its local copy if the reference cache is enabled, reference keeps the given path
+    #  @see mMayaCore.referenceLib.ReferenceCacheHook.
+    #
+    #  @param mayaFile  [ str                                       | None | in  ] - Name of the file, Maya ASCII or Maya Binary.
+    #  @param nameSpace [ str                                       | None | in  ] - Namespace of the referenced nodes.
+    #  @param allocator [ mMayaCore.nameSpaceLib.NameSpaceAllocator | None | in  ] - Namespace allocator the namespace is
+    #                                                                                allocated by, Maya makes it unique otherwise.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Resolved name of the referenced file.
+    #  @return None - If maya file doesn't exist.
+    @staticmethod
+    def create(mayaFile, nameSpace=None, allocator=None):
+
+        if not os.path.isfile(mayaFile):
+            return None
+
+        if not nameSpace:
+            nameSpace = os.path.basename(mayaFile).split('.')[0]
+
+        if allocator:
+            nameSpace = allocator.allocate(nameSpace)
+
+        getReferenceCacheHook()
+
+        return cmds.file(mayaFile, r=1, type=Reference.getFileType(mayaFile), namespace=nameSpace, options=REFERENCE_OPTIONS)
+
+    #
+    ## @brief Create references from given files and load them in a single batch.
+    #
+    #  Files are validated in parallel first. References of the valid files are created unloaded, then they are
+    #  loaded one after another while viewport refresh is suspended, so the scene is evaluated once instead of once
+    #  per reference. Creation and loading are done in a single undo chunk.
+    #
+    #  If the reference cache is enabled, valid files are prefetched to the cache in the background and read from
+    #  their local copies, references keep the given paths @see mMayaCore.referenceLib.ReferenceCacheHook.
+    #
+    #  Namespaces are given by the nameSpaces argument, spelled as the nameSpace argument of the create method.
+    #
+    #  @param mayaFiles  [ list of str                               | None | in  ] - Names of the files, Maya ASCII or Maya Binary.
+    #  @param nameSpaces [ list of str                               | None | in  ] - Namespaces of the referenced nodes, in the same order
+    #                                                                                 with the files, file names are used for None items
+    #                                                                                 or if None given.
+    #  @param load       [ bool                                      | True | in  ] - Load the references, they are left unloaded otherwise.
+    #  @param allocator  [ mMayaCore.nameSpaceLib.NameSpaceAllocator | None | in  ] - Namespace allocator the namespaces are
+    #                                                                                 allocated by, Maya makes them unique otherwise.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: results, created, invalid, failed, seconds. Results are dicts per file in the order of
+    #                 given files, keys are: filePath, nameSpace, resolvedFilePath, referenceNode, valid,
+    #                 validateSeconds, createSeconds, loadSeconds, error.
+    @staticmethod
+    def createMany(mayaFiles, nameSpaces=None, load=True, allocator=None):
+
+        startTime = _clock()
+        results   = []
+
+        for index, mayaFile in enumerate(mayaFiles):
+
+            nameSpace = nameSpaces[index] if nameSpaces and index < len(nameSpaces) else None
+            nameSpace = nameSpace or os.path.basename(mayaFile).split('.')[0]
+
+            if allocator:
+                nameSpace = allocator.allocate(nameSpace)
+
+            results.append({'filePath'          : mayaFile,
+                            'nameSpace'         : nameSpace,
+                            'resolvedFilePath'  : None,
+                            'referenceNode'     : None,
+                            'valid'             : False,
+                            'validateSeconds'   : 0.0,
+                            'createSeconds'     : 0.0,
+                            'loadSeconds'       : 0.0,
+                            'error'             : None})
+
+        if mayaFiles:
+            pool = ThreadPool(min(VALIDATION_THREADS, len(mayaFiles)))
+            try:
+                validations = pool.map(Reference._validateFile, mayaFiles)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            validations = []
+
+        for result, (valid, seconds) in zip(results, validations):
+            result['valid']             = valid
+            result['validateSeconds']   = seconds
+            if not valid:
+                result['error'] = 'File does not exist or it is not a Maya file'
+
+        cache = mMayaCore.referenceCacheLib.getReferenceCache()
+        if cache:
+            getReferenceCacheHook()
+            cache.prefetch([x['filePath'] for x in results if x['valid']])
+
+        cmds.undoInfo(openChunk=True, chunkName='createReferences')
+
+        try:
+            for result in results:
+
+                if not result['valid']:
+                    continue
+
+                createStart = _clock()
+
+                try:
+                    result['resolvedFilePath']  = cmds.file(result['filePath'],
+                                                            r=1,
+                                                            type=Reference.getFileType(result['filePath']),
+                                                            namespace=result['nameSpace'],
+                                                            options=REFERENCE_OPTIONS,
+                                                            deferReference=1)
+                    result['referenceNode']     = cmds.referenceQuery(result['resolvedFilePath'], referenceNode=1)
+                except RuntimeError as error:
+                    result['error'] = str(error)
+
+                result['createSeconds'] = _clock() - createStart
+
+            if load:
+                cmds.refresh(suspend=True)
+
+                try:
+                    for result in results:
+
+                        if not result['referenceNode']:
+                            continue
+
+                        loadStart = _clock()
+
+                        try:
+                            cmds.file(loadReference=result['referenceNode'])
+                        except RuntimeError as error:
+                            result['error'] = str(error)
+
+                        result['loadSeconds'] = _clock() - loadStart
+
+                finally:
+                    cmds.refresh(suspend=False)
+
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+        if load:
+            cmds.refresh()
+
+        return {'results'   : results,
+                'created'   : [x['referenceNode'] for x in results if x['referenceNode']],
+                'invalid'   : [x['filePath'] for x in results if not x['valid']],
+                'failed'    : [x['filePath'] for x in results if x['valid'] and x['error']],
+                'seconds'   : _clock() - startTime}
+
+    #
+    ## @brief Get file type of given Maya file from its extension.
+    #
+    #  @param mayaFile [ str | None | in  ] - Name of the file.
+    #
+    #  @exception N/A
+    #
+    #  @return str - mayaBinary or mayaAscii.
+    @staticmethod
+    def getFileType(mayaFile):
+
+        if os.path.splitext(mayaFile)[1][1:] == 'mb':
+            return 'mayaBinary'
+
+        return 'mayaAscii'
+
+    #
+    ## @brief Get plug of given setAttr edit string.
+    #
+    #  @param edit [ str | None | in  ] - Edit string, such as: setAttr someMayaFile:pCube1.translateX 5.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Name of the plug.
+    #  @return None - If edit string is not a setAttr edit.
+    @staticmethod
+    def _getEditPlug(edit):
+
+        tokens = edit.split(None, 2)
+        if len(tokens) < 2 or tokens[0] != 'setAttr':
+            return None
+
+        return tokens[1].strip('"')
+
+    #
+    ## @brief Unload given reference node and measure the time it takes to load it.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
+    #
+    #  @exception N/A
+    #
+    #  @return float - Load time in seconds.
+    @staticmethod
+    def _measureLoad(referenceNode):
+
+        cmds.file(unloadReference=referenceNode)
+
+        startTime = _clock()
+        cmds.file(loadReference=referenceNode)
+
+        return _clock() - startTime
+
+    #
+    ## @brief Get number of the parents of given reference node.
+    #
+    #  @param referenceNode [ str                                   | None | in  ] - Reference node.
+    #  @param index         [ mMayaCore.referenceLib.ReferenceIndex | None | in  ] - Reference index used instead of querying Maya.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Depth, 0 for top level references.
+    @staticmethod
+    def _getReferenceDepth(referenceNode, index=None):
+
+        depth  = 0
+        parent = referenceNode
+
+        while True:
+
+            if index is not None:
+                parent = index.parent(parent)
+            else:
+                parent = cmds.referenceQuery(parent, referenceNode=1, parent=1)
+
+            if not parent:
+                return depth
+
+            depth += 1
+
+    #
+    ## @brief Check whether given file exists, it is run in the validation threads.
+    #
+    #  @param mayaFile [ str | None | in  ] - Name of the file.
+    #
+    #  @exception N/A
+    #
+    #  @return bool  - Result.
+    #  @return float - Duration in seconds.
+    @staticmethod
+    def _validateFile(mayaFile):
+
+        startTime = _clock()
+
+        valid = os.path.isfile(mayaFile) and os.path.splitext(mayaFile)[1][1:] in ('ma', 'mb')
+
+        return valid, _clock() - startTime
+
+    #
+    ## @brief Run given operation once per reference node of given nodes.
+    #
+    #  @param nodes         [ list of str                           | None  | in  ] - Names of the nodes.
+    #  @param operation     [ callable                              | None  | in  ] - Function which takes a reference node and returns a result.
+    #  @param topNodesOnly  [ bool                                  | False | in  ] - Skip reference nodes nested under the other ones.
+    #  @param index         [ mMayaCore.referenceLib.ReferenceIndex | None  | in  ] - Reference index used instead of querying Maya.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report, keys are: referenceNodes, nodeCount, notReferenced, succeeded, failed, skipped, results.
+    @staticmethod
+    def runPerReferenceNode(nodes, operation, topNodesOnly=False, index=None):
+
+        referenceNodes, notReferenced = Reference.getReferenceNodes(nodes, index=index)
+
+        if notReferenced:
+            OpenMaya.MGlobal.displayWarning('Node(s) are not referenced: {}'.format(', '.join(notReferenced)))
+
+        targets = list(referenceNodes)
+        if topNodesOnly:
+            targets = Reference.getTopReferenceNodes(targets, index=index)
+
+        report = {'referenceNodes'  : list(referenceNodes),
+                  'nodeCount'       : len(nodes),
+                  'notReferenced'   : notReferenced,
+                  'succeeded'       : [],
+                  'failed'          : [],
+                  'skipped'         : [x for x in referenceNodes if x not in targets],
+                  'results'         : {}}
+
+        for referenceNode in targets:
+
+            try:
+                result = operation(referenceNode)
+            except RuntimeError as error:
+                OpenMaya.MGlobal.displayWarning('Reference node could not be processed: {} - {}'.format(referenceNode, error))
+                report['failed'].append(referenceNode)
+                continue
+
+            report['results'][referenceNode] = result
+            report['succeeded' if result else 'failed'].append(referenceNode)
+
+        return report
+
+    #
+    ## @brief Duplicate selected referenced nodes.
+    #
+    #  Each reference is duplicated once, regardless of the number of its selected nodes.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report @see runPerReferenceNode, results are resolved names of the duplicated files.
+    #  @return None - If nothing is selected.
+    @staticmethod
+    def duplicateSelected():
+
+        selection = cmds.ls(sl=1)
+        if not selection:
+            OpenMaya.MGlobal.displayWarning('Please select referenced node(s).')
+            return None
+
+        return Reference.runPerReferenceNode(selection, Reference.duplicateReferenceNode)
+
+    #
+    ## @brief Remove selected referenced nodes.
+    #
+    #  Method actually removes the referenced file which will be retrieved from the referenced nodes.
+    #  Each reference is removed once, nested references of removed references are skipped.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report @see runPerReferenceNode.
+    #  @return None - If nothing is selected or removal is not confirmed.
+    @staticmethod
+    def removeSelected():
+
+        selection = cmds.ls(sl=1)
+        if not selection:
+            OpenMaya.MGlobal.displayWarning('Please select referenced node(s).')
+            return None
+
+        confirm = cmds.confirmDialog(title='Remove Referenced Nodes',
+                                     message='Do you want to remove selected referenced node(s)?',
+                                     button=['Yes','No'],
+                                     defaultButton='No',
+                                     cancelButton='No',#
+                                     dismissString='No' )
+
+        if confirm != 'Yes':
+            return None
+
+        return Reference.runPerReferenceNode(selection, Reference.removeReferenceNode, topNodesOnly=True)
+
+    #
+    ## @brief Reload selected referenced nodes.
+    #
+    #  Method actually reloads the referenced file which will be retrieved from the referenced nodes.
+    #  Each reference is reloaded once, nested references of reloaded references are skipped.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report @see runPerReferenceNode.
+    #  @return None - If nothing is selected.
+    @staticmethod
+    def reloadSelected():
+
+        selection = cmds.ls(sl=1)
+        if not selection:
+            OpenMaya.MGlobal.displayWarning('Please select referenced node(s).')
+            return None
+
+        return Reference.runPerReferenceNode(selection, Reference.reloadReferenceNode, topNodesOnly=True)
+
+    #
+    ## @brief Compact reference edits of the references of selected nodes @see compactEditsMany.
+    #
+    #  @param dryRun [ bool | False | in  ] - Only analyse the edits, nothing is removed.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report @see compactEditsMany.
+    #  @return None - If nothing is selected.
+    @staticmethod
+    def compactEditsSelected(dryRun=False):
+
+        selection = cmds.ls(sl=1)
+        if not selection:
+            OpenMaya.MGlobal.displayWarning('Please select referenced node(s).')
+            return None
+
+        return Reference.compactEditsMany(selection, dryRun=dryRun)
+
+#
+## @brief [ CLASS ] - Class caches whether nodes are referenced and their reference nodes.
+#
+#  Cache is invalidated by Maya message callbacks when a scene is opened or created, references are created,
+#  removed, loaded or unloaded, and nodes are added, removed or renamed. Therefore Maya is queried only for the
+#  nodes which haven't been queried since the scene was changed. Nothing is cached unless the callbacks are installed
+#  by calling `install`. Node callbacks are removed while a scene is opened or created, so loading a scene doesn't
+#  call back for each node of the scene.
+#
+#  @code
+#import sys
+#import mMayaCore.referenceLib
+#
+#cache = mMayaCore.referenceLib.getReferenceMembershipCache()
+#cache.install()
+#
+#sys.stdout.write(cache.isNodeReferenced('someMayaFile:pCube1'))
+# # True
+#
+#sys.stdout.write(cache.referenceNode('someMayaFile:pCube1'))
+# # someMayaFileRN
+#
+#sys.stdout.write(cache.stats())
+# # {'hits': 1, 'misses': 2, 'invalidations': 0}
+#  @endcode
+class ReferenceMembershipCache(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self):
+
+        ## [ dict ] - Keys are names of the nodes, values are whether they are referenced.
+        self._referenced        = {}
+
+        ## [ dict ] - Keys are names of the nodes, values are reference nodes.
+        self._referenceNodes    = {}
+
+        ## [ mMayaCore.callbackLib.CallbackGroup ] - Scene callbacks which invalidate the cache.
+        self._callbackGroup     = mMayaCore.callbackLib.CallbackGroup()
+
+        ## [ mMayaCore.callbackLib.CallbackGroup ] - Node callbacks which invalidate the cache, suspended while a scene is opened.
+        self._nodeCallbackGroup = mMayaCore.callbackLib.CallbackGroup()
+
+        ## [ dict ] - Statistics, keys are: hits, misses, invalidations.
+        self._stats             = {'hits'           : 0,
+                                   'misses'         : 0,
+                                   'invalidations'  : 0}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Whether the callbacks are installed, nothing is cached otherwise.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isInstalled(self):
+
+        return len(self._callbackGroup) > 0
+
+    #
+    ## @brief Whether the results are cached, which is when the callbacks are installed and not suspended.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isCaching(self):
+
+        return len(self._nodeCallbackGroup) > 0
+
+    #
+    ## @brief Statistics.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: hits, misses, invalidations.
+    def stats(self):
+
+        return dict(self._stats)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Check whether given node is a referenced node.
+    #
+    #  @param node [ str | None | in  ] - Name of the node.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isNodeReferenced(self, node):
+
+        referenced = self._referenced.get(node)
+        if referenced is not None:
+            self._stats['hits'] += 1
+            return referenced
+
+        self._stats['misses'] += 1
+
+        referenced = bool(cmds.objExists(node) and cmds.referenceQuery(node, inr=1))
+
+        if self.isCaching():
+            self._referenced[node] = referenced
+
+        return referenced
+
+    #
+    ## @brief Get reference node of given node.
+    #
+    #  @param node [ str | None | in  ] - Name of the node.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Reference node.
+    #  @return None - If node doesn't exist or is not referenced.
+    def referenceNode(self, node):
+
+        referenceNode = self._referenceNodes.get(node)
+        if referenceNode is not None:
+            self._stats['hits'] += 1
+            return referenceNode
+
+        # Stats are counted once per call, by the membership lookup
+        if not self.isNodeReferenced(node):
+            return None
+
+        referenceNode = cmds.referenceQuery(node, referenceNode=1)
+
+        if self.isCaching():
+            self._referenceNodes[node] = referenceNode
+
+        return referenceNode
+
+    #
+    ## @brief Store reference node of given nodes, which is already known by the caller.
+    #
+    #  @param nodes         [ list of str | None | in  ] - Names of the nodes.
+    #  @param referenceNode [ str         | None | in  ] - Reference node.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def setReferenceNode(self, nodes, referenceNode):
+
+        if not self.isCaching():
+            return
+
+        for node in nodes:
+            self._referenced[node]      = True
+            self._referenceNodes[node]  = referenceNode
+
+    #
+    ## @brief Invalidate the cache, it is called by the callbacks.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def invalidate(self, *args):
+
+        if not self._referenced and not self._referenceNodes:
+            return
+
+        self._referenced        = {}
+        self._referenceNodes    = {}
+
+        self._stats['invalidations'] += 1
+
+    #
+    ## @brief Install the callbacks which invalidate the cache, nothing is cached until it is called.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False if they are already installed.
+    def install(self):
+
+        if self.isInstalled():
+            return False
+
+        self._callbackGroup.addSceneCallbacks(mMayaCore.callbackLib.SCENE_OPENING_MESSAGES, self.suspend)
+        self._callbackGroup.addSceneCallbacks(mMayaCore.callbackLib.SCENE_CHANGED_MESSAGES, self.resume)
+
+        self.resume()
+
+        return True
+
+    #
+    ## @brief Remove the node callbacks and clear the cache, it is called before a scene is opened or created.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def suspend(self, *args):
+
+        self._nodeCallbackGroup.remove()
+        self.invalidate()
+
+    #
+    ## @brief Add the node callbacks back and clear the cache, it is called after the scene is changed.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def resume(self, *args):
+
+        self.invalidate()
+
+        if self.isCaching():
+            return
+
+        self._nodeCallbackGroup.addNodeAddedCallback(self.invalidate)
+        self._nodeCallbackGroup.addNodeRemovedCallback(self.invalidate)
+        self._nodeCallbackGroup.addNameChangedCallback(self.invalidate)
+
+    #
+    ## @brief Remove the callbacks and clear the cache.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def uninstall(self):
+
+        self._callbackGroup.remove()
+        self._nodeCallbackGroup.remove()
+        self.invalidate()
+
+#
+## @brief [ CLASS ] - Class indexes the references of the scene by walking the dependency graph once.
+#
+#  Each reference node is mapped to its file path, copy number, namespace, load state, parent reference node
+#  and member nodes. Member nodes are mapped to their reference nodes, so the reference node of any node is
+#  resolved by a dictionary lookup. DAG nodes can be given by their partial or full path names.
+#
+#  Index is a snapshot of the scene, it should be rebuilt by calling `build` after references are changed.
+#
+#  @code
+#import sys
+#import mMayaCore.referenceLib
+#
+#index = mMayaCore.referenceLib.ReferenceIndex()
+#
+#sys.stdout.write(index.referenceNode('someMayaFile:pCube1'))
+# # someMayaFileRN
+#
+#sys.stdout.write(index.reference('someMayaFileRN'))
+# # {'referenceNode': 'someMayaFileRN', 'filePath': '/pathToFile/someMayaFile.ma', 'resolvedFilePath': '/pathToFile/someMayaFile.ma',
+# #  'copyNumber': 0, 'nameSpace': 'someMayaFile', 'loaded': True, 'parent': None, 'members': ['someMayaFile:pCube1', ...]}
+#
+#sys.stdout.write(index.filePath('someMayaFileRN', copyNumber=True))
+# # /pathToFile/someMayaFile.ma
+#  @endcode
+class ReferenceIndex(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param build [ bool | True | in  ] - Build the index.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, build=True):
+
+        ## [ collections.OrderedDict ] - References, keys are reference nodes, values are dicts.
+        self._references    = OrderedDict()
+
+        ## [ dict ] - Keys are member node names, values are reference nodes.
+        self._nodes         = {}
+
+        if build:
+            self.build()
+
+    #
+    ## @brief Number of the references.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the references.
+    def __len__(self):
+
+        return len(self._references)
+
+    #
+    ## @brief Check whether given reference node is in the index.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def __contains__(self, referenceNode):
+
+        return referenceNode in self._references
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Reference nodes.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Reference nodes in the order they are found in the scene.
+    def referenceNodes(self):
+
+        return list(self._references)
+
+    #
+    ## @brief Information of given reference node.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: referenceNode, filePath, resolvedFilePath, copyNumber, nameSpace, loaded, parent, members.
+    #  @return None - If reference node is not in the index.
+    def reference(self, referenceNode):
+
+        return self._references.get(referenceNode)
+
+    #
+    ## @brief Reference node of given node.
+    #
+    #  @param node [ str | None | in  ] - Name of the node.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Reference node.
+    #  @return None - If node is not referenced.
+    def referenceNode(self, node):
+
+        return self._nodes.get(node)
+
+    #
+    ## @brief File path of given reference node.
+    #
+    #  @param referenceNode [ str  | None  | in  ] - Reference node.
+    #  @param copyNumber    [ bool | False | in  ] - Include copy number, `{2}`.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - File path.
+    #  @return None - If reference node is not in the index.
+    def filePath(self, referenceNode, copyNumber=False):
+
+        reference = self._references.get(referenceNode)
+        if not reference:
+            return None
+
+        return reference['resolvedFilePath'] if copyNumber else reference['filePath']
+
+    #
+    ## @brief Parent reference node of given reference node.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Parent reference node.
+    #  @return None - If reference is not nested or not in the index.
+    def parent(self, referenceNode):
+
+        reference = self._references.get(referenceNode)
+        if not reference:
+            return None
+
+        return reference['parent']
+
+    #
+    ## @brief Child reference nodes of given reference node.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node, top level reference nodes are returned if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Reference nodes.
+    def children(self, referenceNode=None):
+
+        return [x['referenceNode'] for x in self._references.values() if x['parent'] == referenceNode]
+
+    #
+    ## @brief Member nodes of given reference node.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Names of the nodes, partial path names for DAG nodes.
+    def members(self, referenceNode):
+
+        reference = self._references.get(referenceNode)
+        if not reference:
+            return []
+
+        return list(reference['members'])
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Build the index by walking the reference nodes of the scene.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the references.
+    def build(self):
+
+        self.clear()
+
+        iterator = OpenMaya2.MItDependencyNodes(OpenMaya2.MFn.kReference)
+
+        while not iterator.isDone():
+
+            mObject = iterator.thisNode()
+            iterator.next()
+
+            reference = ReferenceIndex._getReference(mObject)
+            if not reference:
+                continue
+
+            self._references[reference['referenceNode']] = reference
+
+            for names in reference.pop('memberNames'):
+                for name in names:
+                    self._nodes[name] = reference['referenceNode']
+
+        return len(self._references)
+
+    #
+    ## @brief Clear the index.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def clear(self):
+
+        self._references    = OrderedDict()
+        self._nodes         = {}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get information of given reference node.
+    #
+    #  @param mObject [ maya.api.OpenMaya.MObject | None | in  ] - Reference node.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Information, `memberNames` key contains tuples of names of each member node.
+    #  @return None - If reference node doesn't reference a file.
+    @staticmethod
+    def _getReference(mObject):
+
+        mfnReference  = OpenMaya2.MFnReference(mObject)
+        referenceNode = mfnReference.name()
+
+        if referenceNode == SHARED_REFERENCE_NODE:
+            return None
+
+        try:
+            resolvedFilePath = mfnReference.fileName(True, True, True)
+            filePath         = mfnReference.fileName(True, True, False)
+        except RuntimeError:
+            return None
+
+        copyNumber = 0
+        if resolvedFilePath.endswith('}') and '{' in resolvedFilePath:
+            copyNumber = int(resolvedFilePath[resolvedFilePath.rindex('{') + 1:-1])
+
+        parent       = None
+        parentObject = mfnReference.parentReference()
+        if not parentObject.isNull():
+            parent = OpenMaya2.MFnDependencyNode(parentObject).name()
+
+        members     = []
+        memberNames = []
+
+        for member in mfnReference.nodes():
+
+            if member.hasFn(OpenMaya2.MFn.kDagNode):
+                dagPath = OpenMaya2.MDagPath.getAPathTo(member)
+                names   = (dagPath.partialPathName(), dagPath.fullPathName())
+            else:
+                names   = (OpenMaya2.MFnDependencyNode(member).name(),)
+
+            members.append(names[0])
+            memberNames.append(names)
+
+        return {'referenceNode'     : referenceNode,
+                'filePath'          : filePath,
+                'resolvedFilePath'  : resolvedFilePath,
+                'copyNumber'        : copyNumber,
+                'nameSpace'         : mfnReference.associatedNamespace(False).lstrip(':'),
+                'loaded'            : mfnReference.isLoaded(),
+                'parent'            : parent,
+                'members'           : members,
+                'memberNames'       : memberNames}
+
+#
+## @brief [ CLASS ] - Class makes Maya read referenced files from the local copies of the reference cache.
+#
+#  Scenes keep the paths of the source files. Before Maya creates or loads a reference, which includes the nested
+#  references of the loaded files, the path Maya resolves the file to is overridden with its local copy, which is
+#  copied if it is not cached yet @see mMayaCore.referenceCacheLib. Copies are unpinned, so they can be evicted,
+#  when their references are unloaded or removed, and when a new scene is created or opened.
+#
+#  Hook is installed by the methods of mMayaCore.referenceLib.Reference which create references, it should be
+#  installed before a scene is opened, e.g. in userSetup.py, so the references of the scene are read from the cache.
+#
+#  @code
+#import mMayaCore.referenceLib
+#
+#mMayaCore.referenceLib.getReferenceCacheHook()
+#  @endcode
+class ReferenceCacheHook(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param cache [ mMayaCore.referenceCacheLib.ReferenceCache | None | in  ] - Reference cache, cache of the session is
+    #                                                                             used if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, cache=None):
+
+        ## [ mMayaCore.referenceCacheLib.ReferenceCache ] - Reference cache.
+        self._cache         = cache
+
+        ## [ mMayaCore.callbackLib.CallbackGroup ] - Reference callbacks.
+        self._callbackGroup = mMayaCore.callbackLib.CallbackGroup()
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Reference cache.
+    #
+    #  @exception N/A
+    #
+    #  @return mMayaCore.referenceCacheLib.ReferenceCache - Reference cache.
+    #  @return None                                       - If the cache is not enabled.
+    def cache(self):
+
+        return self._cache or mMayaCore.referenceCacheLib.getReferenceCache()
+
+    #
+    ## @brief Whether the callbacks are installed.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isInstalled(self):
+
+        return len(self._callbackGroup) > 0
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Override the path given file resolves to with its local copy, it is called before Maya reads a referenced file.
+    #
+    #  @param fileObject [ maya.api.OpenMaya.MFileObject | None | in  ] - File Maya is about to read.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - True, so the reference is always created or loaded.
+    def redirect(self, fileObject, *args):
+
+        cache = self.cache()
+        if not cache:
+            return True
+
+        filePath = fileObject.resolvedFullName()
+        if not filePath:
+            return True
+
+        cachedFile = cache.resolve(filePath)
+        if cachedFile != filePath:
+            fileObject.overrideResolvedFullName(cachedFile)
+
+        return True
+
+    #
+    ## @brief Unpin the local copy of given file, it is called after a reference is unloaded or removed.
+    #
+    #  @param referenceNode [ maya.api.OpenMaya.MObject     | None | in  ] - Reference node.
+    #  @param fileObject    [ maya.api.OpenMaya.MFileObject | None | in  ] - Referenced file.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the evicted copies.
+    def unpin(self, referenceNode, fileObject, *args):
+
+        cache = self.cache()
+        if not cache:
+            return 0
+
+        cache.unpin(fileObject.resolvedFullName())
+
+        return cache.evict()
+
+    #
+    ## @brief Unpin all local copies, it is called before a new scene is created or opened.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the evicted copies.
+    def unpinAll(self, *args):
+
+        cache = self.cache()
+        if not cache:
+            return 0
+
+        cache.unpin()
+
+        return cache.evict()
+
+    #
+    ## @brief Install the callbacks.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False if they are already installed.
+    def install(self):
+
+        if self.isInstalled():
+            return False
+
+        self._callbackGroup.addCheckFileCallbacks(mMayaCore.callbackLib.REFERENCE_CHECK_MESSAGES, self.redirect)
+        self._callbackGroup.addReferenceCallbacks(CACHE_UNPIN_MESSAGES, self.unpin)
+        self._callbackGroup.addSceneCallbacks(mMayaCore.callbackLib.SCENE_OPENING_MESSAGES, self.unpinAll)
+
+        return True
+
+    #
+    ## @brief Remove the callbacks.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def uninstall(self):
+
+        self._callbackGroup.remove()
+
+#
+## @brief Get the names given long name of a node can be given with, partial path names for DAG nodes.
+#
+#  @param longName [ str | None | in  ] - Long name of the node, such as: |group1|pCube1.
+#
+#  @exception N/A
+#
+#  @return list of str - Names, such as: |group1|pCube1, group1|pCube1, pCube1.
+def getPartialPathNames(longName):
+
+    parts = longName.split('|')
+
+    return ['|'.join(parts[x:]) for x in range(len(parts))]
+
+#
+## @brief Get the reference membership cache of the session, nothing is cached until its `install` method is called.
+#
+#  @exception N/A
+#
+#  @return mMayaCore.referenceLib.ReferenceMembershipCache - Reference membership cache.
+def getReferenceMembershipCache():
+
+    global _referenceMembershipCache
+
+    if not _referenceMembershipCache:
+        _referenceMembershipCache = ReferenceMembershipCache()
+
+    return _referenceMembershipCache
+
+#
+## @brief Get the reference cache hook of the session, its callbacks are installed if the reference cache is enabled.
+#
+#  @exception N/A
+#
+#  @return mMayaCore.referenceLib.ReferenceCacheHook - Reference cache hook.
+def getReferenceCacheHook():
+
+    global _referenceCacheHook
+
+    if _referenceCacheHook is None:
+        _referenceCacheHook = ReferenceCacheHook()
+
+    if not _referenceCacheHook.isInstalled() and mMayaCore.referenceCacheLib.getReferenceCache():
+        _referenceCacheHook.install()
+
+    return _referenceCacheHook
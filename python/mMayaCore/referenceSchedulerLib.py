@@ -0,0 +1,501 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMayaCore/referenceSchedulerLib.py @brief [ FILE ] - Load references in the background on idle.
+## @package mMayaCore.referenceSchedulerLib    @brief [ FILE ] - Load references in the background on idle.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  time
+import  heapq
+import  itertools
+
+from    maya import cmds
+from    maya import OpenMaya
+
+import  mMayaCore.callbackLib
+import  mMayaCore.referenceLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ float ] - Default time budget of an idle tick in seconds.
+DEFAULT_TIME_BUDGET = 0.05
+
+## [ str ] - State of a scheduler which hasn't been started yet.
+STATE_IDLE          = 'idle'
+
+## [ str ] - State of a scheduler which is loading references.
+STATE_RUNNING       = 'running'
+
+## [ str ] - State of a scheduler which has loaded all of its references.
+STATE_FINISHED      = 'finished'
+
+## [ str ] - State of a cancelled scheduler.
+STATE_CANCELLED     = 'cancelled'
+
+## [ callable ] - High resolution clock.
+_clock              = getattr(time, 'perf_counter', time.time)
+
+
+#
+## @brief [ CLASS ] - Class loads unloaded references one at a time on idle events, in the order of their priorities.
+#
+#  References are loaded in idle event ticks, each tick loads references until its time budget is spent, at least one
+#  reference is loaded per tick since loading a reference can't be interrupted. UI stays responsive between the loads.
+#  Lower priority values are loaded first, priority is the size of the file if it is not given, so small assets show
+#  up first. References can be added, reprioritized and removed while loading is in progress.
+#
+#  Queue belongs to the current scene, it is cancelled before a new scene is created or opened.
+#
+#  @code
+#import mMayaCore.referenceLib
+#import mMayaCore.referenceSchedulerLib
+#
+#report = mMayaCore.referenceLib.Reference.createMany(['/pathToFile/char.ma', '/pathToFile/set.mb'], load=False)
+#
+#scheduler = mMayaCore.referenceSchedulerLib.ReferenceLoadScheduler()
+#scheduler.addMany(report['created'])
+#scheduler.setPriority('charRN', 0)
+#scheduler.start()
+#
+#sys.stdout.write(scheduler.progress())
+# # {'state': 'running', 'total': 2, 'loaded': 1, 'failed': 0, 'cancelled': 0, 'remaining': 1, 'current': 'charRN', 'seconds': 1.2}
+#
+#scheduler.cancel()
+#  @endcode
+class ReferenceLoadScheduler(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param budget           [ float    | DEFAULT_TIME_BUDGET | in  ] - Time budget of an idle tick in seconds.
+    #  @param progressCallback [ callable | None                | in  ] - Function called with the progress dict after each load,
+    #                                                                      progress is displayed in Maya if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, budget=DEFAULT_TIME_BUDGET, progressCallback=None):
+
+        ## [ float ] - Time budget of an idle tick.
+        self._budget            = budget
+
+        ## [ callable ] - Progress callback.
+        self._progressCallback  = progressCallback
+
+        ## [ list of tuple ] - Heap, each tuple contains priority, sequence and reference node.
+        self._heap              = []
+
+        ## [ dict ] - Current priorities of the queued reference nodes, heap items with another priority are stale.
+        self._priorities        = {}
+
+        ## [ itertools.count ] - Sequence, it keeps the order of the references with the same priority.
+        self._sequence          = itertools.count()
+
+        ## [ int ] - Script job id of the idle event.
+        self._scriptJob         = None
+
+        ## [ mMayaCore.callbackLib.CallbackGroup ] - Scene callbacks which cancel loading when the scene is changed.
+        self._callbackGroup     = mMayaCore.callbackLib.CallbackGroup()
+
+        ## [ str ] - State.
+        self._state             = STATE_IDLE
+
+        ## [ list of str ] - Loaded reference nodes.
+        self._loaded            = []
+
+        ## [ dict ] - Failed reference nodes, values are errors.
+        self._failed            = {}
+
+        ## [ list of str ] - Reference nodes which are left unloaded since loading is cancelled.
+        self._cancelled         = []
+
+        ## [ dict ] - Load durations of the reference nodes in seconds.
+        self._timings           = {}
+
+        ## [ str ] - Reference node loaded last.
+        self._current           = None
+
+        ## [ float ] - Time loading is started at.
+        self._startTime         = None
+
+    #
+    ## @brief Number of the queued references.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the references.
+    def __len__(self):
+
+        return len(self._priorities)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief State, one of STATE_IDLE, STATE_RUNNING, STATE_FINISHED, STATE_CANCELLED.
+    #
+    #  @exception N/A
+    #
+    #  @return str - State.
+    def state(self):
+
+        return self._state
+
+    #
+    ## @brief Queued reference nodes in the order they will be loaded.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Reference nodes.
+    def queue(self):
+
+        queue  = []
+        queued = set()
+
+        for priority, _, referenceNode in sorted(self._heap):
+            if referenceNode not in queued and self._priorities.get(referenceNode) == priority:
+                queued.add(referenceNode)
+                queue.append(referenceNode)
+
+        return queue
+
+    #
+    ## @brief Load durations of the loaded references.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are reference nodes, values are durations in seconds.
+    def timings(self):
+
+        return dict(self._timings)
+
+    #
+    ## @brief Progress.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: state, total, loaded, failed, cancelled, remaining, current, seconds.
+    def progress(self):
+
+        return {'state'     : self._state,
+                'total'     : len(self._loaded) + len(self._failed) + len(self._cancelled) + len(self._priorities),
+                'loaded'    : len(self._loaded),
+                'failed'    : len(self._failed),
+                'cancelled' : len(self._cancelled),
+                'remaining' : len(self._priorities),
+                'current'   : self._current,
+                'seconds'   : _clock() - self._startTime if self._startTime else 0.0}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Add given reference node to the queue, or set its priority if it is queued already.
+    #
+    #  @param referenceNode [ str   | None | in  ] - Reference node.
+    #  @param priority      [ float | None | in  ] - Priority, lower values are loaded first, size of the file if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return float - Priority.
+    def add(self, referenceNode, priority=None):
+
+        if priority is None:
+            priority = getFileSizePriority(referenceNode)
+
+        self._priorities[referenceNode] = priority
+        heapq.heappush(self._heap, (priority, next(self._sequence), referenceNode))
+
+        self._installCallbacks()
+
+        return priority
+
+    #
+    ## @brief Add given reference nodes to the queue.
+    #
+    #  @param referenceNodes [ list of str or dict | None | in  ] - Reference nodes, or dict whose keys are reference nodes and
+    #                                                               values are priorities.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the added reference nodes.
+    def addMany(self, referenceNodes):
+
+        if isinstance(referenceNodes, dict):
+            items = referenceNodes.items()
+        else:
+            items = [(x, None) for x in referenceNodes]
+
+        for referenceNode, priority in items:
+            self.add(referenceNode, priority=priority)
+
+        return len(items)
+
+    #
+    ## @brief Add unloaded references of the scene to the queue.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Added reference nodes.
+    def addUnloaded(self):
+
+        referenceNodes = []
+
+        for referenceNode in cmds.ls(type='reference') or []:
+
+            if referenceNode == mMayaCore.referenceLib.SHARED_REFERENCE_NODE:
+                continue
+
+            try:
+                if cmds.referenceQuery(referenceNode, isLoaded=1):
+                    continue
+            except RuntimeError:
+                continue
+
+            referenceNodes.append(referenceNode)
+
+        self.addMany(referenceNodes)
+
+        return referenceNodes
+
+    #
+    ## @brief Set priority of given queued reference node.
+    #
+    #  @param referenceNode [ str   | None | in  ] - Reference node.
+    #  @param priority      [ float | None | in  ] - Priority, lower values are loaded first.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False if reference node is not queued.
+    def setPriority(self, referenceNode, priority):
+
+        if referenceNode not in self._priorities:
+            return False
+
+        self.add(referenceNode, priority=priority)
+
+        return True
+
+    #
+    ## @brief Remove given reference node from the queue.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False if reference node is not queued.
+    def remove(self, referenceNode):
+
+        return self._priorities.pop(referenceNode, None) is not None
+
+    #
+    ## @brief Start loading on idle events.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False if it is running already.
+    def start(self):
+
+        if self._scriptJob is not None:
+            return False
+
+        self._installCallbacks()
+
+        self._state     = STATE_RUNNING
+        self._startTime = self._startTime or _clock()
+        self._scriptJob = cmds.scriptJob(idleEvent=self.tick)
+
+        return True
+
+    #
+    ## @brief Stop loading and clear the queue.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the references which are left unloaded.
+    def cancel(self):
+
+        count = len(self._priorities)
+
+        self._stop()
+
+        self._cancelled.extend(self.queue())
+        self._heap          = []
+        self._priorities    = {}
+        self._state         = STATE_CANCELLED
+
+        self._reportProgress()
+
+        return count
+
+    #
+    ## @brief Load the references with the highest priorities until the time budget is spent, it is run on idle events.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of the references loaded in this tick.
+    def tick(self):
+
+        startTime = _clock()
+        count     = 0
+
+        while self._heap and self._state != STATE_CANCELLED:
+
+            if count and _clock() - startTime >= self._budget:
+                break
+
+            priority, _, referenceNode = heapq.heappop(self._heap)
+
+            if self._priorities.get(referenceNode) != priority:
+                continue
+
+            del self._priorities[referenceNode]
+
+            self._load(referenceNode)
+            count += 1
+
+        if not self._priorities and self._state != STATE_CANCELLED:
+            self._heap  = []
+            self._state = STATE_FINISHED
+            self._stop()
+            self._reportProgress()
+
+        return count
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Load given reference node.
+    #
+    #  @param referenceNode [ str | None | in  ] - Reference node.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def _load(self, referenceNode):
+
+        self._current = referenceNode
+        loadStart     = _clock()
+
+        try:
+            if not cmds.objExists(referenceNode):
+                raise RuntimeError('Reference node does not exist')
+
+            if not cmds.referenceQuery(referenceNode, isLoaded=1):
+                mMayaCore.referenceLib.Reference.reloadReferenceNode(referenceNode)
+
+        except RuntimeError as error:
+            self._failed[referenceNode] = str(error)
+            OpenMaya.MGlobal.displayWarning('Reference could not be loaded: {} - {}'.format(referenceNode, error))
+            self._reportProgress()
+            return False
+
+        self._timings[referenceNode] = _clock() - loadStart
+        self._loaded.append(referenceNode)
+
+        self._reportProgress()
+
+        return True
+
+    #
+    ## @brief Cancel loading before a new scene is created or opened, queued references belong to the current scene.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _cancelWithScene(self, *args):
+
+        self.cancel()
+
+        self._current = None
+
+    #
+    ## @brief Install the scene callbacks which cancel loading.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _installCallbacks(self):
+
+        if not len(self._callbackGroup):
+            self._callbackGroup.addSceneCallbacks(mMayaCore.callbackLib.SCENE_OPENING_MESSAGES, self._cancelWithScene)
+
+    #
+    ## @brief Kill the script job and remove the scene callbacks.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _stop(self):
+
+        self._callbackGroup.remove()
+
+        if self._scriptJob is None:
+            return
+
+        if cmds.scriptJob(exists=self._scriptJob):
+            cmds.scriptJob(kill=self._scriptJob, force=True)
+
+        self._scriptJob = None
+
+    #
+    ## @brief Report progress to the progress callback, or display it in Maya.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _reportProgress(self):
+
+        progress = self.progress()
+
+        if self._progressCallback:
+            self._progressCallback(progress)
+            return
+
+        OpenMaya.MGlobal.displayInfo('Loading references [ {state} ]: {loaded}/{total} loaded, {failed} failed - {current}'.format(**progress))
+
+#
+## @brief Get priority of given reference node from the size of its file.
+#
+#  @param referenceNode [ str | None | in  ] - Reference node.
+#
+#  @exception N/A
+#
+#  @return float - Size of the file in bytes, infinity if it can't be found.
+def getFileSizePriority(referenceNode):
+
+    try:
+        return float(os.path.getsize(cmds.referenceQuery(referenceNode, filename=1, withoutCopyNumber=1)))
+    except (RuntimeError, OSError):
+        return float('inf')
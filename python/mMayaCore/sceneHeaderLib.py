@@ -0,0 +1,812 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMayaCore/sceneHeaderLib.py @brief [ FILE ] - Read references, required plug-ins and file info of Maya files without Maya.
+## @package mMayaCore.sceneHeaderLib    @brief [ FILE ] - Read references, required plug-ins and file info of Maya files without Maya.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  io
+import  os
+import  re
+import  mmap
+import  struct
+
+from    collections import OrderedDict
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ int ] - Number of bytes read at once.
+CHUNK_SIZE          = 65536
+
+## [ tuple of str ] - MEL commands of the header section, reading stops at the first statement of another command.
+HEADER_COMMANDS     = ('file', 'requires', 'currentUnit', 'fileInfo')
+
+## [ tuple of str ] - Flags of `file` command which don't take an argument.
+FILE_BOOLEAN_FLAGS  = ('-r', '-reference')
+
+## [ str ] - Encoding of the statements.
+ENCODING            = 'utf-8'
+
+## [ re.SRE_Pattern ] - Statement terminated by a semicolon, semicolons in double quoted strings are skipped.
+_STATEMENT_PATTERN  = re.compile(br'(?:[^;"]|"(?:[^"\\]|\\.)*")*;', re.DOTALL)
+
+## [ re.SRE_Pattern ] - Token, double quoted string or a sequence of non-whitespace characters.
+_TOKEN_PATTERN      = re.compile(r'"((?:[^"\\]|\\.)*)"|(\S+)', re.DOTALL)
+
+## [ re.SRE_Pattern ] - Version in the first line, `//Maya ASCII 2020 scene`.
+_VERSION_PATTERN    = re.compile(br'//Maya ASCII (\S+) scene')
+
+## [ re.SRE_Pattern ] - Copy number Maya appends to the paths of the files referenced more than once, `{1}`.
+_COPY_NUMBER_PATTERN = re.compile(r'\{\d+\}$')
+
+## [ dict ] - Escape sequences of MEL strings.
+_ESCAPES            = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\'}
+
+## [ tuple of bytes ] - IFF group tags of Maya Binary files, 32 and 64 bit versions.
+IFF_GROUP_TAGS      = (b'FOR4', b'FOR8', b'LIS4', b'LIS8', b'CAT4', b'CAT8')
+
+## [ tuple of bytes ] - Form types of the groups which contain the header chunks, the other groups contain node data.
+IFF_HEADER_GROUPS   = (b'HEAD', b'FREF')
+
+## [ dict ] - Unit chunks of Maya Binary files, values are the flags of `currentUnit` command.
+IFF_UNIT_CHUNKS     = {b'LUNI': '-l', b'AUNI': '-a', b'TUNI': '-t'}
+
+## [ tuple of str ] - Extensions of the files which are read as Maya Binary files.
+BINARY_EXTENSIONS   = ('.mb',)
+
+
+#
+## @brief [ CLASS ] - Class contains references, required plug-ins and file info read from the header of a Maya file.
+#
+#  Instances are created by `readHeader` function.
+#
+#  @code
+#import sys
+#import mMayaCore.sceneHeaderLib
+#
+#header = mMayaCore.sceneHeaderLib.readHeader('/pathToFile/someMayaFile.ma')
+#
+#sys.stdout.write(header.referencedFiles())
+# # ['/pathToFile/character.ma', '/pathToFile/prop.ma']
+#
+#sys.stdout.write(header.references()[0])
+# # {'filePath': '/pathToFile/character.ma', 'nameSpace': 'character', 'referenceNode': 'characterRN', 'fileType': 'mayaAscii',
+# #  'options': 'v=0;', 'depth': 1, 'parent': None, 'deferred': False, 'flags': {...}}
+#
+#sys.stdout.write(header.plugins())
+# # ['mtoa']
+#
+#sys.stdout.write(header.fileInfo()['application'])
+# # maya
+#  @endcode
+class SceneHeader(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param filePath [ str | None | in  ] - Path of the Maya file.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, filePath):
+
+        ## [ str ] - Path of the Maya file.
+        self._filePath              = filePath
+
+        ## [ str ] - Maya version the file is saved with.
+        self._version               = None
+
+        ## [ list of dict ] - References, `file -r` statements.
+        self._references            = []
+
+        ## [ list of dict ] - Reference declarations of all depths, `file -rdi` statements.
+        self._referenceDeclarations = []
+
+        ## [ list of dict ] - Required plug-ins, `requires` statements.
+        self._requires              = []
+
+        ## [ collections.OrderedDict ] - File info, `fileInfo` statements.
+        self._fileInfo              = OrderedDict()
+
+        ## [ dict ] - Units, `currentUnit` statement, keys are flags without dash.
+        self._units                 = {}
+
+        ## [ int ] - Number of bytes read from the file.
+        self._bytesRead             = 0
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Path of the Maya file.
+    #
+    #  @exception N/A
+    #
+    #  @return str - File path.
+    def filePath(self):
+
+        return self._filePath
+
+    #
+    ## @brief Maya version the file is saved with.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Version.
+    #  @return None - If version is not found.
+    def version(self):
+
+        return self._version
+
+    #
+    ## @brief References, they are the references of the file itself, not the nested ones.
+    #
+    #  @exception N/A
+    #
+    #  @return list of dict - Keys are: filePath, nameSpace, referenceNode, fileType, options, depth, parent, deferred, flags.
+    def references(self):
+
+        return list(self._references)
+
+    #
+    ## @brief Reference declarations, they include the nested references, `depth` of top level references is 1.
+    #
+    #  @exception N/A
+    #
+    #  @return list of dict - Keys are: filePath, nameSpace, referenceNode, fileType, options, depth, parent, deferred, flags.
+    def referenceDeclarations(self):
+
+        return list(self._referenceDeclarations)
+
+    #
+    ## @brief Unique paths of the referenced files, including the nested ones if they are declared in the file.
+    #
+    #  Copy numbers of the files referenced more than once are removed, `/path/file.ma{1}` is `/path/file.ma`.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - File paths in the order they appear in the file.
+    def referencedFiles(self):
+
+        filePaths = OrderedDict()
+
+        for reference in self._referenceDeclarations + self._references:
+            filePaths[_COPY_NUMBER_PATTERN.sub('', reference['filePath'])] = None
+
+        return list(filePaths)
+
+    #
+    ## @brief Required plug-ins.
+    #
+    #  @exception N/A
+    #
+    #  @return list of dict - Keys are: plugin, version, nodeTypes, dataTypes.
+    def requires(self):
+
+        return list(self._requires)
+
+    #
+    ## @brief Names of the required plug-ins, `maya` itself is excluded.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Plug-in names.
+    def plugins(self):
+
+        return [x['plugin'] for x in self._requires if x['plugin'] != 'maya']
+
+    #
+    ## @brief File info.
+    #
+    #  @exception N/A
+    #
+    #  @return collections.OrderedDict - Keys are names, values are values.
+    def fileInfo(self):
+
+        return OrderedDict(self._fileInfo)
+
+    #
+    ## @brief Units.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are flags of `currentUnit` without dash, values are units.
+    def units(self):
+
+        return dict(self._units)
+
+    #
+    ## @brief Number of bytes read from the file.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of bytes.
+    def bytesRead(self):
+
+        return self._bytesRead
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get the header as dict, it can be written as JSON.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: filePath, version, references, referenceDeclarations, requires, fileInfo, units.
+    def toDict(self):
+
+        return {'filePath'              : self._filePath,
+                'version'               : self._version,
+                'references'            : self.references(),
+                'referenceDeclarations' : self.referenceDeclarations(),
+                'requires'              : self.requires(),
+                'fileInfo'              : self.fileInfo(),
+                'units'                 : self.units()}
+
+    #
+    ## @brief Add given MEL statement to the header.
+    #
+    #  @param tokens [ list of tuple | None | in  ] - Tokens of the statement @see tokenize.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False if the statement is not part of the header, it is the end of the header.
+    def addStatement(self, tokens):
+
+        if not tokens:
+            return True
+
+        command = tokens[0][0]
+        if command not in HEADER_COMMANDS:
+            return False
+
+        if command == 'file':
+            reference = parseFileStatement(tokens)
+            if reference:
+                self.addReference(reference)
+
+        elif command == 'requires':
+            self._requires.append(parseRequiresStatement(tokens))
+
+        elif command == 'fileInfo':
+            if len(tokens) > 2:
+                self._fileInfo[tokens[1][0]] = tokens[2][0]
+
+        elif command == 'currentUnit':
+            flags, _ = parseFlags(tokens[1:])
+            self._units.update(dict((k.lstrip('-'), v) for k, v in flags.items()))
+
+        return True
+
+    #
+    ## @brief Add given reference.
+    #
+    #  Parent of a reference declaration is resolved from the depth of the declarations before it.
+    #
+    #  @param reference [ dict | None | in  ] - Reference @see parseFileStatement.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def addReference(self, reference):
+
+        if not reference['isDeclaration']:
+            del reference['isDeclaration']
+            self._references.append(reference)
+            return
+
+        del reference['isDeclaration']
+
+        depth = reference['depth']
+        for declaration in reversed(self._referenceDeclarations):
+            if declaration['depth'] < depth:
+                reference['parent'] = declaration['referenceNode']
+                break
+
+        self._referenceDeclarations.append(reference)
+
+    #
+    ## @brief Set version.
+    #
+    #  @param version [ str | None | in  ] - Version.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def setVersion(self, version):
+
+        self._version = version
+
+    #
+    ## @brief Set number of bytes read from the file.
+    #
+    #  @param bytesRead [ int | None | in  ] - Number of bytes.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def setBytesRead(self, bytesRead):
+
+        self._bytesRead = bytesRead
+
+#
+## @brief Read header of given Maya ASCII or Maya Binary file.
+#
+#  Maya ASCII files are read in chunks of CHUNK_SIZE bytes and reading stops at the first statement which is not part
+#  of the header, usually the first `createNode`, so only the beginning of large files is read.
+#
+#  Maya Binary files are memory mapped and IFF chunks are walked until the first group of node data, see `readChunks`.
+#
+#  @param filePath [ str | None | in  ] - Path of the Maya file.
+#
+#  @exception N/A
+#
+#  @return mMayaCore.sceneHeaderLib.SceneHeader - Header.
+#  @return None                                 - If file doesn't exist or it is not a Maya file.
+def readHeader(filePath):
+
+    if not os.path.isfile(filePath):
+        return None
+
+    extension = os.path.splitext(filePath)[1].lower()
+
+    if extension in BINARY_EXTENSIONS:
+        return readBinaryHeader(filePath)
+
+    if extension != '.ma':
+        return None
+
+    header = SceneHeader(filePath)
+
+    with io.open(filePath, 'rb') as inFile:
+        readStatements(inFile, header)
+
+    return header
+
+#
+## @brief Read header of given Maya Binary file.
+#
+#  File is memory mapped and payloads are accessed through `memoryview` slices, only the strings of the header chunks
+#  are copied. Chunks are converted to the MEL statements Maya ASCII files contain and added by
+#  `SceneHeader.addStatement`, so the output is the same for both formats.
+#
+#  @param filePath [ str | None | in  ] - Path of the Maya Binary file.
+#
+#  @exception N/A
+#
+#  @return mMayaCore.sceneHeaderLib.SceneHeader - Header.
+#  @return None                                 - If file is not an IFF file.
+def readBinaryHeader(filePath):
+
+    with io.open(filePath, 'rb') as inFile:
+
+        if os.fstat(inFile.fileno()).st_size < 16:
+            return None
+
+        mappedFile = mmap.mmap(inFile.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            view = _getView(mappedFile)
+
+            try:
+                tag = bytes(view[0:4])
+                if tag not in (b'FOR4', b'FOR8'):
+                    return None
+
+                header = SceneHeader(filePath)
+                header.setBytesRead(readChunks(view, 0, len(mappedFile), tag == b'FOR8', header))
+
+            finally:
+                if isinstance(view, memoryview) and hasattr(view, 'release'):
+                    view.release()
+
+        finally:
+            mappedFile.close()
+
+    return header
+
+#
+## @brief Walk IFF chunks in given range and add the header chunks to given header.
+#
+#  Groups of the header (HEAD, FREF) are walked into, walking stops at the first group of another form type since
+#  node data starts there. Headers of 32 bit chunks (FOR4) contain 4 bytes tag and 4 bytes size, headers of 64 bit
+#  chunks (FOR8) contain 4 bytes tag, 4 bytes padding and 8 bytes size. Chunks are aligned to 4 and 8 bytes.
+#
+#  @param view   [ memoryview  | None | in  ] - Content of the file.
+#  @param start  [ int         | None | in  ] - Offset of the first chunk.
+#  @param end    [ int         | None | in  ] - End offset of the chunks.
+#  @param is64   [ bool        | None | in  ] - Whether the chunks are 64 bit chunks.
+#  @param header [ SceneHeader | None | in  ] - Header.
+#
+#  @exception N/A
+#
+#  @return int - Offset walking is stopped at.
+def readChunks(view, start, end, is64, header):
+
+    headerSize  = 16 if is64 else 8
+    alignment   = 8 if is64 else 4
+    offset      = start
+
+    while offset + headerSize <= end:
+
+        tag = bytes(view[offset:offset + 4])
+
+        if is64:
+            size = struct.unpack_from('>Q', view, offset + 8)[0]
+        else:
+            size = struct.unpack_from('>I', view, offset + 4)[0]
+
+        dataStart = offset + headerSize
+        dataEnd   = dataStart + size
+
+        if dataEnd > end:
+            break
+
+        if tag in IFF_GROUP_TAGS:
+
+            formType = bytes(view[dataStart:dataStart + 4])
+
+            if offset != 0 and formType not in IFF_HEADER_GROUPS:
+                return offset
+
+            stoppedAt = readChunks(view, dataStart + alignment, dataEnd, is64, header)
+            if stoppedAt < dataEnd:
+                return stoppedAt
+
+        else:
+            payload = view[dataStart:dataEnd]
+
+            if tag == b'VERS':
+                header.setVersion(''.join(getChunkStrings(payload)[:1]) or None)
+
+            header.addStatement(getChunkStatement(tag, payload))
+
+        offset = (dataEnd + alignment - 1) // alignment * alignment
+
+    return min(offset, end)
+
+#
+## @brief Convert given header chunk to the tokens of the equivalent MEL statement.
+#
+#  VERS chunk contains the version, PLUG chunks contain name and version of a plug-in, FINF chunks contain name and
+#  value of a file info, FREF chunks contain the arguments of a `file` statement. Other chunks are ignored.
+#
+#  @param tag     [ bytes      | None | in  ] - Tag of the chunk.
+#  @param payload [ memoryview | None | in  ] - Payload of the chunk.
+#
+#  @exception N/A
+#
+#  @return list of tuple - Tokens @see tokenize, empty list if the chunk has no equivalent statement.
+def getChunkStatement(tag, payload):
+
+    if tag == b'VERS':
+        return [('requires', False), ('maya', True)] + [(x, True) for x in getChunkStrings(payload)[:1]]
+
+    if tag == b'PLUG':
+        return [('requires', False)] + [(x, True) for x in getChunkStrings(payload)[:2]]
+
+    if tag == b'FINF':
+        return [('fileInfo', False)] + [(x, True) for x in getChunkStrings(payload)[:2]]
+
+    if tag in IFF_UNIT_CHUNKS:
+        return [('currentUnit', False), (IFF_UNIT_CHUNKS[tag], False)] + [(x, True) for x in getChunkStrings(payload)[:1]]
+
+    if tag == b'FREF':
+        return getFileStatementTokens(getChunkStrings(payload))
+
+    return []
+
+#
+## @brief Get null terminated strings of given chunk payload.
+#
+#  @param payload [ memoryview | None | in  ] - Payload of the chunk.
+#
+#  @exception N/A
+#
+#  @return list of str - Strings.
+def getChunkStrings(payload):
+
+    return [x.decode(ENCODING, 'replace') for x in bytes(payload).split(b'\0') if x]
+
+#
+## @brief Get tokens of the `file` statement from given arguments.
+#
+#  Arguments starting with a dash are flags, the first argument which is neither a flag nor the argument of a flag is
+#  the file path. Reference flag is added if neither `-r` nor `-rdi` flag exists.
+#
+#  @param arguments [ list of str | None | in  ] - Arguments.
+#
+#  @exception N/A
+#
+#  @return list of tuple - Tokens @see tokenize.
+#  @return list          - Empty list if there is no file path.
+def getFileStatementTokens(arguments):
+
+    tokens              = [(x, not x.startswith('-') or x[1:2].isdigit()) for x in arguments]
+    flags, filePaths    = parseFlags(tokens, booleanFlags=FILE_BOOLEAN_FLAGS)
+
+    if not filePaths:
+        return []
+
+    filePath = filePaths[0]
+    tokens.remove((filePath, True))
+
+    if not [x for x in flags if x in ('-r', '-reference', '-rdi', '-referenceDepthInfo')]:
+        tokens.insert(0, ('-r', False))
+
+    return [('file', False)] + tokens + [(filePath, True)]
+
+#
+## @brief Get a view of given memory mapped file.
+#
+#  Python 2 mmap doesn't support memoryview, slices of the mmap object itself are used in that case.
+#
+#  @param mappedFile [ mmap.mmap | None | in  ] - Memory mapped file.
+#
+#  @exception N/A
+#
+#  @return memoryview - View.
+#  @return mmap.mmap  - Given mmap object if memoryview is not supported.
+def _getView(mappedFile):
+
+    try:
+        return memoryview(mappedFile)
+    except TypeError:
+        return mappedFile
+
+#
+## @brief Read MEL statements from given file object and add them to given header until the end of the header.
+#
+#  @param inFile [ file       | None | in  ] - File object opened in binary mode.
+#  @param header [ SceneHeader | None | in  ] - Header.
+#
+#  @exception N/A
+#
+#  @return int - Number of bytes read.
+def readStatements(inFile, header):
+
+    buffer    = b''
+    position  = 0
+    bytesRead = 0
+    isEOF     = False
+    isFirst   = True
+
+    while True:
+
+        # Skip whitespace and comments
+        length   = len(buffer)
+        needMore = False
+
+        while position < length:
+
+            character = buffer[position:position + 1]
+
+            if character.isspace():
+                position += 1
+                continue
+
+            if buffer.startswith(b'//', position):
+
+                end = buffer.find(b'\n', position)
+                if end == -1 and not isEOF:
+                    needMore = True
+                    break
+
+                if isFirst:
+                    match = _VERSION_PATTERN.match(buffer, position)
+                    if match:
+                        header.setVersion(match.group(1).decode(ENCODING, 'replace'))
+                    isFirst = False
+
+                position = length if end == -1 else end + 1
+                continue
+
+            break
+
+        match = None
+        if position < length and not needMore:
+            match = _STATEMENT_PATTERN.match(buffer, position)
+
+        if match:
+
+            isFirst  = False
+            position = match.end()
+
+            if not header.addStatement(tokenize(match.group(0)[:-1].decode(ENCODING, 'replace'))):
+                break
+
+            continue
+
+        if isEOF:
+            break
+
+        chunk = inFile.read(CHUNK_SIZE)
+        if not chunk:
+            isEOF = True
+
+        bytesRead += len(chunk)
+        buffer     = buffer[position:] + chunk
+        position   = 0
+
+    header.setBytesRead(bytesRead)
+
+    return bytesRead
+
+#
+## @brief Split given MEL statement into tokens.
+#
+#  @param statement [ str | None | in  ] - MEL statement without the semicolon.
+#
+#  @exception N/A
+#
+#  @return list of tuple - Each tuple contains the value and whether it is a quoted string.
+def tokenize(statement):
+
+    tokens = []
+
+    for quoted, word in _TOKEN_PATTERN.findall(statement):
+
+        if word:
+            tokens.append((word, False))
+        else:
+            tokens.append((unescape(quoted), True))
+
+    return tokens
+
+#
+## @brief Replace escape sequences of given MEL string.
+#
+#  @param value [ str | None | in  ] - Content of a double quoted string.
+#
+#  @exception N/A
+#
+#  @return str - Value.
+def unescape(value):
+
+    if '\\' not in value:
+        return value
+
+    characters = []
+    index      = 0
+    length     = len(value)
+
+    while index < length:
+
+        character = value[index]
+
+        if character == '\\' and index + 1 < length:
+            characters.append(_ESCAPES.get(value[index + 1], value[index + 1]))
+            index += 2
+            continue
+
+        characters.append(character)
+        index += 1
+
+    return ''.join(characters)
+
+#
+## @brief Parse flags of given tokens, a flag takes the next token as its argument unless it is a flag too.
+#
+#  @param tokens       [ list of tuple | None | in  ] - Tokens @see tokenize.
+#  @param booleanFlags [ tuple of str  | ()   | in  ] - Flags which don't take an argument.
+#
+#  @exception N/A
+#
+#  @return collections.OrderedDict - Keys are flags, values are arguments, lists of arguments if a flag is repeated, True for boolean flags.
+#  @return list of str             - Values of the tokens which are not flags or arguments.
+def parseFlags(tokens, booleanFlags=()):
+
+    flags     = OrderedDict()
+    arguments = []
+    index     = 0
+    count     = len(tokens)
+
+    while index < count:
+
+        value, quoted = tokens[index]
+        index += 1
+
+        if quoted or not value.startswith('-') or value[1:2].isdigit():
+            arguments.append(value)
+            continue
+
+        argument = True
+        if value not in booleanFlags and index < count and (tokens[index][1] or not tokens[index][0].startswith('-')):
+            argument = tokens[index][0]
+            index += 1
+
+        if value in flags:
+            if not isinstance(flags[value], list):
+                flags[value] = [flags[value]]
+            flags[value].append(argument)
+        else:
+            flags[value] = argument
+
+    return flags, arguments
+
+#
+## @brief Parse given `file` statement.
+#
+#  @param tokens [ list of tuple | None | in  ] - Tokens of the statement @see tokenize.
+#
+#  @exception N/A
+#
+#  @return dict - Keys are: filePath, nameSpace, referenceNode, fileType, options, depth, parent, deferred, flags, isDeclaration.
+#  @return None - If the statement is not a reference statement.
+def parseFileStatement(tokens):
+
+    if len(tokens) < 2 or not tokens[-1][1]:
+        return None
+
+    flags, _ = parseFlags(tokens[1:-1], booleanFlags=FILE_BOOLEAN_FLAGS)
+
+    isDeclaration = '-rdi' in flags or '-referenceDepthInfo' in flags
+    if not isDeclaration and '-r' not in flags and '-reference' not in flags:
+        return None
+
+    depth = flags.get('-rdi', flags.get('-referenceDepthInfo', 1))
+
+    return {'filePath'      : tokens[-1][0],
+            'nameSpace'     : flags.get('-ns', flags.get('-namespace')),
+            'referenceNode' : flags.get('-rfn', flags.get('-referenceNode')),
+            'fileType'      : flags.get('-typ', flags.get('-type')),
+            'options'       : flags.get('-op', flags.get('-options')),
+            'depth'         : int(depth) if str(depth).isdigit() else 1,
+            'parent'        : None,
+            'deferred'      : str(flags.get('-dr', flags.get('-deferReference', 0))) == '1',
+            'flags'         : dict(flags),
+            'isDeclaration' : isDeclaration}
+
+#
+## @brief Parse given `requires` statement.
+#
+#  @param tokens [ list of tuple | None | in  ] - Tokens of the statement @see tokenize.
+#
+#  @exception N/A
+#
+#  @return dict - Keys are: plugin, version, nodeTypes, dataTypes.
+def parseRequiresStatement(tokens):
+
+    flags, arguments = parseFlags(tokens[1:])
+
+    def getList(*names):
+        values = []
+        for name in names:
+            value = flags.get(name, [])
+            values.extend(value if isinstance(value, list) else [value])
+        return values
+
+    return {'plugin'    : arguments[0] if arguments else None,
+            'version'   : arguments[1] if len(arguments) > 1 else None,
+            'nodeTypes' : getList('-nodeType', '-nt'),
+            'dataTypes' : getList('-dataType', '-dt')}
@@ -0,0 +1,794 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMayaGUI/applicationManifestLib.py @brief [ FILE ] - Persistent manifest of application info classes.
+## @package mMayaGUI.applicationManifestLib    @brief [ FILE ] - Persistent manifest of application info classes.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  re
+import  sys
+import  json
+import  inspect
+import  tempfile
+import  importlib
+
+import  mMayaGUI.iconLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Environment variable which can be used to override the location of the manifest file.
+MANIFEST_FILE_ENVIRONMENT_VARIABLE  = 'MMAYACORE_APPLICATION_MANIFEST'
+
+## [ str ] - Default location of the manifest file.
+DEFAULT_MANIFEST_FILE               = os.path.join(os.path.expanduser('~'), '.mMayaCore', 'applicationManifest.json')
+
+## [ int ] - Version of the manifest file format, manifest files with a different version are ignored.
+MANIFEST_VERSION                    = 3
+
+## [ str ] - Suffix of the application info module files.
+APPLICATION_MODULE_SUFFIX           = 'App.py'
+
+## [ _sre.SRE_Pattern ] - Names of the directories which can be imported as packages.
+_PACKAGE_NAME_PATTERN               = re.compile(r'^[A-Za-z_]\w*$')
+
+
+#
+## @brief [ CLASS ] - Class provides cached information of an application info class without importing it.
+#
+#  Instances provide the same query methods of mApplication.applicationInfoAbs.ApplicationInfo which are
+#  needed to create menus and search applications.
+class ApplicationRecord(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param data [ dict | None | in  ] - Data of the application, @see toDict method.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, data):
+
+        ## [ dict ] - Data of the application.
+        self._data                  = data
+
+        ## [ list ] - Parent applications resolved from the data, @see parentApplications method.
+        self._parentApplications    = None
+
+    #
+    ## @brief String representation.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Representation.
+    def __repr__(self):
+
+        return '<{}.{} {}>'.format(self.__class__.__module__, self.__class__.__name__, self.name())
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Name of the application.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Name.
+    def name(self):
+
+        return self._data.get('name')
+
+    #
+    ## @brief Description of the application.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Description.
+    def description(self):
+
+        return self._data.get('description')
+
+    #
+    ## @brief Keywords of the application.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Keywords.
+    def keywords(self):
+
+        return self._data.get('keywords') or []
+
+    #
+    ## @brief Full menu path of the application.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Menu path.
+    def fullMenuPath(self):
+
+        return self._data.get('fullMenuPath')
+
+    #
+    ## @brief Python command to run the application.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Command.
+    def pythonCommand(self):
+
+        return self._data.get('pythonCommand')
+
+    #
+    ## @brief Name of the icon file of the application.
+    #
+    #  @exception N/A
+    #
+    #  @return str - File name.
+    def iconFileName(self):
+
+        return self._data.get('iconFileName')
+
+    #
+    ## @brief Absolute path of the icon file of the application.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Absolute path.
+    def getIconFileAbsolutePath(self):
+
+        return self._data.get('iconFileAbsolutePath')
+
+    #
+    ## @brief Whether a separator is added before the menu item of the application.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def menuSeparatorBefore(self):
+
+        return self._data.get('menuSeparatorBefore', False)
+
+    #
+    ## @brief Parent applications which this application designed to work in.
+    #
+    #  Constants of mApplication.parentApplicationLib.Application are stored by their names and resolved back to
+    #  the constants, so they can be compared with them as the parent applications of the application info classes.
+    #
+    #  @exception N/A
+    #
+    #  @return list - Parent applications @see mApplication.parentApplicationLib.Application
+    def parentApplications(self):
+
+        if self._parentApplications is None:
+
+            import mApplication.parentApplicationLib
+
+            self._parentApplications = []
+
+            for parentApplication in self._data.get('parentApplications') or []:
+
+                if 'name' in parentApplication:
+                    value = getattr(mApplication.parentApplicationLib.Application, parentApplication['name'], None)
+                    if value is not None:
+                        self._parentApplications.append(value)
+                    continue
+
+                self._parentApplications.append(parentApplication.get('value'))
+
+        return list(self._parentApplications)
+
+    #
+    ## @brief Name of the module the application info class is defined in.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Module name.
+    def moduleName(self):
+
+        return self._data.get('moduleName')
+
+    #
+    ## @brief Name of the application info class.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Class name.
+    def className(self):
+
+        return self._data.get('className')
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Data of the application.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Data.
+    def toDict(self):
+
+        return dict(self._data)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # STATIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Create a record from given application info instance.
+    #
+    #  @param application [ mApplication.applicationInfoAbs.ApplicationInfo | None | in  ] - Application.
+    #
+    #  @exception N/A
+    #
+    #  @return mMayaGUI.applicationManifestLib.ApplicationRecord - Record.
+    @staticmethod
+    def fromApplication(application):
+
+        import mApplication.parentApplicationLib
+
+        constants = {}
+        for name in dir(mApplication.parentApplicationLib.Application):
+            if not name.startswith('_'):
+                constants.setdefault(_getConstantKey(getattr(mApplication.parentApplicationLib.Application, name)), name)
+
+        parentApplications = []
+        for parentApplication in application.parentApplications() or []:
+
+            name = constants.get(_getConstantKey(parentApplication))
+            if name:
+                parentApplications.append({'name': name})
+            elif parentApplication is None or isinstance(parentApplication, (bool, int, float, str)):
+                parentApplications.append({'value': parentApplication})
+            else:
+                sys.stderr.write('Parent application can not be stored in the manifest: {} - {!r}\n'.format(application.name(),
+                                                                                                          parentApplication))
+
+        data = {'name'                  : application.name(),
+                'description'           : application.description(),
+                'keywords'              : list(application.keywords() or []),
+                'fullMenuPath'          : application.fullMenuPath(),
+                'pythonCommand'         : application.pythonCommand(),
+                'iconFileName'          : getattr(application, '_iconFileName', None),
+                'iconFileAbsolutePath'  : mMayaGUI.iconLib.getIconIndex().getIconFileAbsolutePath(application),
+                'menuSeparatorBefore'   : bool(application.menuSeparatorBefore()),
+                'parentApplications'    : parentApplications,
+                'moduleName'            : application.__class__.__module__,
+                'className'             : application.__class__.__name__}
+
+        return ApplicationRecord(data)
+
+#
+## @brief [ CLASS ] - Class provides an on-disk manifest of the application info classes available in PYTHONPATH.
+#
+#  Manifest is keyed by the path, modification time and size of each application info module (`*App.py`) and
+#  of the modules it depends on, which are the modules it imports and the modules its classes derive from.
+#  Only the modules which are new or changed, or whose dependencies changed, since the manifest was written
+#  get imported, applications of the unchanged modules are served from the manifest.
+#
+#  Modification times of the PYTHONPATH entries and the packages in them are stored as well, so the application
+#  info modules are only searched again when a file is added to or removed from these directories.
+#
+#  @code
+#import mMayaGUI.applicationManifestLib
+#
+#manifest = mMayaGUI.applicationManifestLib.ApplicationManifest()
+#
+#for record in manifest.list():
+#    sys.stdout.write(record.fullMenuPath())
+#
+#sys.stdout.write(manifest.stats())
+# # {'modules': 2, 'cachedModules': 2, 'importedModules': 0, 'removedModules': 0, 'applications': 6, 'searched': False}
+#  @endcode
+class ApplicationManifest(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param filePath [ str | None | in  ] - Path of the manifest file, default location is used if None given.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, filePath=None):
+
+        if not filePath:
+            filePath = os.environ.get(MANIFEST_FILE_ENVIRONMENT_VARIABLE) or DEFAULT_MANIFEST_FILE
+
+        ## [ str ] - Path of the manifest file.
+        self._filePath  = filePath
+
+        ## [ dict ] - Module entries, keys are module file paths.
+        self._modules       = {}
+
+        ## [ list of str ] - PYTHONPATH entries the application info modules are searched in.
+        self._pythonPaths   = []
+
+        ## [ dict ] - Modification times of the searched directories, keys are directory paths.
+        self._directories   = {}
+
+        ## [ list of list ] - Absolute path and name of each application info module found in the searched directories.
+        self._moduleFiles   = []
+
+        ## [ bool ] - Whether the manifest has changes which are not written.
+        self._isDirty       = False
+
+        ## [ dict ] - Statistics of the last list call.
+        self._stats         = {}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Path of the manifest file.
+    #
+    #  @exception N/A
+    #
+    #  @return str - File path.
+    def filePath(self):
+
+        return self._filePath
+
+    #
+    ## @brief Statistics of the last list call.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: modules, cachedModules, importedModules, removedModules, applications, searched.
+    def stats(self):
+
+        return dict(self._stats)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Load the manifest file.
+    #
+    #  Missing, corrupted or outdated manifest files are ignored.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def load(self):
+
+        self._modules       = {}
+        self._pythonPaths   = []
+        self._directories   = {}
+        self._moduleFiles   = []
+
+        if not os.path.isfile(self._filePath):
+            return False
+
+        try:
+            with open(self._filePath, 'r') as manifestFile:
+                data = json.load(manifestFile)
+        except (IOError, OSError, ValueError):
+            return False
+
+        if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+            return False
+
+        self._modules       = data.get('modules') or {}
+        self._pythonPaths   = data.get('pythonPaths') or []
+        self._directories   = data.get('directories') or {}
+        self._moduleFiles   = data.get('moduleFiles') or []
+
+        return True
+
+    #
+    ## @brief Write the manifest file.
+    #
+    #  File is written to a temporary file first and then moved, so concurrent Maya sessions never read
+    #  a partially written manifest.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def save(self):
+
+        directory = os.path.dirname(self._filePath)
+
+        try:
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            fileDescriptor, temporaryFile = tempfile.mkstemp(prefix='.applicationManifest', dir=directory or None)
+            with os.fdopen(fileDescriptor, 'w') as manifestFile:
+                json.dump({'version'        : MANIFEST_VERSION,
+                           'pythonPaths'    : self._pythonPaths,
+                           'directories'    : self._directories,
+                           'moduleFiles'    : self._moduleFiles,
+                           'modules'        : self._modules}, manifestFile, indent=1, sort_keys=True)
+
+            if os.name == 'nt' and os.path.isfile(self._filePath):
+                os.remove(self._filePath)
+
+            os.rename(temporaryFile, self._filePath)
+
+        except (IOError, OSError) as error:
+            sys.stderr.write('Application manifest could not be written: {}\n'.format(error))
+            return False
+
+        self._isDirty = False
+
+        return True
+
+    #
+    ## @brief List applications available in PYTHONPATH.
+    #
+    #  Manifest file is loaded, refreshed for the new, changed and removed modules and written back if anything
+    #  has changed. Application info modules are searched again only if PYTHONPATH or the modification time of
+    #  a searched directory has changed, otherwise the modules found in the previous search are used.
+    #
+    #  @param save [ bool | True | in  ] - Write the manifest file if it has changed.
+    #
+    #  @exception N/A
+    #
+    #  @return list of mMayaGUI.applicationManifestLib.ApplicationRecord - Applications.
+    def list(self, save=True):
+
+        if not self._modules and not self._moduleFiles:
+            self.load()
+
+        modules         = {}
+        stamps          = {}
+        cachedCount     = 0
+        importedCount   = 0
+        pythonPaths     = getPythonPaths()
+        searched        = False
+
+        if pythonPaths != self._pythonPaths or not self._directories or \
+           any(_getDirectoryStamp(x) != y for x, y in self._directories.items()):
+
+            directories         = {}
+            self._moduleFiles   = [list(x) for x in findApplicationModules(pythonPaths, directories=directories)]
+            self._pythonPaths   = pythonPaths
+            self._directories   = directories
+            self._isDirty       = True
+            searched            = True
+
+        for moduleFile, moduleName in self._moduleFiles:
+
+            stamp = _getFileStamp(moduleFile, stamps)
+            if stamp is None:
+                continue
+
+            entry = self._modules.get(moduleFile)
+
+            if entry and entry.get('moduleName') == moduleName and [entry.get('mtime'), entry.get('size')] == stamp and \
+               all(_getFileStamp(x, stamps) == y for x, y in (entry.get('dependencies') or {}).items()):
+                modules[moduleFile] = entry
+                cachedCount += 1
+                continue
+
+            importedCount += 1
+            self._isDirty  = True
+
+            records = getModuleApplications(moduleName)
+            if records is None:
+                # Module is not cached, so it gets imported again in the next session
+                continue
+
+            dependencies = {}
+            for dependencyFile in getModuleDependencies(sys.modules[moduleName]):
+                dependencyStamp = _getFileStamp(dependencyFile, stamps)
+                if dependencyStamp is not None:
+                    dependencies[dependencyFile] = dependencyStamp
+
+            modules[moduleFile] = {'mtime'          : stamp[0],
+                                   'size'           : stamp[1],
+                                   'moduleName'     : moduleName,
+                                   'dependencies'   : dependencies,
+                                   'applications'   : [x.toDict() for x in records]}
+
+        removedCount = len(set(self._modules) - set(modules))
+        if removedCount:
+            self._isDirty = True
+
+        self._modules = modules
+
+        if save and self._isDirty:
+            self.save()
+
+        applicationList = []
+        for moduleFile in sorted(self._modules):
+            applicationList.extend([ApplicationRecord(x) for x in self._modules[moduleFile]['applications']])
+
+        self._stats = {'modules'            : len(self._modules),
+                       'cachedModules'      : cachedCount,
+                       'importedModules'    : importedCount,
+                       'removedModules'     : removedCount,
+                       'applications'       : len(applicationList),
+                       'searched'           : searched}
+
+        return applicationList
+
+    #
+    ## @brief Remove the manifest file and clear the entries.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def clear(self):
+
+        self._modules       = {}
+        self._pythonPaths   = []
+        self._directories   = {}
+        self._moduleFiles   = []
+
+        if os.path.isfile(self._filePath):
+            os.remove(self._filePath)
+
+#
+## @brief Get absolute paths of the PYTHONPATH entries.
+#
+#  @exception N/A
+#
+#  @return list of str - Paths, in the order they are given without duplicates.
+def getPythonPaths():
+
+    pythonPaths = []
+
+    for pythonPath in os.environ.get('PYTHONPATH', '').split(os.pathsep):
+
+        pythonPath = os.path.abspath(pythonPath) if pythonPath else None
+        if pythonPath and pythonPath not in pythonPaths:
+            pythonPaths.append(pythonPath)
+
+    return pythonPaths
+
+#
+## @brief Find application info modules available in PYTHONPATH.
+#
+#  Modules which end with `App.py` in the python packages of each PYTHONPATH entry are found. Sub packages are not
+#  searched. A module name is found once, in the first PYTHONPATH entry it exists in, which is the module gets
+#  imported.
+#
+#  @param paths       [ list of str | None | in  ] - Paths to search in, PYTHONPATH entries are used if None given.
+#  @param directories [ dict        | None | out ] - Modification times of the searched directories are set in given
+#                                                    dict, keys are directory paths, @see ApplicationManifest.list.
+#
+#  @exception N/A
+#
+#  @return list of tuple - Each tuple contains absolute path and name of a module.
+def findApplicationModules(paths=None, directories=None):
+
+    modules     = []
+    moduleNames = set()
+    visited     = set()
+
+    if directories is None:
+        directories = {}
+
+    for pythonPath in getPythonPaths() if paths is None else paths:
+
+        pythonPath = os.path.abspath(pythonPath) if pythonPath else None
+        if not pythonPath or pythonPath in visited:
+            continue
+
+        visited.add(pythonPath)
+
+        directories[pythonPath] = _getDirectoryStamp(pythonPath)
+
+        try:
+            packageNames = sorted(os.listdir(pythonPath))
+        except OSError:
+            continue
+
+        for packageName in packageNames:
+
+            packagePath = os.path.join(pythonPath, packageName)
+            if not _PACKAGE_NAME_PATTERN.match(packageName) or not os.path.isdir(packagePath):
+                continue
+
+            # Directories which are not packages are stored too, adding an __init__.py to them changes their time
+            directories[packagePath] = _getDirectoryStamp(packagePath)
+
+            if not os.path.isfile(os.path.join(packagePath, '__init__.py')):
+                continue
+
+            try:
+                fileNames = sorted(os.listdir(packagePath))
+            except OSError:
+                continue
+
+            for fileName in fileNames:
+
+                if not fileName.endswith(APPLICATION_MODULE_SUFFIX):
+                    continue
+
+                moduleName = '{}.{}'.format(packageName, fileName[:-3])
+                if moduleName in moduleNames:
+                    continue
+
+                moduleNames.add(moduleName)
+                modules.append((os.path.join(packagePath, fileName), moduleName))
+
+    return modules
+
+#
+## @brief Get source files of the modules given module depends on.
+#
+#  Dependencies are the modules imported by given module and the modules its classes and functions are defined in.
+#
+#  @param module [ module | None | in  ] - Module.
+#
+#  @exception N/A
+#
+#  @return list of str - Absolute paths of the source files.
+def getModuleDependencies(module):
+
+    dependencies = set()
+
+    for _, member in inspect.getmembers(module):
+
+        if inspect.ismodule(member):
+            dependencies.add(member)
+        elif inspect.isclass(member):
+            for cls in inspect.getmro(member):
+                dependencies.add(sys.modules.get(cls.__module__))
+        elif inspect.isfunction(member):
+            dependencies.add(sys.modules.get(member.__module__))
+
+    files = set()
+
+    for dependency in dependencies:
+
+        filePath = getattr(dependency, '__file__', None)
+        if not filePath or dependency is module:
+            continue
+
+        filePath = os.path.abspath(filePath)
+        if filePath.endswith(('.pyc', '.pyo')) and os.path.isfile(filePath[:-1]):
+            filePath = filePath[:-1]
+
+        files.add(filePath)
+
+    return sorted(files)
+
+#
+## @brief Import given application info module and get records of the application info classes defined in it.
+#
+#  Module gets reloaded if it has been imported already, since it is only imported when it has changed.
+#
+#  @param moduleName [ str | None | in  ] - Name of the module.
+#
+#  @exception N/A
+#
+#  @return list of mMayaGUI.applicationManifestLib.ApplicationRecord - Applications.
+def getModuleApplications(moduleName):
+
+    import mApplication.applicationInfoAbs
+
+    try:
+        if moduleName in sys.modules:
+            module = _reload(sys.modules[moduleName])
+        else:
+            module = importlib.import_module(moduleName)
+    except Exception as error:
+        sys.stderr.write('Application module could not be imported: {} - {}\n'.format(moduleName, error))
+        return None
+
+    classes = []
+    for _, cls in inspect.getmembers(module, inspect.isclass):
+        if cls.__module__ == module.__name__ and issubclass(cls, mApplication.applicationInfoAbs.ApplicationInfo):
+            classes.append(cls)
+
+    # Keep the order the classes are defined in the module
+    classes.sort(key=lambda x: getattr(x.__init__, '__code__', None) and x.__init__.__code__.co_firstlineno or 0)
+
+    records = []
+    for cls in classes:
+        try:
+            records.append(ApplicationRecord.fromApplication(cls()))
+        except Exception as error:
+            sys.stderr.write('Application info could not be created: {}.{} - {}\n'.format(moduleName, cls.__name__, error))
+
+    return records
+
+#
+## @brief Get modification time and size of given file.
+#
+#  @param filePath [ str  | None | in  ] - Path of the file.
+#  @param stamps   [ dict | None | in  ] - Stamps of the files which are already checked, keys are file paths.
+#
+#  @exception N/A
+#
+#  @return list - Modification time and size.
+#  @return None - If file doesn't exist.
+def _getFileStamp(filePath, stamps):
+
+    if filePath not in stamps:
+
+        try:
+            stat = os.stat(filePath)
+            stamps[filePath] = [stat.st_mtime, stat.st_size]
+        except OSError:
+            stamps[filePath] = None
+
+    return stamps[filePath]
+
+#
+## @brief Get modification time of given directory.
+#
+#  @param directory [ str | None | in  ] - Path of the directory.
+#
+#  @exception N/A
+#
+#  @return float - Modification time.
+#  @return None - If directory doesn't exist.
+def _getDirectoryStamp(directory):
+
+    try:
+        return os.stat(directory).st_mtime
+    except OSError:
+        return None
+
+#
+## @brief Get a key which given parent application constant can be looked up with.
+#
+#  Constants may not be hashable, in which case their representation is used.
+#
+#  @param value [ object | None | in  ] - Constant.
+#
+#  @exception N/A
+#
+#  @return object - Key.
+def _getConstantKey(value):
+
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+
+    return value
+
+#
+## @brief Reload given module.
+#
+#  @param module [ module | None | in  ] - Module.
+#
+#  @exception N/A
+#
+#  @return module - Reloaded module.
+def _reload(module):
+
+    if hasattr(importlib, 'reload'):
+        return importlib.reload(module)
+
+    return reload(module)
@@ -0,0 +1,412 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMayaGUI/applicationSearchLib.py @brief [ FILE ] - Search and launch applications.
+## @package mMayaGUI.applicationSearchLib    @brief [ FILE ] - Search and launch applications.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  re
+import  bisect
+
+from    maya import cmds
+from    maya import OpenMaya
+
+import  mMayaGUI.applicationManifestLib
+import  mMayaGUI.commandLib
+import  mMayaGUI.menuLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ dict ] - Weights of the fields of applications, matches in the fields with higher weights rank higher.
+FIELD_WEIGHTS           = {'name'           : 3.0,
+                           'keywords'       : 2.0,
+                           'menuPath'       : 1.0,
+                           'description'    : 1.0}
+
+## [ float ] - Score multiplier of prefix matches, exact matches have multiplier of 1.0.
+PREFIX_MATCH_FACTOR     = 0.7
+
+## [ float ] - Score multiplier of fuzzy matches, it is multiplied by similarity of the tokens as well.
+FUZZY_MATCH_FACTOR      = 0.4
+
+## [ float ] - Minimum trigram similarity of the tokens for fuzzy matches.
+FUZZY_MATCH_THRESHOLD   = 0.4
+
+## [ str ] - Name of the launcher window.
+LAUNCHER_WINDOW_NAME    = 'Meco_ApplicationLauncher'
+
+## [ re.Pattern ] - Pattern to split texts into tokens, camel case words are split as well.
+_TOKEN_PATTERN          = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+
+## [ mMayaGUI.applicationSearchLib.ApplicationSearchIndex ] - Search index of the session.
+_searchIndex            = None
+
+
+#
+## @brief [ CLASS ] - Class provides an in-memory inverted index over names, keywords, menu paths and descriptions of applications.
+#
+#  Query terms are matched to the indexed tokens exactly, by prefix and fuzzily (trigram similarity) and
+#  applications which match all terms are returned ranked by their scores.
+#
+#  @code
+#import mMayaGUI.applicationSearchLib
+#
+#searchIndex = mMayaGUI.applicationSearchLib.getApplicationSearchIndex()
+#
+#for application in searchIndex.search('dup ref'):
+#    sys.stdout.write(application.name())
+# # Duplicate Selected Nodes
+#  @endcode
+class ApplicationSearchIndex(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param applications [ list of mApplication.applicationInfoAbs.ApplicationInfo | None | in  ] - Applications to index.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, applications=None):
+
+        ## [ list of mApplication.applicationInfoAbs.ApplicationInfo ] - Indexed applications, ids are indices of this list.
+        self._applications  = []
+
+        ## [ dict ] - Postings, keys are tokens, values are dicts of application ids and field weights.
+        self._postings      = {}
+
+        ## [ list of str ] - Sorted tokens for prefix matching.
+        self._tokens        = []
+
+        ## [ dict ] - Trigrams, keys are trigrams, values are lists of tokens which contain them.
+        self._trigrams      = {}
+
+        ## [ dict ] - Number of trigrams of the tokens, keys are tokens.
+        self._trigramCounts = {}
+
+        if applications:
+            self.build(applications)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Indexed applications.
+    #
+    #  @exception N/A
+    #
+    #  @return list of mApplication.applicationInfoAbs.ApplicationInfo - Applications.
+    def applications(self):
+
+        return list(self._applications)
+
+    #
+    ## @brief Number of indexed tokens.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of tokens.
+    def tokenCount(self):
+
+        return len(self._tokens)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Build the index for given applications.
+    #
+    #  @param applications [ list of mApplication.applicationInfoAbs.ApplicationInfo | None | in  ] - Applications.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def build(self, applications):
+
+        self._applications  = list(applications)
+        self._postings      = {}
+        self._trigrams      = {}
+        self._trigramCounts = {}
+
+        for applicationId, application in enumerate(self._applications):
+
+            fields = {'name'        : application.name() or '',
+                      'keywords'    : ' '.join(application.keywords() or []),
+                      'menuPath'    : application.fullMenuPath() or '',
+                      'description' : application.description() or ''}
+
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    posting = self._postings.setdefault(token, {})
+                    if posting.get(applicationId, 0.0) < weight:
+                        posting[applicationId] = weight
+
+        self._tokens = sorted(self._postings)
+
+        for token in self._tokens:
+            trigrams = getTrigrams(token)
+            self._trigramCounts[token] = len(trigrams)
+            for trigram in trigrams:
+                self._trigrams.setdefault(trigram, []).append(token)
+
+    #
+    ## @brief Search applications.
+    #
+    #  Each term of the query is matched to the indexed tokens, applications which match all terms are returned.
+    #  Score of an application for a term is the weight of the best matching field multiplied by match factor
+    #  (1.0 for exact, PREFIX_MATCH_FACTOR for prefix and FUZZY_MATCH_FACTOR * similarity for fuzzy matches).
+    #
+    #  @param query [ str  | None | in  ] - Query.
+    #  @param limit [ int  | 20   | in  ] - Maximum number of results, all results are returned if None given.
+    #  @param fuzzy [ bool | True | in  ] - Match terms fuzzily as well.
+    #
+    #  @exception N/A
+    #
+    #  @return list of mApplication.applicationInfoAbs.ApplicationInfo - Applications, best match first.
+    def search(self, query, limit=20, fuzzy=True):
+
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        scores = None
+
+        for term in terms:
+
+            termScores = self._matchTerm(term, fuzzy=fuzzy)
+
+            if scores is None:
+                scores = termScores
+            else:
+                scores = dict((x, scores[x] + termScores[x]) for x in scores if x in termScores)
+
+            if not scores:
+                return []
+
+        ranked = sorted(scores, key=lambda x: (-scores[x], self._applications[x].name() or ''))
+        if limit:
+            ranked = ranked[:limit]
+
+        return [self._applications[x] for x in ranked]
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Match given term to the tokens.
+    #
+    #  @param term  [ str  | None | in  ] - Term.
+    #  @param fuzzy [ bool | None | in  ] - Match term fuzzily as well.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are application ids, values are scores.
+    def _matchTerm(self, term, fuzzy):
+
+        matches = {}
+
+        # Exact and prefix matches, tokens which start with the term are next to each other in sorted tokens
+        index = bisect.bisect_left(self._tokens, term)
+        while index < len(self._tokens) and self._tokens[index].startswith(term):
+            token          = self._tokens[index]
+            matches[token] = 1.0 if token == term else PREFIX_MATCH_FACTOR
+            index         += 1
+
+        if fuzzy:
+            for token, similarity in self._fuzzyTokens(term).items():
+                if token not in matches:
+                    matches[token] = FUZZY_MATCH_FACTOR * similarity
+
+        scores = {}
+        for token, factor in matches.items():
+            for applicationId, weight in self._postings[token].items():
+                score = weight * factor
+                if scores.get(applicationId, 0.0) < score:
+                    scores[applicationId] = score
+
+        return scores
+
+    #
+    ## @brief Find tokens similar to given term by trigram similarity.
+    #
+    #  @param term [ str | None | in  ] - Term.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are tokens, values are similarities between 0.0 and 1.0.
+    def _fuzzyTokens(self, term):
+
+        termTrigrams = getTrigrams(term)
+        counts       = {}
+
+        for trigram in termTrigrams:
+            for token in self._trigrams.get(trigram, ()):
+                counts[token] = counts.get(token, 0) + 1
+
+        tokens = {}
+        for token, count in counts.items():
+            similarity = float(count) / (len(termTrigrams) + self._trigramCounts[token] - count)
+            if similarity >= FUZZY_MATCH_THRESHOLD:
+                tokens[token] = similarity
+
+        return tokens
+
+#
+## @brief Split given text into lower case tokens.
+#
+#  @param text [ str | None | in  ] - Text.
+#
+#  @exception N/A
+#
+#  @return list of str - Tokens.
+def tokenize(text):
+
+    return [x.lower() for x in _TOKEN_PATTERN.findall(text or '')]
+
+#
+## @brief Get trigrams of given token.
+#
+#  Token is padded with spaces, so short tokens have trigrams and the beginning of the token weighs more.
+#
+#  @param token [ str | None | in  ] - Token.
+#
+#  @exception N/A
+#
+#  @return set of str - Trigrams.
+def getTrigrams(token):
+
+    padded = '  {} '.format(token)
+
+    return set(padded[i:i + 3] for i in range(len(padded) - 2))
+
+#
+## @brief Get the search index of the session.
+#
+#  Index is built once per session from the applications of mMayaGUI.applicationManifestLib.ApplicationManifest
+#  which are meant to be used in Maya.
+#
+#  @param rebuild [ bool | False | in  ] - Build the index again.
+#
+#  @exception N/A
+#
+#  @return mMayaGUI.applicationSearchLib.ApplicationSearchIndex - Search index.
+def getApplicationSearchIndex(rebuild=False):
+
+    global _searchIndex
+
+    if _searchIndex is None or rebuild:
+        applications = mMayaGUI.applicationManifestLib.ApplicationManifest().list()
+        _searchIndex = ApplicationSearchIndex([x for x in applications if mMayaGUI.menuLib.isMayaApplication(x)])
+
+    return _searchIndex
+
+#
+## @brief Run python command of given application.
+#
+#  Command is run by the command dispatcher of the session, same as the commands of the menu items.
+#
+#  @param application [ mApplication.applicationInfoAbs.ApplicationInfo | None | in  ] - Application.
+#
+#  @exception N/A
+#
+#  @return None
+def runApplication(application):
+
+    command = application.pythonCommand()
+    if not command:
+        OpenMaya.MGlobal.displayWarning('Application has no command: {}'.format(application.name()))
+        return
+
+    mMayaGUI.commandLib.getCommandDispatcher().run(command)
+
+#
+## @brief Show the launcher window, which searches the applications as you type and runs the selected one.
+#
+#  Double click on the list or Enter key on the search field runs the selected application, which is the best
+#  match unless another one is selected.
+#
+#  @exception N/A
+#
+#  @return str - Name of the window.
+def showLauncher():
+
+    if cmds.window(LAUNCHER_WINDOW_NAME, q=1, ex=1):
+        cmds.deleteUI(LAUNCHER_WINDOW_NAME)
+
+    searchIndex = getApplicationSearchIndex()
+
+    # Applications listed in the scroll list, kept in the same order
+    listed = []
+
+    window = cmds.window(LAUNCHER_WINDOW_NAME, t='Application Launcher', wh=(400, 300))
+    form   = cmds.formLayout()
+
+    searchField = cmds.textField(pht='Search applications...')
+    resultList  = cmds.textScrollList(ams=0)
+
+    def update(*args):
+
+        del listed[:]
+        listed.extend(searchIndex.search(cmds.textField(searchField, q=1, tx=1)))
+
+        cmds.textScrollList(resultList, e=1, ra=1)
+        for application in listed:
+            cmds.textScrollList(resultList, e=1, a=application.name(), ann=application.description() or '')
+
+        if listed:
+            cmds.textScrollList(resultList, e=1, sii=1)
+
+    def run(*args):
+
+        selected = cmds.textScrollList(resultList, q=1, sii=1)
+        if not listed:
+            return
+
+        application = listed[selected[0] - 1] if selected else listed[0]
+
+        cmds.deleteUI(LAUNCHER_WINDOW_NAME)
+        runApplication(application)
+
+    cmds.textField(searchField, e=1, tcc=update, ec=run, aie=1)
+    cmds.textScrollList(resultList, e=1, dcc=run)
+
+    cmds.formLayout(form,
+                    e=1,
+                    af=[(searchField, 'top', 5), (searchField, 'left', 5), (searchField, 'right', 5),
+                        (resultList, 'left', 5), (resultList, 'right', 5), (resultList, 'bottom', 5)],
+                    ac=[(resultList, 'top', 5, searchField)])
+
+    cmds.showWindow(window)
+    cmds.setFocus(searchField)
+
+    return window
@@ -0,0 +1,282 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMayaGUI/commandLib.py @brief [ FILE ] - Run python commands of menu items.
+## @package mMayaGUI.commandLib    @brief [ FILE ] - Run python commands of menu items.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  ast
+import  sys
+import  functools
+import  importlib
+
+import  __main__
+
+from    maya import cmds
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - File name given to the compiled commands, it appears in tracebacks.
+COMMAND_FILE_NAME   = '<mMayaGUI command>'
+
+## [ str ] - Python command which runs a command through the command dispatcher of the session, it is formatted with the command.
+DISPATCH_COMMAND    = 'import mMayaGUI.commandLib;mMayaGUI.commandLib.getCommandDispatcher().run(%r)'
+
+## [ mMayaGUI.commandLib.CommandDispatcher ] - Command dispatcher of the session.
+_commandDispatcher  = None
+
+
+#
+## @brief [ CLASS ] - Class compiles python commands once and runs the cached code objects.
+#
+#  Commands are run in the namespace of `__main__` module, same as the string commands of menu items.
+#  Modules imported by commands can be imported on idle after startup, so the first run of a command
+#  does not pay for the import.
+#
+#  @code
+#import mMayaGUI.commandLib
+#
+#dispatcher = mMayaGUI.commandLib.getCommandDispatcher()
+#
+#command = 'import mMayaCore.referenceLib;mMayaCore.referenceLib.Reference.duplicateSelected()'
+#
+#cmds.menuItem(l='Duplicate Selected Nodes', c=mMayaGUI.commandLib.getDispatchCommand(command))
+#
+#dispatcher.preImport([command])
+#  @endcode
+class CommandDispatcher(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self):
+
+        ## [ dict ] - Compiled commands, keys are commands, values are code objects.
+        self._codes         = {}
+
+        ## [ list of str ] - Modules waiting to be imported on idle.
+        self._pending       = []
+
+        ## [ dict ] - Statistics, keys are: runs, compiles, preImported, preImportFailed.
+        self._stats         = {'runs'               : 0,
+                               'compiles'           : 0,
+                               'preImported'        : 0,
+                               'preImportFailed'    : 0}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Statistics.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are: runs, compiles, preImported, preImportFailed.
+    def stats(self):
+
+        return dict(self._stats)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Compile given command, cached code object is returned if it has been compiled already.
+    #
+    #  @param command [ str | None | in  ] - Python command.
+    #
+    #  @exception SyntaxError - If command is not valid.
+    #
+    #  @return code - Code object.
+    def compile(self, command):
+
+        code = self._codes.get(command)
+
+        if code is None:
+            code = compile(command, COMMAND_FILE_NAME, 'exec')
+            self._codes[command] = code
+            self._stats['compiles'] += 1
+
+        return code
+
+    #
+    ## @brief Run given command.
+    #
+    #  Positional arguments given by Maya UI callbacks are ignored.
+    #
+    #  @param command [ str | None | in  ] - Python command.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def run(self, command, *args):
+
+        self._stats['runs'] += 1
+
+        exec(self.compile(command), __main__.__dict__)
+
+    #
+    ## @brief Get a callback which runs given command.
+    #
+    #  Callbacks can not be queried or dragged to shelves, use getDispatchCommand function for menu items.
+    #
+    #  @param command [ str | None | in  ] - Python command.
+    #
+    #  @exception N/A
+    #
+    #  @return functools.partial - Callback.
+    def callback(self, command):
+
+        return functools.partial(self.run, command)
+
+    #
+    ## @brief Compile given commands and import the modules they import on idle, one module per idle event.
+    #
+    #  Commands are compiled at once, which is cheap compared to importing modules.
+    #
+    #  @param commands [ list of str | None | in  ] - Python commands.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of modules scheduled to be imported.
+    def preImport(self, commands):
+
+        modules = []
+
+        for command in commands:
+
+            if not command:
+                continue
+
+            try:
+                self.compile(command)
+            except SyntaxError:
+                continue
+
+            for moduleName in getImportedModules(command):
+                if moduleName not in sys.modules and moduleName not in modules and moduleName not in self._pending:
+                    modules.append(moduleName)
+
+        if not modules:
+            return 0
+
+        isIdle = not self._pending
+        self._pending.extend(modules)
+
+        if isIdle:
+            cmds.evalDeferred(self._importNext, lowestPriority=True)
+
+        return len(modules)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Import the next pending module and schedule the following one.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _importNext(self):
+
+        if not self._pending:
+            return
+
+        moduleName = self._pending.pop(0)
+
+        try:
+            importlib.import_module(moduleName)
+            self._stats['preImported'] += 1
+        except Exception:
+            # Module fails again and reports the error when its command is run
+            self._stats['preImportFailed'] += 1
+
+        if self._pending:
+            cmds.evalDeferred(self._importNext, lowestPriority=True)
+
+#
+## @brief Get names of the modules imported by given python command.
+#
+#  @param command [ str | None | in  ] - Python command.
+#
+#  @exception N/A
+#
+#  @return list of str - Module names.
+def getImportedModules(command):
+
+    try:
+        tree = ast.parse(command)
+    except SyntaxError:
+        return []
+
+    modules = []
+
+    for node in ast.walk(tree):
+
+        if isinstance(node, ast.Import):
+            modules.extend([x.name for x in node.names])
+
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+
+    return modules
+
+#
+## @brief Get a python command which runs given command through the command dispatcher of the session.
+#
+#  Unlike callbacks, string commands can be queried by `menuItem -q -c` and dragged to shelves.
+#
+#  @param command [ str | None | in  ] - Python command.
+#
+#  @exception N/A
+#
+#  @return str - Python command.
+def getDispatchCommand(command):
+
+    return DISPATCH_COMMAND % (command,)
+
+#
+## @brief Get the command dispatcher of the session.
+#
+#  @exception N/A
+#
+#  @return mMayaGUI.commandLib.CommandDispatcher - Command dispatcher.
+def getCommandDispatcher():
+
+    global _commandDispatcher
+
+    if not _commandDispatcher:
+        _commandDispatcher = CommandDispatcher()
+
+    return _commandDispatcher
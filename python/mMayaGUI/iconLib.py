@@ -0,0 +1,218 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMayaGUI/iconLib.py @brief [ FILE ] - Resolve icon files of applications.
+## @package mMayaGUI.iconLib    @brief [ FILE ] - Resolve icon files of applications.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  sys
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ tuple of str ] - Relative path of the icons directory in a package.
+ICONS_DIRECTORY = ('resources', 'icons')
+
+## [ str ] - Default theme, icons in the directory of the theme are preferred over the other ones.
+DEFAULT_THEME   = 'dark'
+
+## [ mMayaGUI.iconLib.IconIndex ] - Icon index of the session.
+_iconIndex      = None
+
+
+#
+## @brief [ CLASS ] - Class indexes icon files of packages, so icons are resolved by dictionary lookups.
+#
+#  Icons directory of each package (`resources/icons`) is scanned once, the first time an icon of the package is
+#  resolved. Icons in the directory of the theme (`resources/icons/dark`) are preferred over the icons with the
+#  same name in the other directories.
+#
+#  @code
+#import mMayaGUI.iconLib
+#
+#iconIndex = mMayaGUI.iconLib.getIconIndex()
+#
+#sys.stdout.write(iconIndex.resolve('reference.png', '/packages/mMayaCore/python/mMayaCore/referenceLibApp.py'))
+# # /packages/mMayaCore/resources/icons/dark/reference.png
+#  @endcode
+class IconIndex(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param theme [ str | DEFAULT_THEME | in  ] - Theme.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, theme=DEFAULT_THEME):
+
+        ## [ str ] - Theme.
+        self._theme         = theme
+
+        ## [ dict ] - Icons of packages, keys are package root directories, values are dicts of file names and absolute paths.
+        self._packages      = {}
+
+        ## [ dict ] - Package root directories, keys are module file directories.
+        self._packageRoots  = {}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Theme.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Theme.
+    def theme(self):
+
+        return self._theme
+
+    #
+    ## @brief Number of indexed packages.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of packages.
+    def packageCount(self):
+
+        return len(self._packages)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Resolve absolute path of given icon file of the package which contains given module file.
+    #
+    #  @param iconFileName [ str | None | in  ] - Name of the icon file.
+    #  @param moduleFile   [ str | None | in  ] - Path of a module file in the package, `<root>/python/<package>/<module>.py`.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Absolute path of the icon file.
+    #  @return None - If icon file is not found.
+    def resolve(self, iconFileName, moduleFile):
+
+        if not iconFileName or not moduleFile:
+            return None
+
+        moduleDirectory = os.path.dirname(moduleFile)
+
+        packageRoot = self._packageRoots.get(moduleDirectory)
+        if packageRoot is None:
+            packageRoot = os.path.dirname(os.path.dirname(os.path.abspath(moduleDirectory)))
+            self._packageRoots[moduleDirectory] = packageRoot
+
+        icons = self._packages.get(packageRoot)
+        if icons is None:
+            icons = self.indexPackage(packageRoot)
+
+        return icons.get(iconFileName)
+
+    #
+    ## @brief Resolve absolute path of the icon file of given application.
+    #
+    #  Falls back to `getIconFileAbsolutePath` method of the application if the icon is not found in the index.
+    #
+    #  @param application [ mApplication.applicationInfoAbs.ApplicationInfo | None | in  ] - Application.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Absolute path of the icon file.
+    #  @return None - If application has no icon.
+    def getIconFileAbsolutePath(self, application):
+
+        iconFileName = getattr(application, '_iconFileName', None)
+        if not iconFileName:
+            return application.getIconFileAbsolutePath()
+
+        module = sys.modules.get(application.__class__.__module__)
+
+        iconFile = self.resolve(iconFileName, getattr(module, '__file__', None))
+        if iconFile:
+            return iconFile
+
+        return application.getIconFileAbsolutePath()
+
+    #
+    ## @brief Scan icons directory of given package and index its icons.
+    #
+    #  @param packageRoot [ str | None | in  ] - Root directory of the package.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are icon file names, values are absolute paths.
+    def indexPackage(self, packageRoot):
+
+        icons          = {}
+        themeIcons     = {}
+        iconsDirectory = os.path.join(packageRoot, *ICONS_DIRECTORY)
+        themeDirectory = os.path.join(iconsDirectory, self._theme)
+
+        for directory, _, fileNames in os.walk(iconsDirectory):
+
+            target = themeIcons if directory == themeDirectory else icons
+
+            for fileName in fileNames:
+                target.setdefault(fileName, os.path.join(directory, fileName))
+
+        icons.update(themeIcons)
+
+        self._packages[packageRoot] = icons
+
+        return icons
+
+    #
+    ## @brief Clear the index, packages are scanned again when their icons are resolved.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def clear(self):
+
+        self._packages      = {}
+        self._packageRoots  = {}
+
+#
+## @brief Get the icon index of the session.
+#
+#  @exception N/A
+#
+#  @return mMayaGUI.iconLib.IconIndex - Icon index.
+def getIconIndex():
+
+    global _iconIndex
+
+    if not _iconIndex:
+        _iconIndex = IconIndex()
+
+    return _iconIndex
@@ -25,6 +25,10 @@
 # ----------------------------------------------------------------------------------------------------
 # IMPORT
 # ----------------------------------------------------------------------------------------------------
+import functools
+
+from   collections import OrderedDict
+
 from   maya import cmds
 from   maya import mel
 from   maya import OpenMaya
@@ -32,11 +36,879 @@ from   maya import OpenMaya
 import mApplication.applicationInfoAbs
 import mApplication.parentApplicationLib
 
+import mMayaCore.profileLib
+
+import mMayaGUI.applicationManifestLib
+import mMayaGUI.commandLib
+import mMayaGUI.iconLib
+
 
 #
 # ----------------------------------------------------------------------------------------------------
 # CODE
 # ----------------------------------------------------------------------------------------------------
+## [ str ] - Prefix of the names of the menus and menu items created by this module.
+MENU_NAME_PREFIX = 'Meco_'
+
+## [ str ] - Suffix of the names of the separators created before menu items.
+SEPARATOR_NAME_SUFFIX = '__separator'
+
+## [ dict ] - Report of the last menu tree build done by initializeMenus function.
+_lastBuildReport = {}
+
+## [ mMayaGUI.menuLib.MenuTree ] - Menu tree built by initializeMenus function, it is updated by refreshMenus function.
+_menuTree = None
+
+
+#
+## @brief [ CLASS ] - Node of a menu tree, it represents a main menu, a sub menu or a menu item.
+class MenuNode(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param name  [ str | None | in  ] - Name of the menu or menu item.
+    #  @param label [ str | None | in  ] - Label of the menu or menu item.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self, name, label):
+
+        ## [ str ] - Name of the menu or menu item.
+        self.name         = name
+
+        ## [ str ] - Label of the menu or menu item.
+        self.label        = label
+
+        ## [ collections.OrderedDict ] - Child nodes, keys are names of the child nodes.
+        self.children     = OrderedDict()
+
+        ## [ bool ] - Whether this node is a menu item with a command.
+        self.isItem       = False
+
+        ## [ str ] - Command of the menu item.
+        self.command      = None
+
+        ## [ str ] - Absolute path of the icon of the menu item.
+        self.icon         = None
+
+        ## [ bool ] - Whether a separator is added before the menu item.
+        self.addSeparator = False
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Check whether this node is a menu item, otherwise it is a main menu or a sub menu.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isMenuItem(self):
+
+        return self.isItem and not self.children
+
+    #
+    ## @brief Name of the separator created before the menu item.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Name.
+    def separatorName(self):
+
+        return '{}{}'.format(self.name, SEPARATOR_NAME_SUFFIX)
+
+    #
+    ## @brief State of the node, which is compared to find out whether the UI of the node needs to be updated.
+    #
+    #  @exception N/A
+    #
+    #  @return tuple - Label, command, icon and addSeparator for menu items, label for menus.
+    def state(self):
+
+        if self.isMenuItem():
+            return (self.label, self.command, self.icon, self.addSeparator)
+
+        return (self.label,)
+
+#
+## @brief [ CLASS ] - Class collects menu paths into an in-memory tree and creates the menus in a single pass.
+#
+#  Each main menu and sub menu gets created only once and main window of Maya gets resolved only once,
+#  regardless of the number of the menu items which share them.
+#
+#  @code
+#import mMayaGUI.menuLib
+#
+#menuTree = mMayaGUI.menuLib.MenuTree()
+#menuTree.addItem(path='Meco/Reference/Reload Selected Nodes', command='print(1)')
+#menuTree.addItem(path='Meco/Reference/Remove Selected Nodes', command='print(2)')
+#
+#report = menuTree.build()
+# # {'items': 2, 'uiCalls': 6, 'legacyUICalls': 11, 'savedUICalls': 5}
+#  @endcode
+class MenuTree(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def __init__(self):
+
+        ## [ collections.OrderedDict ] - Main menus, keys are names of the main menus.
+        self._roots             = OrderedDict()
+
+        ## [ int ] - Number of menu items added.
+        self._itemCount         = 0
+
+        ## [ list of tuple ] - Added items in order, each tuple contains path, command, icon and addSeparator.
+        self._addedItems        = []
+
+        ## [ int ] - Number of Maya UI calls made by the last build.
+        self._uiCallCount       = 0
+
+        ## [ int ] - Number of Maya UI calls createMenu function would have made for the same items.
+        self._legacyUICallCount = 0
+
+        ## [ dict ] - Nodes, keys are names of the nodes, values are tuples which contain the node and name of its parent.
+        self._nodes             = {}
+
+        ## [ dict ] - Menus and menu items created in Maya, keys are names, values are the states they are created with.
+        self._created           = {}
+
+        ## [ set of str ] - Names of the menus whose sub menus and menu items are created.
+        self._populated         = set()
+
+        ## [ dict ] - Options of the last build, keys are: mainTearOff, mainAllowOptionBoxes, tearOff, allowOptionBoxes, lazy.
+        self._buildOptions      = {'mainTearOff'          : True,
+                                   'mainAllowOptionBoxes' : True,
+                                   'tearOff'              : True,
+                                   'allowOptionBoxes'     : True,
+                                   'lazy'                 : False}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PROPERTY METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Main menus.
+    #
+    #  @exception N/A
+    #
+    #  @return list of mMayaGUI.menuLib.MenuNode - Main menus.
+    def roots(self):
+
+        return list(self._roots.values())
+
+    #
+    ## @brief Number of menu items added.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of menu items.
+    def itemCount(self):
+
+        return self._itemCount
+
+    #
+    ## @brief Number of Maya UI calls made by the last build.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of calls.
+    def uiCallCount(self):
+
+        return self._uiCallCount
+
+    #
+    ## @brief Number of Maya UI calls createMenu function would have made for the same items.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of calls.
+    def legacyUICallCount(self):
+
+        return self._legacyUICallCount
+
+    #
+    ## @brief Number of Maya UI calls saved by the last build compared to calling createMenu per item.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of calls.
+    def savedUICallCount(self):
+
+        return self._legacyUICallCount - self._uiCallCount
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Add a menu item.
+    #
+    #  @param path         [ str  | None  | in ] - Path of the menu item, use / as separator.
+    #  @param command      [ str  | None  | in ] - Command of the menu item.
+    #  @param icon         [ str  | None  | in ] - Absolute path of an icon.
+    #  @param addSeparator [ bool | False | in ] - Add a separator before the menu item.
+    #
+    #  @exception N/A
+    #
+    #  @return mMayaGUI.menuLib.MenuNode - Node of the menu item.
+    def addItem(self, path, command, icon=None, addSeparator=False):
+
+        menuItemLabels, menuItemNames = getMenuItemNames(path)
+
+        nodes = self._roots
+        node  = None
+
+        for label, name in zip(menuItemLabels, menuItemNames):
+            parent = node
+            node   = nodes.get(name)
+            if not node:
+                node              = MenuNode(name, label)
+                nodes[name]       = node
+                self._nodes[name] = (node, parent.name if parent else None)
+
+            nodes = node.children
+
+        if len(menuItemLabels) > 1:
+            node.isItem       = True
+            node.command      = command
+            node.icon         = icon
+            node.addSeparator = addSeparator
+
+        self._itemCount += 1
+        self._addedItems.append((path, command, icon, addSeparator))
+
+        return node
+
+    #
+    ## @brief Add a menu item for given application.
+    #
+    #  Icons of application info instances are resolved by the icon index of the session, @see mMayaGUI.iconLib.IconIndex
+    #  Application records already contain resolved icons, @see mMayaGUI.applicationManifestLib.ApplicationRecord
+    #
+    #  @param application [ mApplication.applicationInfoAbs.ApplicationInfo | None | in ] - Application.
+    #
+    #  @exception N/A
+    #
+    #  @return mMayaGUI.menuLib.MenuNode - Node of the menu item.
+    #  @return None                      - If the application has no menu path or not meant for Maya.
+    def addApplication(self, application):
+
+        with mMayaCore.profileLib.span(application.name(), 'application'):
+
+            with mMayaCore.profileLib.span('fullMenuPath', 'application'):
+                menuPath = application.fullMenuPath()
+
+            if not menuPath:
+                return None
+
+            if not isMayaApplication(application):
+                return None
+
+            with mMayaCore.profileLib.span('getIconFileAbsolutePath', 'application'):
+                if isinstance(application, mMayaGUI.applicationManifestLib.ApplicationRecord):
+                    icon = application.getIconFileAbsolutePath()
+                else:
+                    icon = mMayaGUI.iconLib.getIconIndex().getIconFileAbsolutePath(application)
+
+            return self.addItem(path=menuPath,
+                                command=application.pythonCommand(),
+                                icon=icon,
+                                addSeparator=application.menuSeparatorBefore())
+
+    #
+    ## @brief Create the menus in Maya.
+    #
+    #  Main window of Maya is resolved at most once and each main menu and sub menu is created once.
+    #  Existence of the child menus and menu items is not queried for freshly created menus.
+    #
+    #  In lazy mode, only the main menus are created. Each main menu and sub menu gets a post menu command,
+    #  which creates its sub menus and menu items the first time the menu is opened. Items of existing main
+    #  menus are deleted, since they are created again on demand.
+    #
+    #  @param mainTearOff          [ bool | True  | in ] - Enable tear-off feature of the main menus.
+    #  @param mainAllowOptionBoxes [ bool | True  | in ] - Allow option boxes for main menu items.
+    #  @param mainDeleteFirst      [ bool | False | in ] - Delete main menus first.
+    #  @param tearOff              [ bool | True  | in ] - Enable tear-off feature of the sub menus.
+    #  @param allowOptionBoxes     [ bool | True  | in ] - Allow option boxes for sub menu items.
+    #  @param deleteFirst          [ bool | False | in ] - Delete sub menus first.
+    #  @param lazy                 [ bool | False | in ] - Create main menus only, populate each menu when it is opened first time.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report, keys are: items, uiCalls, legacyUICalls, savedUICalls.
+    def build(self,
+              mainTearOff=True,
+              mainAllowOptionBoxes=True,
+              mainDeleteFirst=False,
+              tearOff=True,
+              allowOptionBoxes=True,
+              deleteFirst=False,
+              lazy=False):
+
+        self._uiCallCount  = 0
+        self._buildOptions = {'mainTearOff'          : mainTearOff,
+                              'mainAllowOptionBoxes' : mainAllowOptionBoxes,
+                              'tearOff'              : tearOff,
+                              'allowOptionBoxes'     : allowOptionBoxes,
+                              'lazy'                 : lazy}
+
+        # Names of the menus which existed before the build
+        preExisting = set()
+
+        mayaWindow = None
+
+        for root in self._roots.values():
+
+            existed = self._call(cmds.menu, root.name, q=1, ex=1)
+            if existed:
+                preExisting.add(root.name)
+
+            if existed and mainDeleteFirst:
+                self._call(cmds.deleteUI, root.name)
+                existed = False
+
+            if not existed:
+                if not mayaWindow:
+                    mayaWindow = self._call(mel.eval, '$temp1=$gMainWindow')
+
+                self._call(cmds.menu,
+                           root.name,
+                           l=root.label,
+                           p=mayaWindow,
+                           to=mainTearOff,
+                           aob=mainAllowOptionBoxes)
+
+            self._created[root.name] = root.state()
+
+            if lazy:
+                if existed:
+                    self._call(cmds.menu, root.name, e=1, deleteAllItems=1)
+
+                self._call(cmds.menu,
+                           root.name,
+                           e=1,
+                           pmc=functools.partial(self._populate, root.name),
+                           pmo=1)
+                continue
+
+            self._buildChildren(root,
+                                fresh=not existed,
+                                deleteFirst=deleteFirst,
+                                preExisting=preExisting)
+
+        self._legacyUICallCount = self._estimateLegacyUICallCount(preExisting=preExisting,
+                                                                  mainDeleteFirst=mainDeleteFirst,
+                                                                  deleteFirst=deleteFirst)
+
+        return self.report()
+
+    #
+    ## @brief Report of the last build.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report, keys are: items, uiCalls, legacyUICalls, savedUICalls.
+    def report(self):
+
+        return {'items'         : self._itemCount,
+                'uiCalls'       : self._uiCallCount,
+                'legacyUICalls' : self._legacyUICallCount,
+                'savedUICalls'  : self.savedUICallCount()}
+
+    #
+    ## @brief Update the menus created by this tree to match given tree.
+    #
+    #  Menus and menu items created by this tree are compared with the ones in given tree. Only the
+    #  ones which are removed, added or changed (label, command, icon or separator) are updated in Maya,
+    #  nothing is deleted and created again. Menus which are not populated yet in lazy mode are populated
+    #  with their new children when they are opened. Menus and menu items of given tree are adopted by this tree.
+    #
+    #  New menu items are inserted after their previous sibling, order of the existing menu items is not changed.
+    #
+    #  @param menuTree [ mMayaGUI.menuLib.MenuTree | None | in ] - Menu tree to update to, it should not be built.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Report, keys are: items, added, removed, updated, uiCalls.
+    def update(self, menuTree):
+
+        self._uiCallCount = 0
+
+        report = {'items': menuTree.itemCount(), 'added': 0, 'removed': 0, 'updated': 0}
+
+        # Removed menus and menu items, children of removed menus go with them
+        for root in list(self._roots.values()):
+            self._removeStaleNodes(root, menuTree._nodes, report)
+
+        self._roots      = menuTree._roots
+        self._nodes      = menuTree._nodes
+        self._itemCount  = menuTree._itemCount
+        self._addedItems = menuTree._addedItems
+
+        mayaWindow = None
+
+        for root in self._roots.values():
+
+            if root.name not in self._created:
+                if not mayaWindow:
+                    mayaWindow = self._call(mel.eval, '$temp1=$gMainWindow')
+
+                kwargs = {}
+                if self._buildOptions['lazy']:
+                    kwargs = {'pmc': functools.partial(self._populate, root.name), 'pmo': 1}
+
+                self._call(cmds.menu,
+                           root.name,
+                           l=root.label,
+                           p=mayaWindow,
+                           to=self._buildOptions['mainTearOff'],
+                           aob=self._buildOptions['mainAllowOptionBoxes'],
+                           **kwargs)
+                self._created[root.name] = root.state()
+                report['added'] += 1
+
+                if not self._buildOptions['lazy']:
+                    self._createChildren(root, report)
+
+                continue
+
+            if self._created[root.name] != root.state():
+                self._call(cmds.menu, root.name, e=1, l=root.label)
+                self._created[root.name] = root.state()
+                report['updated'] += 1
+
+            self._updateChildren(root, report)
+
+        report['uiCalls'] = self._uiCallCount
+
+        return report
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Call given Maya UI function and count the call.
+    #
+    #  @param function [ callable | None | in ] - Function.
+    #
+    #  @exception N/A
+    #
+    #  @return variant - Return value of the function.
+    def _call(self, function, *args, **kwargs):
+
+        self._uiCallCount += 1
+
+        with mMayaCore.profileLib.span(function.__name__, 'ui', target=args[0] if args else ''):
+            return function(*args, **kwargs)
+
+    #
+    ## @brief Create child menus and menu items of given node recursively.
+    #
+    #  @param parent      [ mMayaGUI.menuLib.MenuNode | None | in  ] - Parent node.
+    #  @param fresh       [ bool                      | None | in  ] - Whether parent menu has just been created.
+    #  @param deleteFirst [ bool                      | None | in  ] - Delete sub menus first.
+    #  @param preExisting [ set of str                | None | out ] - Names of the menus which existed before the build.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _buildChildren(self, parent, fresh, deleteFirst, preExisting):
+
+        self._populated.add(parent.name)
+
+        for node in parent.children.values():
+
+            if node.isMenuItem():
+
+                if not fresh and self._call(cmds.menuItem, node.name, q=1, ex=1):
+                    preExisting.add(node.name)
+                    self._call(cmds.deleteUI, node.name)
+
+                    if self._call(cmds.menuItem, node.separatorName(), q=1, ex=1):
+                        self._call(cmds.deleteUI, node.separatorName())
+
+                self._createItem(node, parent)
+                continue
+
+            existed = False
+            if not fresh:
+                existed = self._call(cmds.menu, node.name, q=1, ex=1)
+                if existed:
+                    preExisting.add(node.name)
+
+                if existed and deleteFirst:
+                    self._call(cmds.deleteUI, node.name)
+                    existed = False
+
+            if not existed:
+                self._createSubMenu(node, parent)
+            else:
+                self._created[node.name] = node.state()
+
+            self._buildChildren(node,
+                                fresh=not existed,
+                                deleteFirst=deleteFirst,
+                                preExisting=preExisting)
+
+    #
+    ## @brief Delete given node and its descendants from Maya if they are not in given nodes or changed type.
+    #
+    #  @param node   [ mMayaGUI.menuLib.MenuNode | None | in  ] - Node.
+    #  @param nodes  [ dict                      | None | in  ] - Nodes of the new tree.
+    #  @param report [ dict                      | None | out ] - Report.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _removeStaleNodes(self, node, nodes, report):
+
+        if node.name not in self._created:
+            return
+
+        newNode = nodes.get(node.name, (None, None))[0]
+
+        if newNode is None or newNode.isMenuItem() != node.isMenuItem():
+
+            self._call(cmds.deleteUI, node.name)
+            if node.isMenuItem() and node.addSeparator:
+                self._call(cmds.deleteUI, node.separatorName())
+
+            self._forget(node)
+            report['removed'] += 1
+
+            return
+
+        for child in list(node.children.values()):
+            self._removeStaleNodes(child, nodes, report)
+
+    #
+    ## @brief Forget given node and its descendants as created.
+    #
+    #  @param node [ mMayaGUI.menuLib.MenuNode | None | in  ] - Node.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _forget(self, node):
+
+        self._created.pop(node.name, None)
+        self._populated.discard(node.name)
+
+        for child in node.children.values():
+            self._forget(child)
+
+    #
+    ## @brief Update child menus and menu items of given populated menu, create the new ones.
+    #
+    #  @param parent [ mMayaGUI.menuLib.MenuNode | None | in  ] - Parent node.
+    #  @param report [ dict                      | None | out ] - Report.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _updateChildren(self, parent, report):
+
+        if parent.name not in self._populated:
+            return
+
+        # Name of the last created sibling, new nodes are inserted after it
+        previous = ''
+
+        for node in parent.children.values():
+
+            if node.name not in self._created:
+
+                if node.isMenuItem():
+                    self._createItem(node, parent, insertAfter=previous)
+                else:
+                    self._createSubMenu(node, parent, insertAfter=previous)
+                    if not self._buildOptions['lazy']:
+                        self._createChildren(node, report)
+
+                report['added'] += 1
+                previous = node.name
+                continue
+
+            state = node.state()
+
+            if self._created[node.name] != state:
+
+                if node.isMenuItem():
+
+                    addSeparator = self._created[node.name][3]
+
+                    # Command is cleared if it is removed, Maya does not accept None
+                    kwargs  = {}
+                    command = getMenuItemCommand(node.command)
+                    if command or self._created[node.name][1]:
+                        kwargs['c'] = command or ''
+
+                    self._call(cmds.menuItem, node.name, e=1, l=node.label, i=node.icon or '', **kwargs)
+
+                    if node.addSeparator and not addSeparator:
+                        self._call(cmds.menuItem, node.separatorName(), d=True, parent=parent.name, ia=previous)
+                    elif addSeparator and not node.addSeparator:
+                        self._call(cmds.deleteUI, node.separatorName())
+
+                else:
+                    self._call(cmds.menuItem, node.name, e=1, l=node.label)
+
+                self._created[node.name] = state
+                report['updated'] += 1
+
+            if not node.isMenuItem():
+                self._updateChildren(node, report)
+
+            previous = node.name
+
+    #
+    ## @brief Create child menus and menu items of given freshly created menu recursively.
+    #
+    #  @param parent [ mMayaGUI.menuLib.MenuNode | None | in  ] - Parent node.
+    #  @param report [ dict                      | None | out ] - Report.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _createChildren(self, parent, report):
+
+        self._populated.add(parent.name)
+
+        for node in parent.children.values():
+
+            if node.isMenuItem():
+                self._createItem(node, parent)
+            else:
+                self._createSubMenu(node, parent)
+                self._createChildren(node, report)
+
+            report['added'] += 1
+
+    #
+    ## @brief Create given menu item.
+    #
+    #  @param node        [ mMayaGUI.menuLib.MenuNode | None | in  ] - Node of the menu item.
+    #  @param parent      [ mMayaGUI.menuLib.MenuNode | None | in  ] - Parent node.
+    #  @param insertAfter [ str                       | None | in  ] - Name of the menu item to insert after, empty string for the beginning, None for the end.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _createItem(self, node, parent, insertAfter=None):
+
+        kwargs = {} if insertAfter is None else {'ia': insertAfter}
+
+        if node.addSeparator:
+            self._call(cmds.menuItem, node.separatorName(), d=True, parent=parent.name, **kwargs)
+            if insertAfter is not None:
+                kwargs = {'ia': node.separatorName()}
+
+        command = getMenuItemCommand(node.command)
+        if command:
+            kwargs['c'] = command
+
+        self._call(cmds.menuItem,
+                   node.name,
+                   l=node.label,
+                   p=parent.name,
+                   i=node.icon,
+                   **kwargs)
+
+        self._created[node.name] = node.state()
+
+    #
+    ## @brief Create given sub menu.
+    #
+    #  Sub menu is populated when it is opened if the last build is lazy.
+    #
+    #  @param node        [ mMayaGUI.menuLib.MenuNode | None | in  ] - Node of the sub menu.
+    #  @param parent      [ mMayaGUI.menuLib.MenuNode | None | in  ] - Parent node.
+    #  @param insertAfter [ str                       | None | in  ] - Name of the menu item to insert after, empty string for the beginning, None for the end.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _createSubMenu(self, node, parent, insertAfter=None):
+
+        if node.isItem:
+            OpenMaya.MGlobal.displayWarning('Menu item is also a sub menu, command is ignored: {}'.format(node.name))
+
+        kwargs = {} if insertAfter is None else {'ia': insertAfter}
+
+        if self._buildOptions['lazy']:
+            kwargs['pmc'] = functools.partial(self._populate, node.name)
+            kwargs['pmo'] = 1
+
+        self._call(cmds.menuItem,
+                   node.name,
+                   l=node.label,
+                   p=parent.name,
+                   aob=self._buildOptions['allowOptionBoxes'],
+                   to=self._buildOptions['tearOff'],
+                   sm=1,
+                   **kwargs)
+
+        self._created[node.name] = node.state()
+
+    #
+    ## @brief Post menu command of lazily built menus, creates child sub menus and menu items of given menu.
+    #
+    #  Child sub menus get their own post menu commands, so they are populated when they are opened.
+    #  Menu is looked up by its name, so menus which are updated by update method are populated with their current children.
+    #
+    #  @param name [ str | None | in  ] - Name of the opened menu.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def _populate(self, name, *args):
+
+        if name in self._populated or name not in self._nodes:
+            return
+
+        self._populated.add(name)
+
+        parent = self._nodes[name][0]
+
+        for node in parent.children.values():
+
+            if node.isMenuItem():
+                self._createItem(node, parent)
+            else:
+                self._createSubMenu(node, parent)
+
+    #
+    ## @brief Estimate the number of Maya UI calls createMenu function would make for the added items.
+    #
+    #  Calls are counted by replaying the added items against the UI state found by the build.
+    #
+    #  @param preExisting     [ set of str | None | in ] - Names of the menus which existed before the build.
+    #  @param mainDeleteFirst [ bool       | None | in ] - Delete main menus first.
+    #  @param deleteFirst     [ bool       | None | in ] - Delete sub menus first.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of calls.
+    def _estimateLegacyUICallCount(self, preExisting, mainDeleteFirst, deleteFirst):
+
+        existing = set(preExisting)
+        count    = 0
+
+        def delete(name):
+
+            existing.difference_update([x for x in existing if x == name or x.startswith(name + '_')])
+
+        for path, command, icon, addSeparator in self._addedItems:
+
+            menuItemNames = getMenuItemNames(path)[1]
+
+            for i, name in enumerate(menuItemNames):
+
+                if i == len(menuItemNames) - 1 and i > 0:
+                    count += 3 if name in existing else 2
+                    count += 1 if addSeparator else 0
+                    existing.add(name)
+                    continue
+
+                if (i == 0 and mainDeleteFirst) or (i > 0 and deleteFirst):
+                    count += 1
+                    if name in existing:
+                        count += 1
+                        delete(name)
+
+                count += 1
+                if name not in existing:
+                    # The main window is evaluated for each main menu creation
+                    count += 2 if i == 0 else 1
+                    existing.add(name)
+
+        return count
+
+#
+## @brief Get labels and names of the menus and menu item of given path.
+#
+#  @param path [ str | None | in ] - Path of the menu item, use / as separator.
+#
+#  @exception N/A
+#
+#  @return list of str - Labels.
+#  @return list of str - Names.
+def getMenuItemNames(path):
+
+    menuItemLabels = path.split('/')
+
+    hierarchy     = ''
+    menuItemNames = []
+
+    for i in range(len(menuItemLabels)):
+
+        if i == 0:
+            hierarchy = '{}{}'.format(MENU_NAME_PREFIX, menuItemLabels[i])
+        else:
+            hierarchy += '_{}'.format(menuItemLabels[i])
+
+        menuItemNames.append(hierarchy.replace(' ', ''))
+
+    return menuItemLabels, menuItemNames
+
+#
+## @brief Get command of a menu item for given python command.
+#
+#  Python commands are compiled once and run by the command dispatcher of the session, @see mMayaGUI.commandLib
+#
+#  @param command [ str | None | in ] - Python command.
+#
+#  @exception N/A
+#
+#  @return str  - Python command which runs given command through the command dispatcher.
+#  @return None - If no command is given.
+def getMenuItemCommand(command):
+
+    if not command:
+        return None
+
+    return mMayaGUI.commandLib.getDispatchCommand(command)
+
+#
+## @brief Check whether given application is meant to be used in Maya.
+#
+#  @param application [ mApplication.applicationInfoAbs.ApplicationInfo | None | in ] - Application.
+#
+#  @exception N/A
+#
+#  @return bool - Result.
+def isMayaApplication(application):
+
+    parentApplications = application.parentApplications()
+
+    return mApplication.parentApplicationLib.Application.kMaya in parentApplications or \
+           mApplication.parentApplicationLib.Application.kAll in parentApplications
+
+#
+## @brief Get the report of the last menu tree build done by initializeMenus function.
+#
+#  @exception N/A
+#
+#  @return dict - Report, keys are: items, uiCalls, legacyUICalls, savedUICalls.
+def getLastBuildReport():
+
+    return dict(_lastBuildReport)
+
 #
 ## @brief Create a main menu.
 #
@@ -65,110 +937,170 @@ def createMenu(path,
                deleteFirst=False,
                addSeparator=False):
 
-    PREFIX = 'Meco_'
+    with mMayaCore.profileLib.span('createMenu', 'menu', path=path):
 
-    menuItemLabels = path.split('/')
+        menuItemLabels, menuItemNames = getMenuItemNames(path)
 
-    hierarchy     = ''
-    menuItemNames = []
+        for i in range(len(menuItemLabels)):
 
-    for i in range(len(menuItemLabels)):
+            # Main menu attached to the main window
+            if i == 0:
 
-        if i == 0:
-            hierarchy = '{}{}'.format(PREFIX, menuItemLabels[i])
-        else:
-            hierarchy += '_{}'.format(menuItemLabels[i])
+                if mainDeleteFirst:
+                    if cmds.menu(menuItemNames[i], q=1, ex=1):
+                        cmds.deleteUI(menuItemNames[i])
 
-        menuItemNames.append(hierarchy.replace(' ', ''))
+                if not cmds.menu(menuItemNames[i], q=1, ex=1):
+                    mayaWindow = mel.eval('$temp1=$gMainWindow')
+                    cmds.menu(menuItemNames[i],
+                              l=menuItemLabels[i],
+                              p=mayaWindow,
+                              to=mainTearOff,
+                              aob=mainAllowOptionBoxes)
 
+                continue
 
-    for i in range(len(menuItemLabels)):
 
-        # Main menu attached to the main window
-        if i == 0:
+            if i > 0:
 
-            if mainDeleteFirst:
-                if cmds.menu(menuItemNames[i], q=1, ex=1):
-                    cmds.deleteUI(menuItemNames[i])
+                if i == len(menuItemLabels)-1:
+                    # Menu item with command
+                    #sys.stdout.write('MENU ITEM')
+                    #sys.stdout.write(menuItemNames[i])
 
-            if not cmds.menu(menuItemNames[i], q=1, ex=1):
-                mayaWindow = mel.eval('$temp1=$gMainWindow')
-                cmds.menu(menuItemNames[i],
-                          l=menuItemLabels[i],
-                          p=mayaWindow,
-                          to=mainTearOff,
-                          aob=mainAllowOptionBoxes)
+                    if cmds.menuItem(menuItemNames[i], q=1, ex=1):
+                        cmds.deleteUI(menuItemNames[i])
 
-            continue
+                    if addSeparator:
+                        cmds.menuItem(d=True, parent=menuItemNames[i-1])
 
+                    cmds.menuItem(menuItemNames[i],
+                                  l=menuItemLabels[i],
+                                  p=menuItemNames[i-1],
+                                  c=command,
+                                  i=icon)
 
-        if i > 0:
+                else:
+                    # Menu
+                    #sys.stdout.write(MENU')
+                    #sys.stdout.write(menuItemNames[i])
 
-            if i == len(menuItemLabels)-1:
-                # Menu item with command
-                #sys.stdout.write('MENU ITEM')
-                #sys.stdout.write(menuItemNames[i])
+                    if deleteFirst:
+                        if cmds.menu(menuItemNames[i], q=1, ex=1):
+                            cmds.deleteUI(menuItemNames[i])
 
-                if cmds.menuItem(menuItemNames[i], q=1, ex=1):
-                    cmds.deleteUI(menuItemNames[i])
+                    if not cmds.menu(menuItemNames[i], q=1, ex=1):
+                        cmds.menuItem(menuItemNames[i], l=menuItemLabels[i], p=menuItemNames[i-1], aob=allowOptionBoxes, to=tearOff, sm=1)
 
-                if addSeparator:
-                    cmds.menuItem(d=True, parent=menuItemNames[i-1])
+        return menuItemNames
 
-                cmds.menuItem(menuItemNames[i],
-                              l=menuItemLabels[i],
-                              p=menuItemNames[i-1],
-                              c=command,
-                              i=icon)
 
+#
+## @brief This function creates menus in Maya based on the application info classes available in PYTHONPATH.
+#
+#  Function do not initialize menus and returns `False` if Maya is not running in `OpenMaya.MGlobal.kInteractive` mode.
+#
+#  Menu paths of all applications are collected into a mMayaGUI.menuLib.MenuTree first, so each main menu and
+#  sub menu gets created once. Report of the build can be retrieved by using getLastBuildReport function.
+#
+#  Applications are retrieved from mMayaGUI.applicationManifestLib.ApplicationManifest by default, so only the
+#  application info modules which have changed since the last session get imported.
+#
+#  Phases, applications and Maya UI calls are profiled if profiling is enabled, @see mMayaCore.profileLib
+#
+#  @see mApplication.applicationInfoAbs.ApplicationInfo
+#
+#  In lazy mode, only the main menus are created and the sub menus and menu items of each menu are created the
+#  first time the menu is opened, @see mMayaGUI.menuLib.MenuTree.build.
+#
+#  Modules imported by the commands of the applications can be imported on idle after the menus are created, so
+#  the first run of a heavy tool does not stall the UI, @see mMayaGUI.commandLib.CommandDispatcher.preImport
+#
+#  @param useManifest       [ bool | True  | in  ] - Use application manifest instead of importing all application info modules.
+#  @param lazy              [ bool | False | in  ] - Populate the menus when they are opened.
+#  @param preImportCommands [ bool | False | in  ] - Import modules of the commands on idle.
+#
+#  @exception N/A
+#
+#  @return bool - Result
+def initializeMenus(useManifest=True, lazy=False, preImportCommands=False):
+
+    global _lastBuildReport
+    global _menuTree
+
+    if OpenMaya.MGlobal.mayaState() != OpenMaya.MGlobal.kInteractive:
+        return False
+
+    with mMayaCore.profileLib.span('initializeMenus', 'menu', useManifest=useManifest, lazy=lazy):
+
+        with mMayaCore.profileLib.span('discover applications', 'menu'):
+            if useManifest:
+                applicationList = mMayaGUI.applicationManifestLib.ApplicationManifest().list()
             else:
-                # Menu
-                #sys.stdout.write(MENU')
-                #sys.stdout.write(menuItemNames[i])
+                applicationList = mApplication.applicationInfoAbs.ApplicationInfo.list()
 
-                if deleteFirst:
-                    if cmds.menu(menuItemNames[i], q=1, ex=1):
-                        cmds.deleteUI(menuItemNames[i])
+        if not applicationList:
+            return False
 
-                if not cmds.menu(menuItemNames[i], q=1, ex=1):
-                    cmds.menuItem(menuItemNames[i], l=menuItemLabels[i], p=menuItemNames[i-1], aob=allowOptionBoxes, to=tearOff, sm=1)
+        menuTree = MenuTree()
+
+        with mMayaCore.profileLib.span('collect menu tree', 'menu', applications=len(applicationList)):
+            for app in applicationList:
+                menuTree.addApplication(app)
 
-    return menuItemNames
+        with mMayaCore.profileLib.span('build menus', 'menu'):
+            _lastBuildReport = menuTree.build(mainDeleteFirst=False, lazy=lazy)
 
+        _menuTree = menuTree
+
+        if preImportCommands:
+            mMayaGUI.commandLib.getCommandDispatcher().preImport([x.pythonCommand() for x in applicationList
+                                                                  if isMayaApplication(x)])
+
+    mMayaCore.profileLib.write()
+
+    return True
 
 #
-## @brief This function creates menus in Maya based on the application info classes available in PYTHONPATH.
+## @brief Refresh the menus created by initializeMenus function incrementally.
 #
-#  Function do not initialize menus and returns `False` if Maya is not running in `OpenMaya.MGlobal.kInteractive` mode.
+#  Applications are retrieved again and only the menus and menu items which are added, removed or changed since
+#  the last build or refresh get updated, @see mMayaGUI.menuLib.MenuTree.update. Use this function after reloading
+#  tool packages in a live session. Menus are initialized if they have not been initialized yet.
 #
-#  @see mApplication.applicationInfoAbs.ApplicationInfo
+#  @param useManifest [ bool | True | in  ] - Use application manifest instead of importing all application info modules.
 #
 #  @exception N/A
 #
-#  @return bool - Result
-def initializeMenus():
+#  @return dict - Report, keys are: items, added, removed, updated, uiCalls.
+#  @return None - If Maya is not running in interactive mode or no application is found.
+def refreshMenus(useManifest=True):
 
     if OpenMaya.MGlobal.mayaState() != OpenMaya.MGlobal.kInteractive:
-        return False
+        return None
 
-    applicationList = mApplication.applicationInfoAbs.ApplicationInfo.list()
-    if not applicationList:
-        return False
+    if not _menuTree:
+        if not initializeMenus(useManifest=useManifest):
+            return None
+        return getLastBuildReport()
+
+    with mMayaCore.profileLib.span('refreshMenus', 'menu', useManifest=useManifest):
+
+        with mMayaCore.profileLib.span('discover applications', 'menu'):
+            if useManifest:
+                applicationList = mMayaGUI.applicationManifestLib.ApplicationManifest().list()
+            else:
+                applicationList = mApplication.applicationInfoAbs.ApplicationInfo.list()
 
-    for app in applicationList:
+        menuTree = MenuTree()
 
-        menuPath = app.fullMenuPath()
-        if not menuPath:
-            continue
+        with mMayaCore.profileLib.span('collect menu tree', 'menu', applications=len(applicationList)):
+            for app in applicationList:
+                menuTree.addApplication(app)
 
-        if not mApplication.parentApplicationLib.Application.kMaya in app.parentApplications() and not \
-                mApplication.parentApplicationLib.Application.kAll in app.parentApplications():
-            continue
+        with mMayaCore.profileLib.span('update menus', 'menu'):
+            report = _menuTree.update(menuTree)
 
-        menuNames = createMenu(path=menuPath,
-                               command=app.pythonCommand(),
-                               icon=app.getIconFileAbsolutePath(),
-                               addSeparator=app.menuSeparatorBefore(),
-                               mainDeleteFirst=False)
+    mMayaCore.profileLib.write()
 
-    return True
\ No newline at end of file
+    return report
@@ -25,28 +25,99 @@
 # ----------------------------------------------------------------------------------------------------
 # IMPORT
 # ----------------------------------------------------------------------------------------------------
+import  time
+import  importlib
+
+from    collections import OrderedDict
+
 from    maya import utils
+from    maya import OpenMaya
 
-import  mMayaGUI.menuLib
+import  mMayaCore.profileLib
 
 
 #
 #-----------------------------------------------------------------------------------------------------
 # CODE
 #-----------------------------------------------------------------------------------------------------
+## [ tuple of str ] - Modules needed to initialize the menus, in import order, so each import time excludes its predecessors.
+MENU_MODULES = ('mApplication.parentApplicationLib',
+                'mApplication.applicationInfoAbs',
+                'mMayaGUI.applicationManifestLib',
+                'mMayaGUI.menuLib')
+
+## [ collections.OrderedDict ] - Import times of the modules imported at startup, keys are module names, values are seconds.
+_importTimes = OrderedDict()
+
+
+#
+## @brief Check whether Maya is running in interactive mode.
+#
+#  Batch mode (render farm) and library mode (mayapy) return False.
+#
+#  @exception N/A
+#
+#  @return bool - Result.
+def isInteractive():
+
+    return OpenMaya.MGlobal.mayaState() == OpenMaya.MGlobal.kInteractive
+
+#
+## @brief Import given module and record its import time.
+#
+#  @param moduleName [ str | None | in ] - Name of the module.
+#
+#  @exception N/A
+#
+#  @return module - Imported module.
+def importModule(moduleName):
+
+    startTime = time.time()
+
+    with mMayaCore.profileLib.span(moduleName, 'import'):
+        module = importlib.import_module(moduleName)
+
+    _importTimes[moduleName] = time.time() - startTime
+
+    return module
+
+#
+## @brief Get import times of the modules imported at startup.
+#
+#  Modules which were imported already by a previous module get close to zero import time.
+#
+#  @exception N/A
+#
+#  @return collections.OrderedDict - Keys are module names, values are seconds.
+def getImportTimes():
+
+    return OrderedDict(_importTimes)
+
 #
 ## @brief Function initializes the menus for tools in Autodesk Maya.
 #
+#  Nothing gets imported in batch and library modes, so render farm and mayapy processes pay no cost for menus.
+#
+#  Imports are profiled if profiling is enabled, @see mMayaCore.profileLib
+#
 #  @exception N/A
 #
-#  @return None - None.
+#  @return bool - Whether menus will be initialized.
 def main():
 
-    # Create menus for the available tools in Autodesk Maya
-    utils.executeDeferred('mMayaGUI.menuLib.initializeMenus()')
+    if not isInteractive():
+        return False
+
+    menuLib = None
+    for moduleName in MENU_MODULES:
+        menuLib = importModule(moduleName)
+
+    # Create menus for the available tools in Autodesk Maya, menus are populated when they are opened
+    utils.executeDeferred(menuLib.initializeMenus, lazy=True)
+
+    return True
 
 
 if __name__ == '__main__':
 
     main()
-
@@ -0,0 +1,180 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/conftest.py @brief [ FILE ] - Stubs of Maya and the mCore, mApplication packages for the tests.
+## @package tests.conftest    @brief [ FILE ] - Stubs of Maya and the mCore, mApplication packages for the tests.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  sys
+import  types
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import  pytest
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Directory of the python packages.
+PYTHON_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python')
+
+
+#
+## @brief [ CLASS ] - Class provides a module whose functions are mocks, they are created when they are first accessed.
+class StubModule(types.ModuleType):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # BUILT-IN METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Create a mock for given attribute.
+    #
+    #  @param name [ str | None | in  ] - Name of the attribute.
+    #
+    #  @exception AttributeError - If name is a special attribute.
+    #
+    #  @return mock.MagicMock - Mock.
+    def __getattr__(self, name):
+
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        function          = mock.MagicMock(name='{}.{}'.format(self.__name__, name))
+        function.__name__ = name
+
+        setattr(self, name, function)
+
+        return function
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Remove the mocks, so they are created again when they are accessed.
+    #
+    #  @exception N/A
+    #
+    #  @return None
+    def reset(self):
+
+        for name, value in list(vars(self).items()):
+            if isinstance(value, mock.Mock):
+                delattr(self, name)
+
+#
+## @brief [ CLASS ] - Stub of mCore.nameSpaceLib.NameSpace.
+class NameSpace(object):
+
+    def __init__(self, nameSpace=None):
+
+        self._nameSpace = None
+
+        if nameSpace:
+            self.setNameSpace(nameSpace=nameSpace)
+
+    def nameSpace(self):
+
+        return self._nameSpace
+
+    def setNameSpace(self, nameSpace):
+
+        self._nameSpace = nameSpace.rpartition('|')[2].rpartition(':')[0]
+
+        return True
+
+#
+## @brief [ CLASS ] - Stub of mApplication.applicationInfoAbs.ApplicationInfo.
+class ApplicationInfo(object):
+
+    pass
+
+#
+## @brief [ CLASS ] - Stub of mApplication.parentApplicationLib.Application.
+class Application(object):
+
+    kAll  = 'all'
+    kMaya = 'maya'
+    kNuke = 'nuke'
+
+#
+## @brief Create a module and register it in sys.modules.
+#
+#  @param name [ str  | None              | in  ] - Name of the module.
+#  @param cls  [ type | types.ModuleType  | in  ] - Class of the module.
+#
+#  @exception N/A
+#
+#  @return module - Module.
+def _addModule(name, cls=types.ModuleType):
+
+    module = cls(name)
+
+    packageName, _, attributeName = name.rpartition('.')
+    if packageName:
+        setattr(sys.modules[packageName], attributeName, module)
+
+    sys.modules[name] = module
+
+    return module
+
+
+_addModule('maya')
+_addModule('maya.api')
+
+## [ tuple of tests.conftest.StubModule ] - Stubs of Maya modules, they are reset after each test.
+STUB_MODULES = (_addModule('maya.cmds', StubModule),
+                _addModule('maya.mel', StubModule),
+                _addModule('maya.OpenMaya', StubModule),
+                _addModule('maya.api.OpenMaya', StubModule))
+
+_addModule('mCore')
+_addModule('mCore.nameSpaceLib').NameSpace                      = NameSpace
+
+_addModule('mApplication')
+_addModule('mApplication.applicationInfoAbs').ApplicationInfo  = ApplicationInfo
+_addModule('mApplication.parentApplicationLib').Application     = Application
+
+if PYTHON_DIRECTORY not in sys.path:
+    sys.path.insert(0, PYTHON_DIRECTORY)
+
+
+#
+## @brief Reset the stubs of Maya modules after each test.
+#
+#  @exception N/A
+#
+#  @return None
+@pytest.fixture(autouse=True)
+def resetStubModules():
+
+    yield
+
+    for module in STUB_MODULES:
+        module.reset()
@@ -0,0 +1,204 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_applicationManifestLib.py @brief [ FILE ] - Tests of mMayaGUI.applicationManifestLib.
+## @package tests.test_applicationManifestLib    @brief [ FILE ] - Tests of mMayaGUI.applicationManifestLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  sys
+import  types
+import  shutil
+import  tempfile
+import  unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import  mMayaGUI.applicationManifestLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief [ CLASS ] - Class tests the application manifest.
+#
+#  Application info modules are not imported, each module provides one application named after the module.
+class ApplicationManifestTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory      = os.path.realpath(tempfile.mkdtemp())
+        self.pythonPath     = os.path.join(self.directory, 'python')
+        self.manifestFile   = os.path.join(self.directory, 'manifest.json')
+        self.imported       = []
+
+        self._writeFile('appPkg/__init__.py')
+        self._writeFile('appPkg/firstApp.py')
+        self._writeFile('appPkg/firstLib.py')
+        self._writeFile('appPkg/sub/__init__.py')
+        self._writeFile('appPkg/sub/deepApp.py')
+        self._writeFile('notPkg/otherApp.py')
+
+        patches = [mock.patch.dict(os.environ, {'PYTHONPATH': self.pythonPath}),
+                   mock.patch.dict(sys.modules),
+                   mock.patch.object(mMayaGUI.applicationManifestLib, 'getModuleApplications', self._getModuleApplications),
+                   mock.patch.object(mMayaGUI.applicationManifestLib, 'getModuleDependencies', return_value=[]),
+                   mock.patch.object(mMayaGUI.applicationManifestLib, 'findApplicationModules',
+                                     wraps=mMayaGUI.applicationManifestLib.findApplicationModules)]
+
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    def _path(self, fileName):
+
+        return os.path.join(self.pythonPath, *fileName.split('/'))
+
+    def _writeFile(self, fileName, content=''):
+
+        filePath = self._path(fileName)
+
+        if not os.path.isdir(os.path.dirname(filePath)):
+            os.makedirs(os.path.dirname(filePath))
+
+        with open(filePath, 'w') as outFile:
+            outFile.write(content)
+
+    def _touch(self, fileName, offset=10):
+
+        stat = os.stat(self._path(fileName))
+        os.utime(self._path(fileName), (stat.st_atime, stat.st_mtime + offset))
+
+    def _getModuleApplications(self, moduleName):
+
+        self.imported.append(moduleName)
+        sys.modules[moduleName] = types.ModuleType(moduleName)
+
+        return [mMayaGUI.applicationManifestLib.ApplicationRecord({'name': moduleName})]
+
+    def _list(self):
+
+        manifest = mMayaGUI.applicationManifestLib.ApplicationManifest(self.manifestFile)
+        names    = [x.name() for x in manifest.list()]
+
+        return names, manifest.stats()
+
+    def testModulesAreFoundInPackageRoots(self):
+
+        modules = mMayaGUI.applicationManifestLib.findApplicationModules()
+
+        self.assertEqual(modules, [(self._path('appPkg/firstApp.py'), 'appPkg.firstApp')])
+
+    def testSearchedDirectories(self):
+
+        directories = {}
+        mMayaGUI.applicationManifestLib.findApplicationModules(directories=directories)
+
+        self.assertEqual(sorted(directories), [self.pythonPath, self._path('appPkg'), self._path('notPkg')])
+        self.assertEqual(directories[self._path('appPkg')], os.stat(self._path('appPkg')).st_mtime)
+
+    def testWarmListDoesNotSearchOrImport(self):
+
+        names, stats = self._list()
+
+        self.assertEqual(names, ['appPkg.firstApp'])
+        self.assertTrue(stats['searched'])
+        self.assertEqual(stats['importedModules'], 1)
+
+        mMayaGUI.applicationManifestLib.findApplicationModules.reset_mock()
+        self.imported = []
+
+        names, stats = self._list()
+
+        self.assertEqual(names, ['appPkg.firstApp'])
+        self.assertFalse(stats['searched'])
+        self.assertEqual((stats['cachedModules'], stats['importedModules']), (1, 0))
+        self.assertFalse(mMayaGUI.applicationManifestLib.findApplicationModules.called)
+        self.assertEqual(self.imported, [])
+
+    def testChangedModuleIsImportedWithoutSearching(self):
+
+        self._list()
+        self._writeFile('appPkg/firstApp.py', '# Changed\n')
+
+        names, stats = self._list()
+
+        self.assertFalse(stats['searched'])
+        self.assertEqual(stats['importedModules'], 1)
+
+    def testAddedModuleIsFound(self):
+
+        self._list()
+        self._writeFile('appPkg/secondApp.py')
+        self._touch('appPkg')
+
+        names, stats = self._list()
+
+        self.assertTrue(stats['searched'])
+        self.assertEqual(names, ['appPkg.firstApp', 'appPkg.secondApp'])
+        self.assertEqual((stats['cachedModules'], stats['importedModules']), (1, 1))
+
+    def testNewPackageIsFound(self):
+
+        self._list()
+        self._writeFile('notPkg/__init__.py')
+        self._touch('notPkg')
+
+        names, stats = self._list()
+
+        self.assertTrue(stats['searched'])
+        self.assertEqual(names, ['appPkg.firstApp', 'notPkg.otherApp'])
+
+    def testChangedPythonPathSearches(self):
+
+        self._list()
+
+        otherPath = os.path.join(self.directory, 'other')
+        os.makedirs(otherPath)
+
+        with mock.patch.dict(os.environ, {'PYTHONPATH': os.pathsep.join([self.pythonPath, otherPath])}):
+            names, stats = self._list()
+
+        self.assertTrue(stats['searched'])
+        self.assertEqual(names, ['appPkg.firstApp'])
+
+    def testModuleWhichCanNotBeImportedIsRetried(self):
+
+        with mock.patch.object(mMayaGUI.applicationManifestLib, 'getModuleApplications', return_value=None):
+            names, stats = self._list()
+
+        self.assertEqual(names, [])
+
+        names, stats = self._list()
+
+        self.assertFalse(stats['searched'])
+        self.assertEqual(names, ['appPkg.firstApp'])
@@ -0,0 +1,108 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_applicationSearchLib.py @brief [ FILE ] - Tests of mMayaGUI.applicationSearchLib.
+## @package tests.test_applicationSearchLib    @brief [ FILE ] - Tests of mMayaGUI.applicationSearchLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  unittest
+
+import  mMayaGUI.applicationManifestLib
+import  mMayaGUI.applicationSearchLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief Create an application record.
+#
+#  @param name        [ str         | None | in  ] - Name of the application.
+#  @param menuPath    [ str         | None | in  ] - Full menu path of the application.
+#  @param keywords    [ list of str | None | in  ] - Keywords of the application.
+#  @param description [ str         | ''   | in  ] - Description of the application.
+#
+#  @exception N/A
+#
+#  @return mMayaGUI.applicationManifestLib.ApplicationRecord - Record.
+def createRecord(name, menuPath, keywords, description=''):
+
+    return mMayaGUI.applicationManifestLib.ApplicationRecord({'name'        : name,
+                                                              'fullMenuPath': menuPath,
+                                                              'keywords'    : keywords,
+                                                              'description' : description})
+
+#
+## @brief [ CLASS ] - Class tests the application search index.
+class ApplicationSearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.applications = [createRecord('Duplicate Selected Nodes', 'Meco/Reference/Duplicate', ['reference', 'copy']),
+                             createRecord('Remove Selected Nodes', 'Meco/Reference/Remove', ['reference', 'delete']),
+                             createRecord('Delete Unknown Nodes', 'Meco/Node/DeleteUnknown', ['cleanup'], 'Deletes unknown nodes.'),
+                             createRecord('displayNodeType', 'Meco/Node/DisplayNodeType', [])]
+
+        self.index = mMayaGUI.applicationSearchLib.ApplicationSearchIndex(self.applications)
+
+    def _names(self, query, **kwargs):
+
+        return [x.name() for x in self.index.search(query, **kwargs)]
+
+    def testTokenize(self):
+
+        self.assertEqual(mMayaGUI.applicationSearchLib.tokenize('displayNodeType UI2 Meco/Reference'),
+                         ['display', 'node', 'type', 'ui', '2', 'meco', 'reference'])
+
+    def testExactMatchesRankByFieldWeight(self):
+
+        self.assertEqual(self._names('delete'), ['Delete Unknown Nodes', 'Remove Selected Nodes'])
+
+    def testPrefixMatch(self):
+
+        self.assertEqual(self._names('dup'), ['Duplicate Selected Nodes'])
+
+    def testAllTermsMustMatch(self):
+
+        self.assertEqual(self._names('selected remove'), ['Remove Selected Nodes'])
+        self.assertEqual(self._names('unknown reference'), [])
+
+    def testCamelCaseNamesAreSplit(self):
+
+        self.assertEqual(self._names('type'), ['displayNodeType'])
+
+    def testFuzzyMatch(self):
+
+        self.assertEqual(self._names('duplicte'), ['Duplicate Selected Nodes'])
+        self.assertEqual(self._names('duplicte', fuzzy=False), [])
+
+    def testLimit(self):
+
+        self.assertEqual(len(self._names('nodes', limit=2)), 2)
+        self.assertEqual(len(self._names('nodes', limit=None)), 4)
+
+    def testEmptyQuery(self):
+
+        self.assertEqual(self._names(''), [])
+        self.assertEqual(self._names('  '), [])
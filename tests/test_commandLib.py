@@ -0,0 +1,92 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_commandLib.py @brief [ FILE ] - Tests of mMayaGUI.commandLib.
+## @package tests.test_commandLib    @brief [ FILE ] - Tests of mMayaGUI.commandLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  sys
+import  unittest
+
+import  __main__
+
+from    maya import cmds
+
+import  mMayaGUI.commandLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief [ CLASS ] - Class tests running commands through the command dispatcher.
+class CommandDispatcherTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.dispatcher = mMayaGUI.commandLib.CommandDispatcher()
+
+    def tearDown(self):
+
+        __main__.__dict__.pop('commandLibTestValue', None)
+
+    def testCommandIsCompiledOnce(self):
+
+        self.dispatcher.run('commandLibTestValue = 1')
+        self.dispatcher.run('commandLibTestValue += 1')
+        self.dispatcher.run('commandLibTestValue += 1', False)
+
+        self.assertEqual(__main__.commandLibTestValue, 3)
+        self.assertEqual(self.dispatcher.stats()['runs'], 3)
+        self.assertEqual(self.dispatcher.stats()['compiles'], 2)
+
+    def testDispatchCommandIsAString(self):
+
+        command = mMayaGUI.commandLib.getDispatchCommand('commandLibTestValue = "it\'s"')
+
+        exec(command, {})
+        exec(command, {})
+
+        self.assertEqual(__main__.commandLibTestValue, "it's")
+        self.assertEqual(mMayaGUI.commandLib.getCommandDispatcher().stats()['compiles'], 1)
+
+    def testGetImportedModules(self):
+
+        modules = mMayaGUI.commandLib.getImportedModules('import a.b, c\nfrom d import e\nfrom . import f\nx = 1')
+
+        self.assertEqual(modules, ['a.b', 'c', 'd'])
+        self.assertEqual(mMayaGUI.commandLib.getImportedModules('import ('), [])
+
+    def testPreImport(self):
+
+        count = self.dispatcher.preImport(['import json;import commandLibMissingModule', 'import json', None, 'import ('])
+
+        self.assertEqual(count, 1 if 'json' in sys.modules else 2)
+        self.assertEqual(cmds.evalDeferred.call_count, 1)
+
+        while cmds.evalDeferred.call_args_list:
+            callback = cmds.evalDeferred.call_args_list.pop(0)[0][0]
+            callback()
+
+        self.assertEqual(self.dispatcher.stats()['preImportFailed'], 1)
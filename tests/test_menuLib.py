@@ -0,0 +1,276 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_menuLib.py @brief [ FILE ] - Tests of mMayaGUI.menuLib.
+## @package tests.test_menuLib    @brief [ FILE ] - Tests of mMayaGUI.menuLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  unittest
+
+from    maya import cmds
+from    maya import mel
+
+import  mMayaGUI.commandLib
+import  mMayaGUI.menuLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief [ CLASS ] - Class tests building menu trees in a scene which has no menus.
+class MenuTreeBuildTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tree = mMayaGUI.menuLib.MenuTree()
+        self.tree.addItem('Meco/Tools/First', 'pass')
+        self.tree.addItem('Meco/Tools/Second', 'pass')
+        self.tree.addItem('Meco/Node/Third', 'pass')
+        self.tree.addItem('Other/Fourth', 'pass')
+
+        self.existing = set()
+
+        cmds.menu.side_effect       = self._exists
+        cmds.menuItem.side_effect   = self._exists
+        mel.eval.return_value       = 'MayaWindow'
+
+    def _exists(self, name, **kwargs):
+
+        if kwargs.get('q') and kwargs.get('ex'):
+            return name in self.existing
+
+        return name
+
+    def _created(self, function):
+
+        return [x[0][0] for x in function.call_args_list if not x[1].get('q')]
+
+    def testMainWindowIsResolvedOnce(self):
+
+        self.tree.build()
+
+        mel.eval.assert_called_once_with('$temp1=$gMainWindow')
+
+    def testEachMenuIsCreatedOnce(self):
+
+        self.tree.build()
+
+        self.assertEqual(self._created(cmds.menu), ['Meco_Meco', 'Meco_Other'])
+        self.assertEqual(self._created(cmds.menuItem), ['Meco_Meco_Tools',
+                                                        'Meco_Meco_Tools_First',
+                                                        'Meco_Meco_Tools_Second',
+                                                        'Meco_Meco_Node',
+                                                        'Meco_Meco_Node_Third',
+                                                        'Meco_Other_Fourth'])
+
+    def testChildrenOfCreatedMenusAreNotQueried(self):
+
+        self.tree.build()
+
+        queried = [x[0][0] for x in cmds.menu.call_args_list + cmds.menuItem.call_args_list if x[1].get('q')]
+
+        self.assertEqual(queried, ['Meco_Meco', 'Meco_Other'])
+
+    def testReport(self):
+
+        report = self.tree.build()
+
+        self.assertEqual(report['items'], 4)
+        self.assertEqual(report['uiCalls'], self.tree.uiCallCount())
+        self.assertEqual(report['savedUICalls'], report['legacyUICalls'] - report['uiCalls'])
+        self.assertTrue(report['savedUICalls'] > 0)
+
+#
+## @brief [ CLASS ] - Class tests building menu trees over the menus which already exist in Maya.
+class MenuTreeRebuildTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tree = mMayaGUI.menuLib.MenuTree()
+        self.item = self.tree.addItem('Meco/Tools/Item', 'pass', addSeparator=True)
+
+        self.existing = set(['Meco_Meco', 'Meco_Meco_Tools', self.item.name])
+
+        cmds.menu.side_effect       = self._exists
+        cmds.menuItem.side_effect   = self._exists
+
+    def _exists(self, name, **kwargs):
+
+        if kwargs.get('q') and kwargs.get('ex'):
+            return name in self.existing
+
+        return name
+
+    def _deleted(self):
+
+        return [x[0][0] for x in cmds.deleteUI.call_args_list]
+
+    def testSeparatorOfRecreatedItemIsDeleted(self):
+
+        self.existing.add(self.item.separatorName())
+
+        self.tree.build()
+
+        self.assertEqual(self._deleted(), [self.item.name, self.item.separatorName()])
+
+    def testMissingSeparatorIsNotDeleted(self):
+
+        self.tree.build()
+
+        self.assertEqual(self._deleted(), [self.item.name])
+
+    def testSeparatorIsCreatedBeforeItem(self):
+
+        self.tree.build()
+
+        created = [x[0][0] for x in cmds.menuItem.call_args_list if not x[1].get('q')]
+
+        self.assertEqual(created, [self.item.separatorName(), self.item.name])
+
+#
+## @brief [ CLASS ] - Class tests updating built menu trees.
+class MenuTreeUpdateTest(unittest.TestCase):
+
+    def setUp(self):
+
+        cmds.menu.return_value      = False
+        cmds.menuItem.return_value  = False
+
+        self.tree = mMayaGUI.menuLib.MenuTree()
+        self.tree.addItem('Meco/Tools/First', 'pass')
+        self.tree.addItem('Meco/Tools/Second', 'pass')
+        self.tree.build()
+
+        cmds.reset()
+
+    def _createTree(self, items):
+
+        tree = mMayaGUI.menuLib.MenuTree()
+        for path, command in items:
+            tree.addItem(path, command)
+
+        return tree
+
+    def testUnchangedTreeMakesNoCalls(self):
+
+        report = self.tree.update(self._createTree([('Meco/Tools/First', 'pass'), ('Meco/Tools/Second', 'pass')]))
+
+        self.assertEqual((report['added'], report['removed'], report['updated'], report['uiCalls']), (0, 0, 0, 0))
+
+    def testOnlyChangesAreApplied(self):
+
+        report = self.tree.update(self._createTree([('Meco/Tools/First', 'print(1)'), ('Meco/Tools/Third', 'pass')]))
+
+        self.assertEqual((report['added'], report['removed'], report['updated']), (1, 1, 1))
+        cmds.deleteUI.assert_called_once_with('Meco_Meco_Tools_Second')
+        self.assertEqual([x[0][0] for x in cmds.menuItem.call_args_list], ['Meco_Meco_Tools_First', 'Meco_Meco_Tools_Third'])
+        self.assertEqual(cmds.menuItem.call_args_list[1][1]['ia'], 'Meco_Meco_Tools_First')
+        self.assertFalse(cmds.menu.called)
+
+#
+## @brief [ CLASS ] - Class tests commands of the menu items.
+class MenuItemCommandTest(unittest.TestCase):
+
+    def setUp(self):
+
+        cmds.menu.return_value      = False
+        cmds.menuItem.return_value  = False
+
+        self.tree = mMayaGUI.menuLib.MenuTree()
+        self.tree.addItem('Meco/Tools/Command', 'print(1)')
+        self.tree.addItem('Meco/Tools/Empty', None)
+        self.tree.build()
+
+    def _kwargs(self, name):
+
+        return [x[1] for x in cmds.menuItem.call_args_list if x[0][0] == name][-1]
+
+    def testCommandIsAString(self):
+
+        self.assertEqual(self._kwargs('Meco_Meco_Tools_Command')['c'], mMayaGUI.commandLib.getDispatchCommand('print(1)'))
+        self.assertEqual(mMayaGUI.menuLib.getMenuItemCommand('print(1)'),
+                         "import mMayaGUI.commandLib;mMayaGUI.commandLib.getCommandDispatcher().run('print(1)')")
+
+    def testEmptyCommandIsOmitted(self):
+
+        self.assertFalse('c' in self._kwargs('Meco_Meco_Tools_Empty'))
+
+    def testUpdatedCommands(self):
+
+        tree = mMayaGUI.menuLib.MenuTree()
+        tree.addItem('Meco/Tools/Command', None)
+        tree.addItem('Meco/Tools/Empty', 'print(2)')
+
+        self.tree.update(tree)
+
+        self.assertEqual(self._kwargs('Meco_Meco_Tools_Command')['c'], '')
+        self.assertEqual(self._kwargs('Meco_Meco_Tools_Empty')['c'], mMayaGUI.commandLib.getDispatchCommand('print(2)'))
+
+#
+## @brief [ CLASS ] - Class tests lazily built menu trees.
+class MenuTreeLazyBuildTest(unittest.TestCase):
+
+    def setUp(self):
+
+        cmds.menu.return_value      = False
+        cmds.menuItem.return_value  = False
+
+        self.tree = mMayaGUI.menuLib.MenuTree()
+        self.tree.addItem('Meco/Tools/First', 'pass')
+        self.tree.addItem('Meco/Tools/Second', 'pass')
+        self.tree.addItem('Meco/Third', 'pass')
+        self.tree.build(lazy=True)
+
+    def _created(self):
+
+        return [x[0][0] for x in cmds.menuItem.call_args_list]
+
+    def _postMenuCommand(self, function, name):
+
+        return [x[1]['pmc'] for x in function.call_args_list if x[0][0] == name and 'pmc' in x[1]][-1]
+
+    def testOnlyMainMenusAreCreated(self):
+
+        self.assertEqual([x[0][0] for x in cmds.menu.call_args_list if not x[1].get('q') and not x[1].get('e')], ['Meco_Meco'])
+        self.assertFalse(cmds.menuItem.called)
+
+    def testMenuIsPopulatedWhenItIsOpened(self):
+
+        self._postMenuCommand(cmds.menu, 'Meco_Meco')()
+
+        self.assertEqual(self._created(), ['Meco_Meco_Tools', 'Meco_Meco_Third'])
+        self.assertEqual(cmds.menuItem.call_args_list[1][1]['c'], mMayaGUI.commandLib.getDispatchCommand('pass'))
+
+        self._postMenuCommand(cmds.menuItem, 'Meco_Meco_Tools')()
+
+        self.assertEqual(self._created(), ['Meco_Meco_Tools', 'Meco_Meco_Third', 'Meco_Meco_Tools_First', 'Meco_Meco_Tools_Second'])
+
+    def testMenuIsPopulatedOnce(self):
+
+        postMenuCommand = self._postMenuCommand(cmds.menu, 'Meco_Meco')
+        postMenuCommand()
+        postMenuCommand()
+
+        self.assertEqual(self._created(), ['Meco_Meco_Tools', 'Meco_Meco_Third'])
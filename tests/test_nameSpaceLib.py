@@ -0,0 +1,497 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_nameSpaceLib.py @brief [ FILE ] - Tests of mMayaCore.nameSpaceLib.
+## @package tests.test_nameSpaceLib    @brief [ FILE ] - Tests of mMayaCore.nameSpaceLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from    maya import cmds
+from    maya.api import OpenMaya
+
+import  mMayaCore.nameSpaceLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief [ CLASS ] - Class provides the queries of mMayaCore.nameSpaceLib.NameSpaceTree from given nodes.
+class NameSpaceTreeStub(object):
+
+    def __init__(self, nodes):
+
+        ## [ dict ] - Keys are namespaces, values are names of their nodes.
+        self._nodes = {'': []}
+
+        for nameSpace, names in nodes.items():
+
+            self._nodes.setdefault(nameSpace, []).extend(names)
+
+            while nameSpace:
+                nameSpace = nameSpace.rpartition(':')[0]
+                self._nodes.setdefault(nameSpace, [])
+
+    def isInstalled(self):
+
+        return False
+
+    def invalidate(self):
+
+        pass
+
+    def nameSpaces(self):
+
+        return sorted([x for x in self._nodes if x])
+
+    def children(self, nameSpace=''):
+
+        return sorted([x for x in self._nodes if x and x.rpartition(':')[0] == nameSpace])
+
+    def count(self, nameSpace, recursive=False):
+
+        return len(self._nodes.get(nameSpace, []))
+
+    def nodes(self, nameSpace, recursive=False):
+
+        return ['{}:{}'.format(nameSpace, x) if nameSpace else x for x in self._nodes.get(nameSpace, [])]
+
+#
+## @brief [ CLASS ] - Class provides a node, its function set and its handle for the namespace tree.
+class NodeStub(object):
+
+    def __init__(self, name):
+
+        self._name = name
+
+    def name(self):
+
+        return self._name
+
+    def hashCode(self):
+
+        return hash(self._name)
+
+    def isValid(self):
+
+        return True
+
+    def object(self):
+
+        return self
+
+    def hasFn(self, fn):
+
+        return False
+
+#
+## @brief [ CLASS ] - Class tests building the namespace tree and keeping it up to date.
+class NameSpaceTreeTest(unittest.TestCase):
+
+    def setUp(self):
+
+        ## [ dict ] - Callbacks, keys are ids, values are tuples which contain message type and function.
+        self.callbacks = {}
+
+        cmds.namespaceInfo.return_value = [':UI', ':char01', ':char01:rig']
+
+        iterator = OpenMaya.MItDependencyNodes.return_value
+        iterator.isDone.side_effect     = lambda: not self.nodes
+        iterator.thisNode.side_effect   = lambda: self.nodes.pop(0)
+
+        OpenMaya.MFnDependencyNode.return_value.setObject.side_effect   = lambda x: x
+        OpenMaya.MObjectHandle.side_effect                              = lambda x: x
+
+        OpenMaya.MSceneMessage.addCallback.side_effect                  = self._addCallback
+        OpenMaya.MDGMessage.addNodeAddedCallback.side_effect            = lambda x, y: self._addCallback('nodeAdded', x)
+        OpenMaya.MDGMessage.addNodeRemovedCallback.side_effect          = lambda x, y: self._addCallback('nodeRemoved', x)
+        OpenMaya.MNodeMessage.addNameChangedCallback.side_effect        = lambda x, y: self._addCallback('nameChanged', y)
+        OpenMaya.MMessage.removeCallbacks.side_effect                   = lambda ids: [self.callbacks.pop(x, None) for x in ids]
+
+        self.tree = mMayaCore.nameSpaceLib.NameSpaceTree()
+
+        self._setNodes()
+
+    def tearDown(self):
+
+        self.tree.uninstall()
+
+    def _setNodes(self):
+
+        self.nodes = [NodeStub(x) for x in ('persp', 'char01:body', 'char01:head', 'char01:rig:root')]
+
+    def _addCallback(self, messageType, function):
+
+        callbackId = len(self.callbacks) + 100
+        while callbackId in self.callbacks:
+            callbackId += 1
+
+        self.callbacks[callbackId] = (messageType, function)
+
+        return callbackId
+
+    def _emit(self, message):
+
+        messageType = getattr(OpenMaya.MSceneMessage, message)
+
+        for callbackType, function in list(self.callbacks.values()):
+            if callbackType is messageType:
+                function(None)
+
+    def _nodeCallbacks(self):
+
+        return sorted([x[0] for x in self.callbacks.values() if isinstance(x[0], str)])
+
+    def testQueries(self):
+
+        self.assertEqual(self.tree.children(), ['UI', 'char01'])
+        self.assertEqual(self.tree.children('char01'), ['char01:rig'])
+        self.assertEqual(self.tree.parent('char01:rig'), 'char01')
+        self.assertEqual(self.tree.count('char01'), 2)
+        self.assertEqual(self.tree.count(':char01', recursive=True), 3)
+        self.assertEqual(self.tree.nodes('char01:rig'), ['char01:rig:root'])
+        self.assertTrue('char01:rig' in self.tree)
+
+    def testSnapshotIsBuiltOnce(self):
+
+        self.tree.nameSpaces()
+        self.tree.count('char01')
+
+        self.assertEqual(self.tree.stats()['builds'], 1)
+        self.assertEqual(self.callbacks, {})
+
+        self.tree.invalidate()
+        self._setNodes()
+        self.tree.nameSpaces()
+
+        self.assertEqual(self.tree.stats()['builds'], 2)
+
+    def testSessionTreeIsNotInstalled(self):
+
+        mMayaCore.nameSpaceLib.NameSpacePlan()
+
+        self.assertFalse(mMayaCore.nameSpaceLib.getNameSpaceTree().isInstalled())
+        self.assertEqual(self.callbacks, {})
+
+    def testNodeCallbacksExistWhileTreeIsBuilt(self):
+
+        self.tree.install()
+
+        self.assertFalse(self.tree.isTracking())
+
+        self.tree.nameSpaces()
+
+        self.assertEqual(self._nodeCallbacks(), ['nameChanged', 'nodeAdded', 'nodeRemoved'])
+
+        self._emit('kBeforeOpen')
+
+        self.assertFalse(self.tree.isBuilt())
+        self.assertEqual(self._nodeCallbacks(), [])
+
+        self._emit('kAfterOpen')
+        self._setNodes()
+        self.tree.nameSpaces()
+
+        self.assertEqual(self.tree.stats()['builds'], 2)
+        self.assertEqual(self._nodeCallbacks(), ['nameChanged', 'nodeAdded', 'nodeRemoved'])
+
+    def testAddedNodeUpdatesTree(self):
+
+        self.tree.install()
+        self.tree.count('char01')
+
+        function = [x[1] for x in self.callbacks.values() if x[0] == 'nodeAdded'][0]
+        OpenMaya.MFnDependencyNode.side_effect = lambda x: x
+        function(NodeStub('char01:hand'))
+
+        self.assertEqual(self.tree.count('char01'), 3)
+        self.assertEqual(self.tree.stats()['builds'], 1)
+        self.assertEqual(self.tree.stats()['updates'], 1)
+
+#
+## @brief [ CLASS ] - Class tests resolving namespace plans.
+class NameSpacePlanResolveTest(unittest.TestCase):
+
+    def setUp(self):
+
+        cmds.ls.return_value = []
+
+        self.tree = NameSpaceTreeStub({'char01'         : ['body'],
+                                       'char01:rig'     : ['root'],
+                                       'hero'           : ['body', 'head'],
+                                       'prop:geo'       : ['box'],
+                                       'prop:geo:sub'   : ['lid'],
+                                       'tmp:empty'      : [],
+                                       'UI'             : ['menu']})
+
+        self.plan = mMayaCore.nameSpaceLib.NameSpacePlan(tree=self.tree)
+
+    def testRenameToNewNameSpace(self):
+
+        self.plan.rename('char01', 'villain')
+
+        report = self.plan.resolve()
+
+        self.assertEqual(report['errors'], [])
+        self.assertEqual(report['operations'], [{'operation'    : 'rename',
+                                                 'nameSpace'    : 'char01',
+                                                 'target'       : 'villain',
+                                                 'flags'        : {'rename': (':char01', 'villain'), 'parent': ':'}}])
+
+    def testRenameAddsMissingParents(self):
+
+        self.plan.rename('char01', 'cast:main:villain')
+
+        operations = self.plan.resolve()['operations']
+
+        self.assertEqual([x['operation'] for x in operations], ['add', 'add', 'rename'])
+        self.assertEqual(operations[0]['flags'], {'add': 'cast', 'parent': ':'})
+        self.assertEqual(operations[1]['flags'], {'add': 'main', 'parent': ':cast'})
+        self.assertEqual(operations[2]['flags'], {'rename': (':char01', 'villain'), 'parent': ':cast:main'})
+
+    def testRenameToExistingNameSpaceMerges(self):
+
+        self.plan.rename('char01', 'hero')
+
+        report = self.plan.resolve()
+
+        self.assertEqual([x['operation'] for x in report['operations']], ['merge', 'remove'])
+        self.assertEqual(report['operations'][0]['flags'], {'moveNamespace': (':char01', ':hero'), 'force': True})
+        self.assertEqual(report['conflicts'], [{'nameSpace': 'char01', 'target': 'hero', 'nodes': ['body']}])
+
+    def testMergeIntoParent(self):
+
+        self.plan.merge('prop:geo')
+
+        operations = self.plan.resolve()['operations']
+
+        self.assertEqual(operations, [{'operation'  : 'merge',
+                                       'nameSpace'  : 'prop:geo',
+                                       'target'     : 'prop',
+                                       'flags'      : {'removeNamespace': ':prop:geo', 'mergeNamespaceWithParent': True}}])
+
+    def testNestedNameSpacesAreResolvedFirst(self):
+
+        self.plan.rename('char01', 'villain')
+        self.plan.rename('char01:rig', 'rig')
+
+        operations = self.plan.resolve()['operations']
+
+        self.assertEqual([(x['nameSpace'], x['target']) for x in operations], [('char01:rig', 'rig'), ('char01', 'villain')])
+
+    def testChainedRequestsFollowEarlierOperations(self):
+
+        self.plan.rename('char01', 'villain')
+        self.plan.rename('char01:rig', 'char01:skeleton')
+
+        operations = self.plan.resolve()['operations']
+
+        self.assertEqual([(x['nameSpace'], x['target']) for x in operations], [('char01:rig', 'char01:skeleton'),
+                                                                               ('char01', 'villain')])
+
+    def testFlattenMergesLevelByLevel(self):
+
+        self.assertEqual(self.plan.flatten('prop'), 2)
+
+        operations = self.plan.resolve()['operations']
+
+        self.assertEqual([(x['nameSpace'], x['target']) for x in operations], [('prop:geo:sub', 'prop:geo'), ('prop:geo', 'prop')])
+        self.assertTrue(all([x['flags'].get('mergeNamespaceWithParent') for x in operations]))
+
+    def testInvalidRequestsAreReported(self):
+
+        self.plan.rename('missing', 'other')
+        self.plan.rename('char01', 'char01:rig:inner')
+        self.plan.rename('UI', 'other')
+        self.plan.rename('hero', 'prop')
+        self.plan.rename('prop', 'hero')
+
+        report = self.plan.resolve()
+        errors = dict((x['nameSpace'], x['error']) for x in report['errors'])
+
+        self.assertEqual(report['operations'], [])
+        self.assertEqual(errors, {'missing' : 'Namespace does not exist',
+                                  'char01'  : 'Namespace can not be moved into its nested namespace',
+                                  'UI'      : 'Default namespaces can not be changed',
+                                  'hero'    : 'Requests are cyclic',
+                                  'prop'    : 'Requests are cyclic'})
+
+    def testRemoveEmptyNameSpaces(self):
+
+        self.plan.removeEmpty()
+
+        operations = self.plan.resolve()['operations']
+
+        self.assertEqual([x['nameSpace'] for x in operations], ['tmp:empty', 'tmp'])
+        self.assertEqual(operations[0]['flags'], {'removeNamespace': ':tmp:empty'})
+
+    def testRemoveEmptyKeepsReferenceNameSpaces(self):
+
+        cmds.ls.return_value                = ['emptyRN']
+        cmds.referenceQuery.return_value    = ':tmp:empty'
+
+        self.plan.removeEmpty()
+
+        self.assertEqual(self.plan.resolve()['operations'], [])
+
+#
+## @brief [ CLASS ] - Class tests running namespace plans.
+class NameSpacePlanRunTest(unittest.TestCase):
+
+    def setUp(self):
+
+        cmds.ls.return_value = []
+
+        tree      = NameSpaceTreeStub({'a': ['x'], 'b': ['y']})
+        self.plan = mMayaCore.nameSpaceLib.NameSpacePlan(tree=tree)
+
+        self.plan.rename('a', 'c')
+        self.plan.rename('b', 'd')
+
+    def testDryRunDoesNotChangeTheScene(self):
+
+        report = self.plan.run(dryRun=True)
+
+        self.assertEqual(report['commands'], 2)
+        self.assertEqual(report['completed'], 0)
+        self.assertFalse(cmds.namespace.called)
+
+    def testFailedPlanIsRolledBack(self):
+
+        cmds.namespace.side_effect      = [None, RuntimeError('failed')]
+        cmds.undoInfo.return_value      = True
+
+        report = self.plan.run()
+
+        self.assertEqual(report['completed'], 1)
+        self.assertTrue(report['rolledBack'])
+        self.assertEqual(report['errors'][-1]['error'], 'failed')
+        cmds.undo.assert_called_once_with()
+
+#
+## @brief [ CLASS ] - Class tests namespace batches.
+class NameSpaceBatchTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.batch = mMayaCore.nameSpaceLib.NameSpaceBatch(['char01:body', '|char01:grp|char01:rig:root', 'persp', 'char01:head'])
+
+    def testParse(self):
+
+        self.assertEqual(len(self.batch), 4)
+        self.assertEqual(self.batch.nameSpaces(), ['', 'char01', 'char01:rig'])
+        self.assertEqual(list(self.batch.nameSpaceIds()), [1, 2, 0, 1])
+        self.assertEqual(self.batch.shortNames(), ['body', 'root', 'persp', 'head'])
+        self.assertEqual(self.batch.name(1), '|char01:grp|char01:rig:root')
+        self.assertEqual(self.batch.nameSpace(1), 'char01:rig')
+        self.assertEqual(self.batch.counts(), [1, 2, 1])
+
+    def testIndices(self):
+
+        self.assertEqual(list(self.batch.indices('char01')), [0, 3])
+        self.assertEqual(list(self.batch.indices(':char01:rig:')), [1])
+        self.assertEqual(list(self.batch.indices('')), [2])
+        self.assertEqual(list(self.batch.indices('missing')), [])
+
+    def testParseReplacesResults(self):
+
+        self.batch.indices('char01')
+
+        self.assertEqual(self.batch.parse(['a:b']), 1)
+        self.assertEqual(list(self.batch.indices('a')), [0])
+        self.assertEqual(list(self.batch.indices('char01')), [])
+
+    def testEmptyNames(self):
+
+        self.assertEqual(len(mMayaCore.nameSpaceLib.NameSpaceBatch([])), 0)
+        self.assertEqual(len(mMayaCore.nameSpaceLib.NameSpaceBatch([''])), 1)
+        self.assertEqual(mMayaCore.nameSpaceLib.NameSpaceBatch(['', 'a:b', '']).shortNames(), ['', 'b', ''])
+
+    def testNewLinesAreRejected(self):
+
+        self.assertRaises(ValueError, mMayaCore.nameSpaceLib.NameSpaceBatch, ['a:b\nc'])
+
+    def testNameSpacesAreDeduplicatedAcrossBuffers(self):
+
+        with mock.patch.object(mMayaCore.nameSpaceLib, '_BATCH_CHUNK_SIZE', 3):
+            batch = mMayaCore.nameSpaceLib.NameSpaceBatch(['b:x', 'a:x', 'b:y', 'c:x', 'a:y', 'persp', 'b:z'])
+
+        self.assertEqual(batch.nameSpaces(), ['', 'a', 'b', 'c'])
+        self.assertEqual(list(batch.nameSpaceIds()), [2, 1, 2, 3, 1, 0, 2])
+        self.assertEqual(batch.counts(), [1, 2, 3, 1])
+
+    def testNewLinesAreRejectedInLaterBuffers(self):
+
+        with mock.patch.object(mMayaCore.nameSpaceLib, '_BATCH_CHUNK_SIZE', 2):
+            self.assertRaises(ValueError, mMayaCore.nameSpaceLib.NameSpaceBatch, ['a:b', 'c:d', 'e\nf'])
+
+#
+## @brief [ CLASS ] - Class tests allocating free namespaces.
+class NameSpaceAllocatorTest(unittest.TestCase):
+
+    def setUp(self):
+
+        cmds.namespaceInfo.return_value = [':UI', ':shared', ':char', ':char1', ':char3', ':char1:rig']
+
+        self.allocator = mMayaCore.nameSpaceLib.NameSpaceAllocator()
+
+    def testNameSpacesAreQueriedOnce(self):
+
+        self.allocator.allocateMany('char', 10)
+        self.allocator.allocate('prop')
+
+        cmds.namespaceInfo.assert_called_once_with(':', listOnlyNamespaces=True, recurse=True, absoluteName=True)
+        self.assertTrue(':char1:rig:' in self.allocator)
+
+    def testFreeBaseNameIsAllocated(self):
+
+        self.assertEqual(self.allocator.allocate('prop'), 'prop')
+        self.assertEqual(self.allocator.allocate(':prop'), 'prop1')
+
+    def testExistingNameSpacesAreSkipped(self):
+
+        self.assertEqual(self.allocator.allocateMany('char', 3), ['char2', 'char4', 'char5'])
+
+    def testReservedNameSpacesAreSkipped(self):
+
+        self.allocator.reserve('prop')
+        self.allocator.reserve('prop1')
+
+        self.assertEqual(self.allocator.allocate('prop'), 'prop2')
+
+    def testSnapshotIsOptional(self):
+
+        cmds.reset()
+
+        allocator = mMayaCore.nameSpaceLib.NameSpaceAllocator(snapshot=False)
+
+        self.assertEqual(len(allocator), 0)
+        self.assertEqual(allocator.allocate('char'), 'char')
+        self.assertFalse(cmds.namespaceInfo.called)
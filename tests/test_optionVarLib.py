@@ -0,0 +1,153 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_optionVarLib.py @brief [ FILE ] - Tests of mMayaCore.optionVarLib.
+## @package tests.test_optionVarLib    @brief [ FILE ] - Tests of mMayaCore.optionVarLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  unittest
+
+from    maya import cmds
+
+import  mMayaCore.optionVarLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief [ CLASS ] - Class tests the write-back cache of option variables.
+class OptionVarStoreTest(unittest.TestCase):
+
+    def setUp(self):
+
+        cmds.optionVar.side_effect  = self._optionVar
+        cmds.scriptJob.side_effect  = self._scriptJob
+
+        ## [ dict ] - Option variables in Maya.
+        self.values = {'toolSize': 1}
+
+        ## [ dict ] - Scheduled idle events, keys are ids.
+        self.jobs   = {}
+
+        self.store = mMayaCore.optionVarLib.OptionVarStore()
+        self.store.install()
+
+    def _optionVar(self, **kwargs):
+
+        if 'exists' in kwargs:
+            return kwargs['exists'] in self.values
+
+        if 'q' in kwargs:
+            return self.values[kwargs['q']]
+
+        if 'remove' in kwargs:
+            self.values.pop(kwargs['remove'], None)
+            return None
+
+        if kwargs.get('list'):
+            return sorted(self.values)
+
+        for flag in ('sv', 'iv', 'fv'):
+            if flag in kwargs:
+                self.values[kwargs[flag][0]] = kwargs[flag][1]
+
+        return None
+
+    def _scriptJob(self, **kwargs):
+
+        if 'idleEvent' in kwargs:
+            self.jobs[len(self.jobs) + 1] = kwargs['idleEvent']
+            return len(self.jobs)
+
+        if 'exists' in kwargs:
+            return kwargs['exists'] in self.jobs
+
+        if 'kill' in kwargs:
+            del self.jobs[kwargs['kill']]
+
+        return None
+
+    def _runIdleEvents(self):
+
+        for job in list(self.jobs):
+            self.jobs.pop(job)()
+
+    def testValueIsQueriedOnce(self):
+
+        self.assertEqual(self.store.value('toolSize'), 1)
+        self.assertEqual(self.store.value('toolSize'), 1)
+        self.assertFalse(self.store.exists('missing'))
+        self.assertFalse(self.store.exists('missing'))
+
+        self.assertEqual((self.store.stats()['hits'], self.store.stats()['misses']), (2, 2))
+
+    def testChangesAreWrittenOnIdle(self):
+
+        self.store.setValue('toolSize', 2.5)
+        self.store.setValue('lastSelectedObject', 'cube1')
+        self.store.remove('toolSize')
+
+        self.assertEqual(self.values, {'toolSize': 1})
+        self.assertEqual(len(self.jobs), 1)
+        self.assertEqual(self.store.dirty(), ['lastSelectedObject', 'toolSize'])
+
+        self._runIdleEvents()
+
+        self.assertEqual(self.values, {'lastSelectedObject': 'cube1'})
+        self.assertEqual(self.store.dirty(), [])
+
+        self.store.setValue('toolSize', 3)
+
+        self.assertEqual(len(self.jobs), 1)
+
+    def testFlushKillsScheduledIdleEvent(self):
+
+        self.store.setValue('toolSize', 2)
+
+        self.assertEqual(self.store.flush(), 1)
+        self.assertEqual(self.jobs, {})
+        self.assertEqual(self.values['toolSize'], 2)
+
+        self.store.setValue('toolSize', 3)
+
+        self.assertEqual(len(self.jobs), 1)
+
+    def testNothingIsCachedUntilInstalled(self):
+
+        self.store.uninstall()
+
+        self.store.setValue('toolSize', 2)
+
+        self.assertEqual(self.values['toolSize'], 2)
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(self.jobs, {})
+
+    def testListFlushesStoreOfOptionVar(self):
+
+        optionVar = mMayaCore.optionVarLib.CachedOptionVar('lastSelectedObject', store=self.store)
+        optionVar.setValue('cube1')
+
+        self.assertEqual(optionVar.list(), ['lastSelectedObject', 'toolSize'])
+        self.assertEqual(self.store.dirty(), [])
@@ -0,0 +1,134 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_referenceCacheLib.py @brief [ FILE ] - Tests of mMayaCore.referenceCacheLib.
+## @package tests.test_referenceCacheLib    @brief [ FILE ] - Tests of mMayaCore.referenceCacheLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  shutil
+import  tempfile
+import  unittest
+
+import  mMayaCore.referenceCacheLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief [ CLASS ] - Class tests the reference cache.
+class ReferenceCacheTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+        self.cache     = mMayaCore.referenceCacheLib.ReferenceCache(os.path.join(self.directory, 'cache'), maxSize=250)
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    def _writeFile(self, fileName, size=100):
+
+        filePath = os.path.join(self.directory, fileName)
+
+        with open(filePath, 'w') as outFile:
+            outFile.write('//Maya ASCII 2020 scene\n'.ljust(size, '/'))
+
+        return filePath
+
+    def testResolveCopiesOnce(self):
+
+        filePath   = self._writeFile('chair.ma')
+        cachedFile = self.cache.resolve(filePath)
+
+        self.assertNotEqual(cachedFile, filePath)
+        self.assertTrue(self.cache.isCached(cachedFile))
+        self.assertEqual(self.cache.sourceFile(cachedFile), filePath)
+        self.assertEqual(self.cache.resolve(filePath), cachedFile)
+        self.assertEqual(self.cache.resolve(cachedFile), cachedFile)
+
+        stats = self.cache.stats()
+
+        self.assertEqual((stats['hits'], stats['misses'], stats['count'], stats['size']), (1, 1, 1, 100))
+
+    def testPinnedCopiesAreNotEvicted(self):
+
+        for name in ('a.ma', 'b.ma', 'c.ma'):
+            self.cache.resolve(self._writeFile(name))
+
+        stats = self.cache.stats()
+
+        self.assertEqual((stats['count'], stats['pinned'], stats['evictions']), (3, 3, 0))
+
+    def testUnpinnedCopiesAreEvicted(self):
+
+        cachedFiles = [self.cache.resolve(self._writeFile(x)) for x in ('a.ma', 'b.ma', 'c.ma')]
+
+        self.assertEqual(self.cache.unpin(cachedFiles[0]), 1)
+        self.assertEqual(self.cache.unpin(cachedFiles[0]), 0)
+        self.assertEqual(self.cache.evict(), 1)
+
+        self.assertFalse(os.path.exists(cachedFiles[0]))
+        self.assertEqual(self.cache.stats()['count'], 2)
+
+    def testUnpinAllKeepsSizeLimit(self):
+
+        cachedFiles = [self.cache.resolve(self._writeFile(x)) for x in ('a.ma', 'b.ma', 'c.ma')]
+
+        self.assertEqual(self.cache.unpin(), 3)
+        self.assertEqual(self.cache.evict(), 1)
+
+        stats = self.cache.stats()
+
+        self.assertEqual((stats['count'], stats['pinned'], stats['size']), (2, 0, 200))
+        self.assertFalse(os.path.exists(cachedFiles[0]))
+
+    def testUnpinBySourceFile(self):
+
+        filePath = self._writeFile('a.ma')
+        self.cache.resolve(filePath)
+
+        self.assertEqual(self.cache.unpin(filePath), 1)
+        self.assertEqual(self.cache.evict(maxSize=0), 1)
+
+    def testChangedFileIsCopiedAgain(self):
+
+        filePath   = self._writeFile('a.ma')
+        cachedFile = self.cache.resolve(filePath)
+
+        self._writeFile('a.ma', size=120)
+
+        self.assertNotEqual(self.cache.resolve(filePath), cachedFile)
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def testFileWithRelativeReferencesIsNotCached(self):
+
+        filePath = os.path.join(self.directory, 'shot.ma')
+
+        with open(filePath, 'w') as outFile:
+            outFile.write('//Maya ASCII 2020 scene\nfile -r -ns "a" -rfn "aRN" "a.ma";\nrequires maya "2020";\n')
+
+        self.assertEqual(self.cache.resolve(filePath), filePath)
@@ -0,0 +1,136 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_referenceCrawlerLib.py @brief [ FILE ] - Tests of mMayaCore.referenceCrawlerLib.
+## @package tests.test_referenceCrawlerLib    @brief [ FILE ] - Tests of mMayaCore.referenceCrawlerLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  json
+import  shutil
+import  tempfile
+import  unittest
+
+import  mMayaCore.referenceCrawlerLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief [ CLASS ] - Class tests the reference graph of the crawler.
+#
+#  Graph of the files is: root -> a, b; a -> shared, missing; b -> shared{1}, root.
+class ReferenceCrawlerTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+
+        self._writeFile('root.ma', ['a.ma', 'sub/b.ma'])
+        self._writeFile('a.ma', ['shared.ma', 'missing.ma'])
+        self._writeFile('sub/b.ma', ['../shared.ma{1}', '../root.ma'])
+        self._writeFile('shared.ma', [])
+
+        self.crawler = mMayaCore.referenceCrawlerLib.ReferenceCrawler(processes=1)
+        self.report  = self.crawler.crawl(self._path('root.ma'))
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    def _path(self, fileName):
+
+        return os.path.join(self.directory, *fileName.split('/'))
+
+    def _writeFile(self, fileName, references):
+
+        filePath = self._path(fileName)
+
+        if not os.path.isdir(os.path.dirname(filePath)):
+            os.makedirs(os.path.dirname(filePath))
+
+        lines = ['//Maya ASCII 2020 scene\n']
+        for index, reference in enumerate(references):
+            lines.append('file -r -ns "ns{0}" -rfn "ns{0}RN" -typ "mayaAscii" "{1}";\n'.format(index, reference))
+        lines.append('requires maya "2020";\n')
+        lines.append('createNode transform -n "node";\n')
+
+        with open(filePath, 'w') as outFile:
+            outFile.write(''.join(lines))
+
+    def testFilesAreReadOnce(self):
+
+        self.assertEqual(self.crawler.files(), sorted([self._path(x) for x in ('root.ma', 'a.ma', 'sub/b.ma', 'shared.ma', 'missing.ma')]))
+
+    def testEdges(self):
+
+        edges = set([(x['source'], x['target'], x['referenceNode']) for x in self.crawler.edges()])
+
+        self.assertEqual(edges, set([(self._path('root.ma'), self._path('a.ma'), 'ns0RN'),
+                                     (self._path('root.ma'), self._path('sub/b.ma'), 'ns1RN'),
+                                     (self._path('a.ma'), self._path('shared.ma'), 'ns0RN'),
+                                     (self._path('a.ma'), self._path('missing.ma'), 'ns1RN'),
+                                     (self._path('sub/b.ma'), self._path('shared.ma'), 'ns0RN'),
+                                     (self._path('sub/b.ma'), self._path('root.ma'), 'ns1RN')]))
+
+    def testMissingFiles(self):
+
+        self.assertEqual(self.report['missing'], [self._path('missing.ma')])
+
+    def testCycles(self):
+
+        self.assertEqual(self.report['cycles'], [[self._path('root.ma'), self._path('sub/b.ma'), self._path('root.ma')]])
+
+    def testStats(self):
+
+        stats = self.report['stats']
+
+        self.assertEqual((stats['fileCount'], stats['edgeCount'], stats['missingCount'], stats['cycleCount']), (5, 6, 1, 1))
+        self.assertEqual(stats['processes'], 1)
+
+    def testWriteJsonLines(self):
+
+        filePath = self._path('manifest.jsonl')
+
+        self.assertTrue(self.crawler.write(filePath))
+
+        with open(filePath) as inFile:
+            records = [json.loads(x) for x in inFile]
+
+        self.assertEqual([x['type'] for x in records].count('file'), 5)
+        self.assertEqual([x['type'] for x in records].count('edge'), 6)
+        self.assertEqual(records[0]['type'], 'crawl')
+
+    def testResolveReferencePath(self):
+
+        resolveReferencePath = mMayaCore.referenceCrawlerLib.resolveReferencePath
+
+        self.assertEqual(resolveReferencePath('../x.ma{2}', self._path('sub/b.ma')), self._path('x.ma'))
+
+    def testFindCycles(self):
+
+        edges = [{'source': 'a', 'target': 'b'}, {'source': 'b', 'target': 'c'}, {'source': 'c', 'target': 'b'}]
+
+        self.assertEqual(mMayaCore.referenceCrawlerLib.findCycles('a', edges), [['b', 'c', 'b']])
@@ -0,0 +1,815 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_referenceLib.py @brief [ FILE ] - Tests of mMayaCore.referenceLib.
+## @package tests.test_referenceLib    @brief [ FILE ] - Tests of mMayaCore.referenceLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  shutil
+import  tempfile
+import  unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from    maya import cmds
+from    maya.api import OpenMaya as OpenMaya2
+
+import  mMayaCore.callbackLib
+import  mMayaCore.nameSpaceLib
+import  mMayaCore.referenceCacheLib
+import  mMayaCore.referenceLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ list of str ] - Successful edits of the reference.
+SUCCESSFUL_EDITS = ['setAttr "char:body.tx" 1', 'setAttr "char:body.tx" 2', 'setAttr "char:body.ty" 1']
+
+## [ list of str ] - Failed edits of the reference.
+FAILED_EDITS     = ['setAttr "char:missing.tx" 1']
+
+#
+## @brief Stub of `cmds.referenceQuery` for a scene which contains charRN reference.
+#
+#  @param node [ str | None | in  ] - Name of the node.
+#
+#  @exception N/A
+#
+#  @return object - Result of the query.
+def referenceQuery(node, **kwargs):
+
+    if kwargs.get('inr'):
+        return node.startswith('char:')
+
+    if kwargs.get('referenceNode'):
+        return 'charRN'
+
+    if kwargs.get('isLoaded'):
+        return True
+
+    if kwargs.get('editStrings'):
+
+        if kwargs.get('editCommand') == 'setAttr':
+            return SUCCESSFUL_EDITS
+
+        if not kwargs.get('successfulEdits'):
+            return FAILED_EDITS
+
+        return SUCCESSFUL_EDITS + FAILED_EDITS
+
+    return None
+
+#
+## @brief [ CLASS ] - Class provides the nodes and function sets of maya.api.OpenMaya for the reference index.
+class MayaObject(object):
+
+    def __init__(self, name, fileName=None, parent=None, members=()):
+
+        self._name      = name
+        self._fileName  = fileName
+        self._parent    = parent
+        self._members   = members
+
+    def name(self):
+
+        return self._name
+
+    def hasFn(self, fn):
+
+        return False
+
+    def isNull(self):
+
+        return self._name is None
+
+    def fileName(self, *args):
+
+        if self._fileName is None:
+            raise RuntimeError('Reference node has no file')
+
+        return self._fileName if args[2] else self._fileName.partition('{')[0]
+
+    def parentReference(self):
+
+        return self._parent or MayaObject(None)
+
+    def nodes(self):
+
+        return [MayaObject(x) for x in self._members]
+
+    def associatedNamespace(self, shortName):
+
+        return ':' + self._name[:-2]
+
+    def isLoaded(self):
+
+        return True
+
+#
+## @brief [ CLASS ] - Class tests building the reference index in a single walk.
+class ReferenceIndexTest(unittest.TestCase):
+
+    def setUp(self):
+
+        char = MayaObject('charRN', '/assets/char.ma', members=('char:body', 'char:head'))
+        rig  = MayaObject('char:rigRN', '/assets/rig.ma{1}', parent=char, members=('char:rig:root',))
+
+        references = [MayaObject('sharedReferenceNode'), char, MayaObject('emptyRN'), rig]
+
+        iterator = OpenMaya2.MItDependencyNodes.return_value
+        iterator.isDone.side_effect     = [False] * len(references) + [True]
+        iterator.thisNode.side_effect   = references
+
+        OpenMaya2.MFnReference.side_effect          = lambda x: x
+        OpenMaya2.MFnDependencyNode.side_effect     = lambda x: x
+
+        self.index = mMayaCore.referenceLib.ReferenceIndex()
+
+    def testReferenceNodes(self):
+
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.referenceNodes(), ['charRN', 'char:rigRN'])
+        self.assertTrue('charRN' in self.index)
+        self.assertFalse('emptyRN' in self.index)
+
+    def testHierarchy(self):
+
+        self.assertEqual(self.index.parent('char:rigRN'), 'charRN')
+        self.assertEqual(self.index.children(), ['charRN'])
+        self.assertEqual(self.index.children('charRN'), ['char:rigRN'])
+
+    def testFilePath(self):
+
+        self.assertEqual(self.index.filePath('char:rigRN'), '/assets/rig.ma')
+        self.assertEqual(self.index.filePath('char:rigRN', copyNumber=True), '/assets/rig.ma{1}')
+        self.assertEqual(self.index.reference('char:rigRN')['copyNumber'], 1)
+
+    def testMembers(self):
+
+        self.assertEqual(self.index.members('charRN'), ['char:body', 'char:head'])
+        self.assertEqual(self.index.referenceNode('char:rig:root'), 'char:rigRN')
+        self.assertTrue(mMayaCore.referenceLib.Reference.isNodeReferenced('char:head', index=self.index))
+        self.assertFalse(mMayaCore.referenceLib.Reference.isNodeReferenced('persp', index=self.index))
+
+#
+## @brief [ CLASS ] - Class tests queries given an empty reference index.
+class EmptyReferenceIndexTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.index = mMayaCore.referenceLib.ReferenceIndex(build=False)
+
+    def testEmptyIndexIsUsed(self):
+
+        self.assertEqual(len(self.index), 0)
+        self.assertFalse(mMayaCore.referenceLib.Reference.isNodeReferenced('char:body', index=self.index))
+        self.assertFalse(cmds.referenceQuery.called)
+
+    def testGetReferenceNodes(self):
+
+        referenceNodes, notReferenced = mMayaCore.referenceLib.Reference.getReferenceNodes(['char:body'], index=self.index)
+
+        self.assertEqual(list(referenceNodes), [])
+        self.assertEqual(notReferenced, ['char:body'])
+        self.assertFalse(cmds.ls.called)
+
+#
+## @brief [ CLASS ] - Class tests the reference membership cache.
+class ReferenceMembershipCacheTest(unittest.TestCase):
+
+    def setUp(self):
+
+        cmds.objExists.return_value     = True
+        cmds.referenceQuery.side_effect = referenceQuery
+
+        self.cache = mMayaCore.referenceLib.ReferenceMembershipCache()
+
+    def tearDown(self):
+
+        self.cache.uninstall()
+
+    def testNothingIsCachedUntilInstalled(self):
+
+        self.assertEqual(self.cache.referenceNode('char:body'), 'charRN')
+        self.assertEqual(self.cache.referenceNode('char:body'), 'charRN')
+
+        self.assertFalse(self.cache.isInstalled())
+        self.assertEqual(self.cache.stats(), {'hits': 0, 'misses': 2, 'invalidations': 0})
+
+    def testReferenceNodeIsCounted(self):
+
+        self.cache.install()
+
+        self.assertEqual(self.cache.referenceNode('char:body'), 'charRN')
+        self.assertEqual(self.cache.referenceNode('char:body'), 'charRN')
+        self.assertIsNone(self.cache.referenceNode('body'))
+
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 2, 'invalidations': 0})
+
+    def testSuspendWhileSceneIsOpened(self):
+
+        self.cache.install()
+        self.cache.suspend()
+
+        self.assertTrue(self.cache.isInstalled())
+        self.assertFalse(self.cache.isCaching())
+
+        self.cache.resume()
+
+        self.assertTrue(self.cache.isCaching())
+
+    def testSceneChangeInvalidates(self):
+
+        self.cache.install()
+        self.cache.referenceNode('char:body')
+
+        self.cache.invalidate()
+
+        self.assertEqual(self.cache.referenceNode('char:body'), 'charRN')
+        self.assertEqual(self.cache.stats(), {'hits': 0, 'misses': 2, 'invalidations': 1})
+
+#
+## @brief [ CLASS ] - Class tests compaction of the reference edits.
+class CompactEditsTest(unittest.TestCase):
+
+    def setUp(self):
+
+        cmds.objExists.return_value         = True
+        cmds.referenceQuery.side_effect     = referenceQuery
+
+    def testInstanceMethodIsNotShadowed(self):
+
+        self.assertFalse(isinstance(mMayaCore.referenceLib.Reference.__dict__['compactEdits'], staticmethod))
+        self.assertTrue(isinstance(mMayaCore.referenceLib.Reference.__dict__['compactReferenceNodeEdits'], staticmethod))
+
+    def testCompactEditsOfNode(self):
+
+        result = mMayaCore.referenceLib.Reference('char:body').compactEdits(dryRun=True)
+
+        self.assertEqual(result['referenceNode'], 'charRN')
+        self.assertEqual((result['editsBefore'], result['failedEdits'], result['redundantEdits'], result['editsAfter']), (4, 1, 1, 2))
+        self.assertFalse(cmds.referenceEdit.called)
+
+    def testCompactEditsOfNodeWhichIsNotSet(self):
+
+        self.assertIsNone(mMayaCore.referenceLib.Reference().compactEdits())
+
+    def testCompactReferenceNodeEdits(self):
+
+        result = mMayaCore.referenceLib.Reference.compactReferenceNodeEdits('charRN', measure=False)
+
+        self.assertIsNone(result['error'])
+        self.assertEqual(cmds.referenceEdit.call_count, 2)
+        cmds.file.assert_any_call(unloadReference='charRN')
+        cmds.file.assert_any_call(loadReference='charRN')
+
+#
+## @brief [ CLASS ] - Class provides `cmds.ls` and `cmds.referenceQuery` stubs for a scene with references.
+class SceneStub(object):
+
+    def __init__(self, references, nodes):
+
+        ## [ dict ] - Keys are reference nodes, values are long names of their members.
+        self.references = references
+
+        ## [ list of str ] - Long names of all nodes in the scene.
+        self.nodes      = nodes
+
+    def ls(self, names=None, long=False, referencedNodes=False, type=None):
+
+        if not isinstance(names, (list, tuple)):
+            names = [names]
+
+        if type == 'reference':
+            return [x for x in names if x in self.references]
+
+        result = []
+
+        for node in self.nodes:
+
+            if not any([node == x or node.endswith('|' + x.lstrip('|')) or (x.endswith('*') and node.rpartition('|')[2].startswith(x[:-1]))
+                        for x in names]):
+                continue
+
+            if referencedNodes and self.referenceNode(node) is None:
+                continue
+
+            result.append(node if long else node.rpartition('|')[2])
+
+        return result
+
+    def referenceNode(self, node):
+
+        for referenceNode, members in self.references.items():
+            if node in members or any([x.endswith('|' + node) for x in members]):
+                return referenceNode
+
+        return None
+
+    def referenceQuery(self, node, **kwargs):
+
+        if kwargs.get('nodes'):
+            return self.references[node]
+
+        if kwargs.get('inr'):
+            return self.referenceNode(node) is not None
+
+        if kwargs.get('referenceNode'):
+            return self.referenceNode(node)
+
+        if kwargs.get('filename'):
+            return '/assets/{}.ma'.format(node[:-2])
+
+        return None
+
+#
+## @brief [ CLASS ] - Class tests resolving nodes to their reference nodes.
+class GetReferenceNodesTest(unittest.TestCase):
+
+    def setUp(self):
+
+        references = {'charRN': ['|char:grp|char:body', '|char:grp|char:head', 'char:skinCluster1'],
+                      'propRN': ['|prop:box']}
+
+        self.scene = SceneStub(references, references['charRN'] + references['propRN'] + ['|persp', '|grp|body'])
+
+        cmds.ls.side_effect             = self.scene.ls
+        cmds.referenceQuery.side_effect = self.scene.referenceQuery
+        cmds.objExists.return_value     = True
+
+    def testGivenNamesAreReturned(self):
+
+        referenceNodes, notReferenced = mMayaCore.referenceLib.Reference.getReferenceNodes(['char:body',
+                                                                                            '|char:grp|char:head',
+                                                                                            'char:grp|char:body',
+                                                                                            'char:skinCluster1',
+                                                                                            'prop:b*',
+                                                                                            'persp',
+                                                                                            'missing'])
+
+        self.assertEqual(list(referenceNodes), ['charRN', 'propRN'])
+        self.assertEqual(sorted(referenceNodes['charRN']), ['char:body', 'char:grp|char:body', 'char:skinCluster1', '|char:grp|char:head'])
+        self.assertEqual(referenceNodes['propRN'], ['prop:b*'])
+        self.assertEqual(notReferenced, ['persp', 'missing'])
+
+    def testNodesWithSameShortNames(self):
+
+        referenceNodes, notReferenced = mMayaCore.referenceLib.Reference.getReferenceNodes(['char:grp|char:body', 'grp|body'])
+
+        self.assertEqual(dict(referenceNodes), {'charRN': ['char:grp|char:body']})
+        self.assertEqual(notReferenced, ['grp|body'])
+
+    def testMembersAreQueriedOnceForManyNodes(self):
+
+        members = ['|char:grp|char:node{}'.format(x) for x in range(mMayaCore.referenceLib.MEMBER_QUERY_THRESHOLD + 2)]
+
+        self.scene.references['charRN'] = members
+        self.scene.nodes                = members
+
+        referenceNodes = mMayaCore.referenceLib.Reference.getReferenceNodes([x.rpartition('|')[2] for x in members])[0]
+
+        self.assertEqual(len(referenceNodes['charRN']), len(members))
+        self.assertEqual(len([x for x in cmds.referenceQuery.call_args_list if x[1].get('nodes')]), 1)
+
+    def testReplaceManyWithLongNames(self):
+
+        replacements = {'|char:grp|char:head': '/assets/villain.ma', 'char:body': '/assets/villain.ma'}
+
+        with mock.patch.object(mMayaCore.referenceLib.Reference, 'replaceReferenceNode', return_value='/assets/villain.ma') as replace:
+            report = mMayaCore.referenceLib.Reference.replaceMany(replacements)
+
+        replace.assert_called_once_with('charRN', '/assets/villain.ma')
+        self.assertEqual(report['replaced'], ['charRN'])
+        self.assertEqual(report['notReferenced'], [])
+
+#
+## @brief [ CLASS ] - Stub of `maya.api.OpenMaya.MFileObject`.
+class FileObjectStub(object):
+
+    def __init__(self, filePath):
+
+        self.filePath     = filePath
+        self.overridePath = None
+
+    def resolvedFullName(self):
+
+        return self.overridePath or self.filePath
+
+    def overrideResolvedFullName(self, filePath):
+
+        self.overridePath = filePath
+
+#
+## @brief [ CLASS ] - Class tests reading referenced files from the reference cache.
+class ReferenceCacheHookTest(unittest.TestCase):
+
+    def setUp(self):
+
+        ## [ dict ] - Callbacks, keys are ids, values are tuples which contain kind, message type and function.
+        self.callbacks = {}
+
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+        self.cache     = mMayaCore.referenceCacheLib.ReferenceCache(os.path.join(self.directory, 'cache'), maxSize=150)
+        self.hook      = mMayaCore.referenceLib.ReferenceCacheHook(self.cache)
+        self.files     = [self._writeFile(x) for x in ('a.ma', 'b.ma')]
+
+        for kind in ('addCallback', 'addCheckFileCallback', 'addReferenceCallback'):
+            getattr(OpenMaya2.MSceneMessage, kind).side_effect = self._addCallback(kind)
+
+        OpenMaya2.MMessage.removeCallbacks.side_effect = lambda ids: [self.callbacks.pop(x, None) for x in ids]
+
+        self.hook.install()
+
+    def tearDown(self):
+
+        self.hook.uninstall()
+        shutil.rmtree(self.directory)
+
+    def _writeFile(self, fileName):
+
+        filePath = os.path.join(self.directory, fileName)
+
+        with open(filePath, 'w') as outFile:
+            outFile.write('//Maya ASCII 2020 scene\n'.ljust(100, '/'))
+
+        return filePath
+
+    def _addCallback(self, kind):
+
+        def addCallback(messageType, function):
+
+            callbackId = len(self.callbacks) + 100
+            self.callbacks[callbackId] = (kind, messageType, function)
+
+            return callbackId
+
+        return addCallback
+
+    def _messages(self, kind):
+
+        return set([id(x[1]) for x in self.callbacks.values() if x[0] == kind])
+
+    def _emit(self, message, *args):
+
+        messageType = getattr(OpenMaya2.MSceneMessage, message)
+
+        return [x[2](*args) for x in list(self.callbacks.values()) if x[1] is messageType]
+
+    def _read(self, filePath):
+
+        fileObject = FileObjectStub(filePath)
+
+        self.assertEqual(self._emit('kBeforeLoadReferenceCheck', fileObject, None), [True])
+
+        return fileObject
+
+    def testInstall(self):
+
+        getMessageTypes = lambda messages: set([id(getattr(OpenMaya2.MSceneMessage, x)) for x in messages])
+
+        self.assertFalse(self.hook.install())
+        self.assertEqual(self._messages('addCheckFileCallback'), getMessageTypes(mMayaCore.callbackLib.REFERENCE_CHECK_MESSAGES))
+        self.assertEqual(self._messages('addReferenceCallback'), getMessageTypes(mMayaCore.referenceLib.CACHE_UNPIN_MESSAGES))
+        self.assertEqual(self._messages('addCallback'), getMessageTypes(mMayaCore.callbackLib.SCENE_OPENING_MESSAGES))
+
+        self.hook.uninstall()
+
+        self.assertEqual(self.callbacks, {})
+
+    def testReadFileIsRedirectedToLocalCopy(self):
+
+        fileObject = self._read(self.files[0])
+
+        self.assertTrue(self.cache.isCached(fileObject.overridePath))
+        self.assertEqual(self.cache.sourceFile(fileObject.overridePath), self.files[0])
+
+    def testFileWhichCanNotBeCachedIsNotRedirected(self):
+
+        fileObject = self._read(os.path.join(self.directory, 'missing.ma'))
+
+        self.assertIsNone(fileObject.overridePath)
+
+    def testUnloadedReferenceIsUnpinned(self):
+
+        fileObjects = [self._read(x) for x in self.files]
+
+        self.assertEqual(self.cache.stats()['count'], 2)
+
+        self._emit('kAfterUnloadReference', None, fileObjects[0], None)
+
+        self.assertFalse(os.path.exists(fileObjects[0].overridePath))
+        self.assertEqual(self.cache.stats()['count'], 1)
+
+    def testNewSceneUnpinsAll(self):
+
+        [self._read(x) for x in self.files]
+
+        self._emit('kBeforeOpen', None)
+
+        stats = self.cache.stats()
+
+        self.assertEqual((stats['count'], stats['pinned'], stats['evictions']), (1, 0, 1))
+
+    def testCreatedReferenceKeepsSourcePath(self):
+
+        with mock.patch.object(mMayaCore.referenceLib, '_referenceCacheHook', None), \
+             mock.patch.object(mMayaCore.referenceCacheLib, 'getReferenceCache', return_value=self.cache):
+            mMayaCore.referenceLib.Reference.create(self.files[0], 'a')
+            self.assertTrue(mMayaCore.referenceLib.getReferenceCacheHook().isInstalled())
+            mMayaCore.referenceLib.getReferenceCacheHook().uninstall()
+
+        self.assertEqual(cmds.file.call_args[0][0], self.files[0])
+        self.assertEqual(self.cache.stats()['count'], 0)
+
+#
+## @brief [ CLASS ] - Class tests creating many references at once.
+class CreateManyTest(unittest.TestCase):
+
+    def setUp(self):
+
+        ## [ list of tuple ] - Maya calls in the order they are made, each tuple contains name of the command and its flags.
+        self.calls     = []
+
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+        self.files     = [self._writeFile(x) for x in ('chair.ma', 'table.mb', 'notes.txt')]
+
+        cmds.file.side_effect           = self._file
+        cmds.referenceQuery.side_effect = lambda filePath, **kwargs: os.path.basename(filePath).split('.')[0] + 'RN'
+        cmds.refresh.side_effect        = lambda **kwargs: self.calls.append(('refresh', kwargs))
+        cmds.undoInfo.side_effect       = lambda **kwargs: self.calls.append(('undoInfo', kwargs))
+
+        patcher = mock.patch.object(mMayaCore.referenceCacheLib, 'getReferenceCache', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    def _writeFile(self, fileName):
+
+        filePath = os.path.join(self.directory, fileName)
+
+        with open(filePath, 'w') as outFile:
+            outFile.write('')
+
+        return filePath
+
+    def _file(self, *args, **kwargs):
+
+        self.calls.append(('file', kwargs))
+
+        if kwargs.get('loadReference') == 'failedRN':
+            raise RuntimeError('Reference could not be loaded')
+
+        return args[0] if args else None
+
+    def _names(self, name, flag):
+
+        return [x[1][flag] for x in self.calls if x[0] == name and flag in x[1]]
+
+    def testReferencesAreCreatedUnloadedAndLoadedInBatch(self):
+
+        report = mMayaCore.referenceLib.Reference.createMany(self.files[:2])
+
+        self.assertEqual(report['created'], ['chairRN', 'tableRN'])
+        self.assertEqual(self._names('file', 'namespace'), ['chair', 'table'])
+        self.assertEqual(self._names('file', 'deferReference'), [1, 1])
+        self.assertEqual(self._names('file', 'type'), ['mayaAscii', 'mayaBinary'])
+        self.assertEqual(self._names('file', 'loadReference'), ['chairRN', 'tableRN'])
+
+        calls = [(x[0], sorted(x[1].items())) for x in self.calls if x[0] != 'file' or 'loadReference' in x[1]]
+
+        self.assertEqual(calls, [('undoInfo', [('chunkName', 'createReferences'), ('openChunk', True)]),
+                                 ('refresh', [('suspend', True)]),
+                                 ('file', [('loadReference', 'chairRN')]),
+                                 ('file', [('loadReference', 'tableRN')]),
+                                 ('refresh', [('suspend', False)]),
+                                 ('undoInfo', [('closeChunk', True)]),
+                                 ('refresh', [])])
+
+    def testInvalidFilesAreNotCreated(self):
+
+        missingFile = os.path.join(self.directory, 'missing.ma')
+
+        report = mMayaCore.referenceLib.Reference.createMany([self.files[0], self.files[2], missingFile])
+
+        self.assertEqual(report['invalid'], [self.files[2], missingFile])
+        self.assertEqual(report['created'], ['chairRN'])
+        self.assertEqual([x['valid'] for x in report['results']], [True, False, False])
+        self.assertTrue(report['results'][1]['error'])
+
+    def testResults(self):
+
+        report = mMayaCore.referenceLib.Reference.createMany(self.files[:2], nameSpaces=['prop', None])
+        result = report['results'][0]
+
+        self.assertEqual(self._names('file', 'namespace'), ['prop', 'table'])
+        self.assertEqual((result['filePath'], result['resolvedFilePath'], result['referenceNode']), (self.files[0], self.files[0], 'chairRN'))
+
+        for key in ('validateSeconds', 'createSeconds', 'loadSeconds'):
+            self.assertTrue(result[key] >= 0.0)
+
+        self.assertTrue(report['seconds'] >= 0.0)
+
+    def testReferencesAreLeftUnloaded(self):
+
+        report = mMayaCore.referenceLib.Reference.createMany(self.files[:2], load=False)
+
+        self.assertEqual(report['created'], ['chairRN', 'tableRN'])
+        self.assertEqual(self._names('file', 'loadReference'), [])
+        self.assertFalse(cmds.refresh.called)
+
+    def testFailedLoadIsReported(self):
+
+        failedFile = self._writeFile('failed.ma')
+
+        report = mMayaCore.referenceLib.Reference.createMany([failedFile, self.files[0]])
+
+        self.assertEqual(report['failed'], [failedFile])
+        self.assertEqual(report['created'], ['failedRN', 'chairRN'])
+        self.assertEqual(self._names('file', 'loadReference'), ['failedRN', 'chairRN'])
+        self.assertEqual(self.calls[-2], ('undoInfo', {'closeChunk': True}))
+
+#
+## @brief [ CLASS ] - Class tests replacing the files of references in place.
+#
+#  Scene contains charRN, hatRN which is nested under charRN and propRN.
+class ReplaceTest(unittest.TestCase):
+
+    def setUp(self):
+
+        references = {'charRN': ['|char:grp|char:body', '|char:grp|char:head'],
+                      'hatRN' : ['|char:grp|char:hat:brim'],
+                      'propRN': ['|prop:box']}
+
+        self.scene     = SceneStub(references, [y for x in references.values() for y in x])
+        self.parents   = {'hatRN': 'charRN'}
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+        self.files     = [self._writeFile(x) for x in ('villain.ma', 'cap.mb')]
+
+        cmds.ls.side_effect             = self.scene.ls
+        cmds.referenceQuery.side_effect = self._referenceQuery
+        cmds.objExists.return_value     = True
+        cmds.file.side_effect           = lambda *args, **kwargs: args[0] if args else None
+
+        patcher = mock.patch.object(mMayaCore.referenceCacheLib, 'getReferenceCache', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    def _writeFile(self, fileName):
+
+        filePath = os.path.join(self.directory, fileName)
+
+        with open(filePath, 'w') as outFile:
+            outFile.write('')
+
+        return filePath
+
+    def _referenceQuery(self, node, **kwargs):
+
+        if kwargs.get('parent'):
+            return self.parents.get(node)
+
+        return self.scene.referenceQuery(node, **kwargs)
+
+    def _loaded(self):
+
+        return [(x[1]['loadReference'], x[0][0]) for x in cmds.file.call_args_list if 'loadReference' in x[1]]
+
+    def testReferenceIsReplacedInPlace(self):
+
+        result = mMayaCore.referenceLib.Reference('char:body').replace(self.files[1])
+
+        self.assertEqual(result, self.files[1])
+        cmds.file.assert_called_once_with(self.files[1],
+                                          loadReference='charRN',
+                                          type='mayaBinary',
+                                          options=mMayaCore.referenceLib.REFERENCE_OPTIONS)
+
+    def testMissingFileIsNotReplaced(self):
+
+        self.assertIsNone(mMayaCore.referenceLib.Reference.replaceReferenceNode('charRN', os.path.join(self.directory, 'missing.ma')))
+        self.assertFalse(cmds.file.called)
+
+    def testEachReferenceIsReplacedOnce(self):
+
+        report = mMayaCore.referenceLib.Reference.replaceMany({'charRN'                 : self.files[0],
+                                                               'char:body'              : self.files[0],
+                                                               '|char:grp|char:head'    : self.files[0]})
+
+        self.assertEqual(self._loaded(), [('charRN', self.files[0])])
+        self.assertEqual(report['replaced'], ['charRN'])
+
+    def testParentsAreReplacedFirst(self):
+
+        report = mMayaCore.referenceLib.Reference.replaceMany({'char:hat:brim': self.files[1], 'char:body': self.files[0]})
+
+        self.assertEqual(self._loaded(), [('charRN', self.files[0]), ('hatRN', self.files[1])])
+        self.assertEqual(sorted(report['replaced']), ['charRN', 'hatRN'])
+
+    def testReplacementsAreDoneInSingleUndoChunk(self):
+
+        mMayaCore.referenceLib.Reference.replaceMany({'char:body': self.files[0], 'prop:box': self.files[1]})
+
+        self.assertEqual(cmds.undoInfo.call_args_list, [mock.call(openChunk=True, chunkName='replaceReferences'),
+                                                        mock.call(closeChunk=True)])
+        self.assertEqual(cmds.refresh.call_args_list, [mock.call(suspend=True), mock.call(suspend=False), mock.call()])
+
+    def testSameFileIsSkipped(self):
+
+        report = mMayaCore.referenceLib.Reference.replaceMany({'prop:box': '/assets/prop.ma'})
+
+        self.assertEqual(report['skipped'], ['propRN'])
+        self.assertEqual(self._loaded(), [])
+
+    def testFailures(self):
+
+        report = mMayaCore.referenceLib.Reference.replaceMany({'char:body'  : self.files[0],
+                                                               'char:head'  : self.files[1],
+                                                               'prop:box'   : os.path.join(self.directory, 'missing.ma'),
+                                                               'persp'      : self.files[0]})
+
+        self.assertEqual(sorted(report['failed']), ['charRN', 'propRN'])
+        self.assertEqual(report['notReferenced'], ['persp'])
+        self.assertEqual(self._loaded(), [])
+
+#
+## @brief [ CLASS ] - Class tests duplicating references with allocated namespaces.
+class DuplicateTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+        self.filePath  = os.path.join(self.directory, 'chair.ma')
+
+        with open(self.filePath, 'w') as outFile:
+            outFile.write('')
+
+        cmds.referenceQuery.return_value    = self.filePath
+        cmds.namespaceInfo.return_value     = [':chair', ':chair1']
+        cmds.file.side_effect               = lambda *args, **kwargs: args[0]
+
+        patcher = mock.patch.object(mMayaCore.referenceCacheLib, 'getReferenceCache', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    def testDuplicateMany(self):
+
+        results = [{'resolvedFilePath': self.filePath}] * 3
+
+        with mock.patch.object(mMayaCore.referenceLib.Reference, 'createMany', return_value={'results': results}) as createMany:
+            self.assertEqual(mMayaCore.referenceLib.Reference.duplicateReferenceNode('chairRN', count=3), [self.filePath] * 3)
+
+        createMany.assert_called_once_with([self.filePath] * 3, nameSpaces=['chair2', 'chair3', 'chair4'])
+        self.assertEqual(cmds.namespaceInfo.call_count, 1)
+
+    def testDuplicateWithAllocator(self):
+
+        allocator = mMayaCore.nameSpaceLib.NameSpaceAllocator()
+
+        mMayaCore.referenceLib.Reference.duplicateReferenceNode('chairRN', allocator=allocator)
+        mMayaCore.referenceLib.Reference.duplicateReferenceNode('chairRN', allocator=allocator)
+
+        self.assertEqual([x[1]['namespace'] for x in cmds.file.call_args_list], ['chair2', 'chair3'])
+        self.assertEqual(cmds.namespaceInfo.call_count, 1)
+
+    def testDuplicateOfMissingFile(self):
+
+        cmds.referenceQuery.return_value = os.path.join(self.directory, 'missing.ma')
+
+        self.assertIsNone(mMayaCore.referenceLib.Reference.duplicateReferenceNode('chairRN', count=3))
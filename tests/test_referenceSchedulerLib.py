@@ -0,0 +1,162 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_referenceSchedulerLib.py @brief [ FILE ] - Tests of mMayaCore.referenceSchedulerLib.
+## @package tests.test_referenceSchedulerLib    @brief [ FILE ] - Tests of mMayaCore.referenceSchedulerLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from    maya import cmds
+from    maya.api import OpenMaya
+
+import  mMayaCore.referenceLib
+import  mMayaCore.referenceSchedulerLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief [ CLASS ] - Class tests loading references on idle events.
+class ReferenceLoadSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+
+        ## [ dict ] - Scene callbacks, keys are ids, values are tuples which contain message type and function.
+        self.callbacks = {}
+
+        ## [ set of int ] - Ids of the scheduled idle events.
+        self.jobs      = set()
+
+        ## [ list of str ] - Loaded reference nodes.
+        self.loaded    = []
+
+        OpenMaya.MSceneMessage.addCallback.side_effect  = self._addCallback
+        OpenMaya.MMessage.removeCallbacks.side_effect   = lambda ids: [self.callbacks.pop(x) for x in ids]
+
+        cmds.scriptJob.side_effect          = self._scriptJob
+        cmds.objExists.return_value         = True
+        cmds.referenceQuery.return_value    = False
+
+        patcher = mock.patch.object(mMayaCore.referenceLib.Reference, 'reloadReferenceNode', side_effect=self.loaded.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.progress  = []
+        self.scheduler = mMayaCore.referenceSchedulerLib.ReferenceLoadScheduler(budget=0, progressCallback=self.progress.append)
+
+    def _addCallback(self, messageType, function):
+
+        callbackId = len(self.callbacks) + 100
+        self.callbacks[callbackId] = (messageType, function)
+
+        return callbackId
+
+    def _emit(self, message):
+
+        messageType = getattr(OpenMaya.MSceneMessage, message)
+
+        for callbackType, function in list(self.callbacks.values()):
+            if callbackType is messageType:
+                function(None)
+
+    def _scriptJob(self, **kwargs):
+
+        if 'idleEvent' in kwargs:
+            self.jobs.add(len(self.jobs) + 1)
+            return len(self.jobs)
+
+        if 'exists' in kwargs:
+            return kwargs['exists'] in self.jobs
+
+        if 'kill' in kwargs:
+            self.jobs.discard(kwargs['kill'])
+
+        return None
+
+    def testPriorityOrder(self):
+
+        self.scheduler.addMany({'bigRN': 10, 'smallRN': 1, 'mediumRN': 5})
+        self.scheduler.setPriority('bigRN', 0)
+        self.scheduler.remove('mediumRN')
+
+        self.assertEqual(self.scheduler.queue(), ['bigRN', 'smallRN'])
+        self.assertFalse(self.scheduler.setPriority('mediumRN', 0))
+
+    def testOneReferenceIsLoadedPerTickWithoutBudget(self):
+
+        self.scheduler.addMany({'aRN': 1, 'bRN': 2})
+        self.scheduler.start()
+
+        self.assertEqual(self.scheduler.tick(), 1)
+        self.assertEqual(self.scheduler.state(), mMayaCore.referenceSchedulerLib.STATE_RUNNING)
+        self.assertEqual(self.scheduler.tick(), 1)
+
+        self.assertEqual(self.loaded, ['aRN', 'bRN'])
+        self.assertEqual(self.scheduler.state(), mMayaCore.referenceSchedulerLib.STATE_FINISHED)
+        self.assertEqual(self.jobs, set())
+        self.assertEqual(self.callbacks, {})
+        self.assertEqual(self.progress[-1]['loaded'], 2)
+
+    def testFailedLoadIsReported(self):
+
+        cmds.objExists.return_value = False
+
+        self.scheduler.add('missingRN', 1)
+        self.scheduler.tick()
+
+        self.assertEqual(self.scheduler.progress()['failed'], 1)
+        self.assertEqual(self.loaded, [])
+
+    def testQueueIsCancelledWithScene(self):
+
+        self.scheduler.addMany({'aRN': 1, 'bRN': 2})
+        self.scheduler.start()
+        self.scheduler.tick()
+
+        self._emit('kBeforeOpen')
+
+        progress = self.scheduler.progress()
+
+        self.assertEqual(self.scheduler.queue(), [])
+        self.assertEqual((progress['state'], progress['cancelled'], progress['current']), ('cancelled', 1, None))
+        self.assertEqual(self.jobs, set())
+        self.assertEqual(self.callbacks, {})
+
+    def testQueueWhichIsNotStartedIsCancelledWithScene(self):
+
+        self.scheduler.add('aRN', 1)
+
+        self._emit('kBeforeNew')
+
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertTrue(self.scheduler.start())
+        self.assertEqual(self.scheduler.tick(), 0)
+        self.assertEqual(self.loaded, [])
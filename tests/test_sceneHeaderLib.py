@@ -0,0 +1,195 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    tests/test_sceneHeaderLib.py @brief [ FILE ] - Tests of mMayaCore.sceneHeaderLib.
+## @package tests.test_sceneHeaderLib    @brief [ FILE ] - Tests of mMayaCore.sceneHeaderLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import  os
+import  shutil
+import  struct
+import  tempfile
+import  unittest
+
+import  mMayaCore.sceneHeaderLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Header of a Maya ASCII file, nodes after the header contain a file statement which is not a reference.
+ASCII_SCENE = '''//Maya ASCII 2020 scene
+//Name: shot.ma
+file -rdi 1 -ns "char" -rfn "charRN" -op "v=0;" -typ "mayaAscii" "/assets/char.ma";
+file -rdi 2 -ns "rig" -rfn "char:rigRN" -typ "mayaAscii" "/assets/rig.ma";
+file -rdi 1 -ns "char1" -rfn "char1RN" -typ "mayaAscii" "/assets/char.ma{1}";
+file -r -ns "char" -dr 1 -rfn "charRN" -op "v=0;" -typ "mayaAscii" "/assets/char.ma";
+file -r -ns "char1" -dr 1 -rfn "char1RN" -typ "mayaAscii" "/assets/char.ma{1}";
+requires maya "2020";
+requires -nodeType "aiOptions" -dataType "aiData" "mtoa" "4.0.0";
+currentUnit -l centimeter -a degree -t film;
+fileInfo "application" "maya";
+fileInfo "comment" "semicolon; and \\"quotes\\"";
+createNode transform -n "node";
+file -r "/not/a/header.ma";
+'''
+
+#
+## @brief Create an IFF chunk.
+#
+#  @param tag     [ bytes | None | in  ] - Tag of the chunk.
+#  @param payload [ bytes | None | in  ] - Payload of the chunk.
+#
+#  @exception N/A
+#
+#  @return bytes - Chunk, padded to 4 bytes.
+def createChunk(tag, payload):
+
+    return tag + struct.pack('>I', len(payload)) + payload + b'\0' * (-len(payload) % 4)
+
+#
+## @brief Create an IFF group.
+#
+#  @param formType [ bytes          | None | in  ] - Form type of the group.
+#  @param chunks   [ list of bytes  | None | in  ] - Chunks of the group.
+#
+#  @exception N/A
+#
+#  @return bytes - Group.
+def createGroup(formType, chunks):
+
+    return createChunk(b'FOR4', formType + b''.join(chunks))
+
+#
+## @brief [ CLASS ] - Class tests the parsers of MEL statements.
+class StatementTest(unittest.TestCase):
+
+    def testTokenize(self):
+
+        tokens = mMayaCore.sceneHeaderLib.tokenize('file -r -ns "a b" "/path/with \\"quote\\".ma"')
+
+        self.assertEqual(tokens, [('file', False), ('-r', False), ('-ns', False), ('a b', True), ('/path/with "quote".ma', True)])
+
+    def testUnescape(self):
+
+        self.assertEqual(mMayaCore.sceneHeaderLib.unescape('a\\nb\\tc\\\\d\\"e'), 'a\nb\tc\\d"e')
+        self.assertEqual(mMayaCore.sceneHeaderLib.unescape('plain'), 'plain')
+
+    def testParseFlags(self):
+
+        tokens          = mMayaCore.sceneHeaderLib.tokenize('-r -ns "a" -nt "x" -nt "y" -1 "file.ma"')
+        flags, values   = mMayaCore.sceneHeaderLib.parseFlags(tokens, booleanFlags=('-r',))
+
+        self.assertEqual(dict(flags), {'-r': True, '-ns': 'a', '-nt': ['x', 'y']})
+        self.assertEqual(values, ['-1', 'file.ma'])
+
+    def testParseFileStatement(self):
+
+        tokens    = mMayaCore.sceneHeaderLib.tokenize('file -rdi 2 -ns "rig" -rfn "rigRN" -dr 1 -typ "mayaAscii" "/rig.ma"')
+        reference = mMayaCore.sceneHeaderLib.parseFileStatement(tokens)
+
+        self.assertEqual(reference['filePath'], '/rig.ma')
+        self.assertEqual(reference['nameSpace'], 'rig')
+        self.assertEqual(reference['referenceNode'], 'rigRN')
+        self.assertEqual(reference['fileType'], 'mayaAscii')
+        self.assertEqual(reference['depth'], 2)
+        self.assertTrue(reference['deferred'])
+        self.assertTrue(reference['isDeclaration'])
+
+    def testParseFileStatementWhichIsNotAReference(self):
+
+        tokens = mMayaCore.sceneHeaderLib.tokenize('file -import "/rig.ma"')
+
+        self.assertIsNone(mMayaCore.sceneHeaderLib.parseFileStatement(tokens))
+
+    def testParseRequiresStatement(self):
+
+        tokens   = mMayaCore.sceneHeaderLib.tokenize('requires -nodeType "a" -nt "b" -dataType "c" "mtoa" "4.0.0"')
+        requires = mMayaCore.sceneHeaderLib.parseRequiresStatement(tokens)
+
+        self.assertEqual(requires, {'plugin': 'mtoa', 'version': '4.0.0', 'nodeTypes': ['a', 'b'], 'dataTypes': ['c']})
+
+#
+## @brief [ CLASS ] - Class tests reading the headers of Maya files.
+class ReadHeaderTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    def _writeFile(self, fileName, content):
+
+        filePath = os.path.join(self.directory, fileName)
+
+        with open(filePath, 'wb') as outFile:
+            outFile.write(content)
+
+        return filePath
+
+    def testReadAsciiHeader(self):
+
+        header = mMayaCore.sceneHeaderLib.readHeader(self._writeFile('shot.ma', ASCII_SCENE.encode('utf-8')))
+
+        self.assertEqual(header.version(), '2020')
+        self.assertEqual([x['referenceNode'] for x in header.references()], ['charRN', 'char1RN'])
+        self.assertEqual([(x['referenceNode'], x['parent']) for x in header.referenceDeclarations()],
+                         [('charRN', None), ('char:rigRN', 'charRN'), ('char1RN', None)])
+        self.assertEqual(header.plugins(), ['mtoa'])
+        self.assertEqual(header.requires()[1]['nodeTypes'], ['aiOptions'])
+        self.assertEqual(header.units(), {'l': 'centimeter', 'a': 'degree', 't': 'film'})
+        self.assertEqual(header.fileInfo()['comment'], 'semicolon; and "quotes"')
+
+    def testReferencedFilesWithoutCopyNumbers(self):
+
+        header = mMayaCore.sceneHeaderLib.readHeader(self._writeFile('shot.ma', ASCII_SCENE.encode('utf-8')))
+
+        self.assertEqual(header.referencedFiles(), ['/assets/char.ma', '/assets/rig.ma'])
+
+    def testReadBinaryHeader(self):
+
+        content = createGroup(b'Maya', [createGroup(b'HEAD', [createChunk(b'VERS', b'2020\0'),
+                                                              createChunk(b'PLUG', b'mtoa\x004.0.0\0'),
+                                                              createChunk(b'FINF', b'application\0maya\0'),
+                                                              createChunk(b'LUNI', b'cm\0')]),
+                                        createGroup(b'FREF', [createChunk(b'FREF', b'-ns\0char\0-rfn\0charRN\0/assets/char.ma{1}\0')]),
+                                        createGroup(b'DAG ', [createChunk(b'CREA', b'transform\0')])])
+
+        header = mMayaCore.sceneHeaderLib.readHeader(self._writeFile('shot.mb', content))
+
+        self.assertEqual(header.version(), '2020')
+        self.assertEqual(header.plugins(), ['mtoa'])
+        self.assertEqual(header.fileInfo()['application'], 'maya')
+        self.assertEqual(header.units(), {'l': 'cm'})
+        self.assertEqual([(x['nameSpace'], x['referenceNode']) for x in header.references()], [('char', 'charRN')])
+        self.assertEqual(header.referencedFiles(), ['/assets/char.ma'])
+
+    def testReadInvalidFiles(self):
+
+        self.assertIsNone(mMayaCore.sceneHeaderLib.readHeader(os.path.join(self.directory, 'missing.ma')))
+        self.assertIsNone(mMayaCore.sceneHeaderLib.readHeader(self._writeFile('shot.txt', b'//Maya ASCII 2020 scene\n')))
+        self.assertIsNone(mMayaCore.sceneHeaderLib.readHeader(self._writeFile('shot.mb', b'not an iff file, long enough')))